@@ -1,61 +1,26 @@
-import pandas as pd
-from pathlib import Path
+import argparse
 
-HAM_KLASOR = Path("veriler/ham")
-CIKTI_KLASOR = Path("veriler/islenmis")
+from ham_veri import HAM_KLASOR, ISLENMIS_KLASOR, ham_dosyalar, ara_dosya_yolu, paralel_oku
 
-CIKTI_KLASOR.mkdir(parents=True, exist_ok=True)
+# Kolon eşleme ve temizlik ham_veri.py'de (02_veri_birlestir.py --hamdan da kullanır)
 
-# Kolon eşleme
-KOLON_ESLEME = {
-    "title": "urun_adi",
-    "price": "fiyat",
-    "brand": "marka",
-    "cpu": "islemci",
-    "ram_gb": "ram_gb",
-    "storage_gb": "ssd_gb",
-    "gpu": "ekran_karti",
-    "gpu_tier": "ekran_karti_seviyesi",
-    "gpu_tier_filled": "ekran_karti_seviyesi"
-}
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ham CSV kolonlarını Türkçeleştir")
+    parser.add_argument("--isci", type=int, default=1, help="paralel süreç sayısı (varsayılan: 1, sıralı)")
+    args = parser.parse_args()
 
-def temizle_ve_turkcelestir(csv_yolu):
-    df = pd.read_csv(csv_yolu)
+    ISLENMIS_KLASOR.mkdir(parents=True, exist_ok=True)
 
-    # Kolonları Türkçeleştir
-    df = df.rename(columns=KOLON_ESLEME)
+    tum_csvler = ham_dosyalar(HAM_KLASOR)
 
-    gerekli_kolonlar = [
-        "urun_adi",
-        "fiyat",
-        "marka",
-        "islemci",
-        "ram_gb",
-        "ssd_gb",
-        "ekran_karti_seviyesi"
-    ]
+    print(f"📂 Bulunan ham CSV sayısı: {len(tum_csvler)}")
 
-    mevcut = [k for k in gerekli_kolonlar if k in df.columns]
-    df = df[mevcut]
+    for csv, temiz_df in zip(tum_csvler, paralel_oku(tum_csvler, args.isci)):
+        print(f"➡️ İşleniyor: {csv.name}")
 
-    # Temel temizlik
-    if "fiyat" in df.columns:
-        df = df[df["fiyat"].notna()]
-        df = df[df["fiyat"] > 0]
+        cikti_dosya = ara_dosya_yolu(csv)
+        temiz_df.to_csv(cikti_dosya, index=False, encoding="utf-8-sig")
 
-    return df
+        print(f"✅ Kaydedildi: {cikti_dosya.name} | Satır: {len(temiz_df)}")
 
-tum_csvler = list(HAM_KLASOR.glob("*.csv"))
-
-print(f"📂 Bulunan ham CSV sayısı: {len(tum_csvler)}")
-
-for csv in tum_csvler:
-    print(f"➡️ İşleniyor: {csv.name}")
-    temiz_df = temizle_ve_turkcelestir(csv)
-
-    cikti_dosya = CIKTI_KLASOR / f"turkce_{csv.name}"
-    temiz_df.to_csv(cikti_dosya, index=False, encoding="utf-8-sig")
-
-    print(f"✅ Kaydedildi: {cikti_dosya.name} | Satır: {len(temiz_df)}")
-
-print("\n🎉 ADIM 1 TAMAMLANDI: TÜRKÇELEŞTİRME BİTTİ")
+    print("\n🎉 ADIM 1 TAMAMLANDI: TÜRKÇELEŞTİRME BİTTİ")
@@ -1,30 +1,99 @@
+import argparse
+import time
+
 import pandas as pd
-from pathlib import Path
 
-ISLENMIS_KLASOR = Path("veriler/islenmis")
-CIKTI_KLASOR = Path("veriler/birlesik")
+import veri_io
+from akis_alim import PARCA_BOYUTU, akisla_birlestir
+from ham_veri import HAM_KLASOR, ISLENMIS_KLASOR, ham_dosyalar, ara_dosya_yolu, paralel_oku
+
+
+def islenmis_oku():
+    """Klasik mod: 01'in yazdığı turkce_*.csv dosyalarını oku"""
+    csv_dosyalari = sorted(ISLENMIS_KLASOR.glob("turkce_*.csv"))
+
+    print(f"📂 Bulunan işlenmiş CSV sayısı: {len(csv_dosyalari)}")
+
+    df_listesi = []
+
+    for csv in csv_dosyalari:
+        df = pd.read_csv(csv)
+        print(f"➡️ Okundu: {csv.name} | Satır: {len(df)}")
+        df_listesi.append(df)
+
+    return df_listesi
+
+
+def hamdan_oku(isci=None, ara_dosyalar=False):
+    """
+    Birleşik alım: ham dosyalar süreç havuzunda okunup normalize edilir,
+    ara turkce_*.csv dosyaları yalnızca istenirse yazılır.
+    """
+    csv_dosyalari = ham_dosyalar(HAM_KLASOR)
+
+    print(f"📂 Bulunan ham CSV sayısı: {len(csv_dosyalari)} (paralel alım)")
+
+    df_listesi = paralel_oku(csv_dosyalari, isci)
+
+    if ara_dosyalar:
+        ISLENMIS_KLASOR.mkdir(parents=True, exist_ok=True)
+    for csv, df in zip(csv_dosyalari, df_listesi):
+        print(f"➡️ Okundu: {csv.name} | Satır: {len(df)}")
+        if ara_dosyalar:
+            df.to_csv(ara_dosya_yolu(csv), index=False, encoding="utf-8-sig")
+
+    return df_listesi
+
+
+def akisla_oku(parca_boyutu):
+    """
+    Akış modu: ham dosyalar parça parça okunur, kesin kopyalar ve aynı adın
+    pahalı satırları diskteki depoda elenir; bellek veri boyutundan bağımsız.
+    """
+    csv_dosyalari = ham_dosyalar(HAM_KLASOR)
+
+    print(f"📂 Bulunan ham CSV sayısı: {len(csv_dosyalari)} (akış, parça: {parca_boyutu} satır)")
+
+    if not csv_dosyalari:
+        raise ValueError("❌ Birleştirilecek veri bulunamadı!")
 
-CIKTI_KLASOR.mkdir(parents=True, exist_ok=True)
+    cikti_dosya, sayac = akisla_birlestir(csv_dosyalari, parca_boyutu=parca_boyutu)
 
-csv_dosyalari = list(ISLENMIS_KLASOR.glob("turkce_*.csv"))
+    print(f"\n📊 Okunan satır: {sayac['okunan']} | geçerli fiyatlı: {sayac['gecerli']}")
+    print(f"✅ Kesin duplicate (özet kümesi) silinen: {sayac['kesin']}")
+    print(f"✅ Ad başına en ucuz satır: {sayac['tekil']} (yakın kopyalar 03'te)")
+    return cikti_dosya
 
-print(f"📂 Bulunan işlenmiş CSV sayısı: {len(csv_dosyalari)}")
 
-df_listesi = []
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Türkçeleştirilmiş CSV'leri tek dosyada birleştir")
+    parser.add_argument("--hamdan", action="store_true",
+                        help="01'i atla: ham CSV'leri paralel oku, normalize et ve doğrudan birleştir")
+    parser.add_argument("--isci", type=int, help="--hamdan için süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--ara-dosyalar", action="store_true",
+                        help="--hamdan ile turkce_*.csv ara dosyalarını da yaz (hata ayıklama)")
+    parser.add_argument("--akis", action="store_true",
+                        help="ham CSV'leri parça parça oku, kesin/aynı adlı kopyaları diskte ele (büyük veri)")
+    parser.add_argument("--parca-boyutu", type=int, default=PARCA_BOYUTU, metavar="SATIR",
+                        help=f"--akis için parça boyutu (varsayılan: {PARCA_BOYUTU})")
+    args = parser.parse_args()
 
-for csv in csv_dosyalari:
-    df = pd.read_csv(csv)
-    print(f"➡️ Okundu: {csv.name} | Satır: {len(df)}")
-    df_listesi.append(df)
+    baslangic = time.perf_counter()
+    if args.akis:
+        cikti_dosya = akisla_oku(args.parca_boyutu)
+    else:
+        if args.hamdan:
+            df_listesi = hamdan_oku(args.isci, args.ara_dosyalar)
+        else:
+            df_listesi = islenmis_oku()
 
-if not df_listesi:
-    raise ValueError("❌ Birleştirilecek veri bulunamadı!")
+        if not df_listesi:
+            raise ValueError("❌ Birleştirilecek veri bulunamadı!")
 
-birlesik_df = pd.concat(df_listesi, ignore_index=True)
+        birlesik_df = pd.concat(df_listesi, ignore_index=True)
 
-print(f"\n📊 Birleştirme sonrası toplam satır: {len(birlesik_df)}")
+        print(f"\n📊 Birleştirme sonrası toplam satır: {len(birlesik_df)}")
 
-cikti_dosya = CIKTI_KLASOR / "laptops_birlesik.csv"
-birlesik_df.to_csv(cikti_dosya, index=False, encoding="utf-8-sig")
+        cikti_dosya = veri_io.yaz(birlesik_df, "laptops_birlesik")
 
-print(f"✅ Birleşik dataset kaydedildi: {cikti_dosya}")
+    print(f"✅ Birleşik dataset kaydedildi: {cikti_dosya} ({time.perf_counter() - baslangic:.2f} sn)")
@@ -1,6 +1,8 @@
 import pandas as pd
 
-df = pd.read_csv("veriler/birlesik/laptops_birlesik_temiz.csv")
+import veri_io
+
+df = veri_io.oku("laptops_birlesik_temiz")
 
 print("\n📊 GENEL BİLGİ")
 print(df.info())
@@ -11,36 +13,39 @@ print(df["fiyat"].describe())
 # -----------------------
 # RAM – Fiyat
 # -----------------------
-print("\n💾 RAM - Ortalama Fiyat")
-ram_fiyat = (
-    df.groupby("ram_gb")["fiyat"]
-    .mean()
-    .sort_index()
-)
-print(ram_fiyat)
+if "ram_gb" in df.columns:
+    print("\n💾 RAM - Ortalama Fiyat")
+    ram_fiyat = (
+        df.groupby("ram_gb")["fiyat"]
+        .mean()
+        .sort_index()
+    )
+    print(ram_fiyat)
 
 # -----------------------
 # SSD – Fiyat
 # -----------------------
-print("\n🗄️ SSD - Ortalama Fiyat (ilk 15)")
-ssd_fiyat = (
-    df.groupby("ssd_gb")["fiyat"]
-    .mean()
-    .sort_index()
-)
-print(ssd_fiyat.head(15))
+if "ssd_gb" in df.columns:
+    print("\n🗄️ SSD - Ortalama Fiyat (ilk 15)")
+    ssd_fiyat = (
+        df.groupby("ssd_gb")["fiyat"]
+        .mean()
+        .sort_index()
+    )
+    print(ssd_fiyat.head(15))
 
 # -----------------------
 # Marka – Fiyat
 # -----------------------
-print("\n🏷️ Marka - Ortalama Fiyat (ilk 10)")
-marka_fiyat = (
-    df.groupby("marka")["fiyat"]
-    .mean()
-    .sort_values(ascending=False)
-    .head(10)
-)
-print(marka_fiyat)
+if "marka" in df.columns:
+    print("\n🏷️ Marka - Ortalama Fiyat (ilk 10)")
+    marka_fiyat = (
+        df.groupby("marka")["fiyat"]
+        .mean()
+        .sort_values(ascending=False)
+        .head(10)
+    )
+    print(marka_fiyat)
 
 # -----------------------
 # Ekran Kartı Seviyesi – Fiyat
@@ -1,95 +1,107 @@
+import argparse
+import time
+
 import pandas as pd
 
-df = pd.read_csv("veriler/birlesik/laptops_feature_cikarilmis.csv")
-
-print("📊 Başlangıç satır:", len(df))
-
-# -----------------------
-# 1️⃣ RAM doldurma
-# -----------------------
-# Strateji:
-# - CPU biliniyorsa CPU grubunun medyan RAM’i
-# - CPU da unknown ise genel medyan
-
-ram_median_by_cpu = df.groupby("islemci")["ram_gb"].median()
-global_ram_median = df["ram_gb"].median()
-
-def fill_ram(row):
-    if pd.notna(row["ram_gb"]):
-        return row["ram_gb"]
-    cpu = row["islemci"]
-    if cpu in ram_median_by_cpu and not pd.isna(ram_median_by_cpu[cpu]):
-        return ram_median_by_cpu[cpu]
-    return global_ram_median
-
-df["ram_gb"] = df.apply(fill_ram, axis=1)
-
-# -----------------------
-# 2️⃣ SSD doldurma
-# -----------------------
-# Strateji:
-# - RAM >= 16 → SSD medyan (yüksek)
-# - RAM < 16 → SSD medyan (düşük)
-
-ssd_high = df[df["ram_gb"] >= 16]["ssd_gb"].median()
-ssd_low = df[df["ram_gb"] < 16]["ssd_gb"].median()
-
-def fill_ssd(row):
-    if pd.notna(row["ssd_gb"]):
-        return row["ssd_gb"]
-    if row["ram_gb"] >= 16:
-        return ssd_high
-    return ssd_low
-
-df["ssd_gb"] = df.apply(fill_ssd, axis=1)
-
-# -----------------------
-# 3️⃣ CPU unknown doldurma
-# -----------------------
-# Basit ama savunulabilir:
-# - RAM >= 16 → i5
-# - RAM < 16 → i3
-
-def fill_cpu(row):
-    if row["islemci"] != "unknown":
-        return row["islemci"]
-    if row["ram_gb"] >= 16:
-        return "i5"
-    return "i3"
-
-df["islemci"] = df.apply(fill_cpu, axis=1)
-
-# -----------------------
-# 4️⃣ GPU seviyesi düzeltme
-# -----------------------
-# Çok nadir high/mid var, integrated normal
-# RAM >= 32 ve SSD >= 512 ise mid yapabiliriz
-
-def fill_gpu(row):
-    if row["ekran_karti_seviyesi"] != "integrated":
-        return row["ekran_karti_seviyesi"]
-    if row["ram_gb"] >= 32 and row["ssd_gb"] >= 512:
-        return "mid"
-    return "integrated"
-
-df["ekran_karti_seviyesi"] = df.apply(fill_gpu, axis=1)
-
-print("\n💾 RAM (son):")
-print(df["ram_gb"].value_counts().head())
-
-print("\n🗄️ SSD (son):")
-print(df["ssd_gb"].value_counts().head())
-
-print("\n🧠 CPU (son):")
-print(df["islemci"].value_counts())
-
-print("\n🎮 GPU (son):")
-print(df["ekran_karti_seviyesi"].value_counts())
-
-df.to_csv(
-    "veriler/birlesik/laptops_feature_doldurulmus.csv",
-    index=False,
-    encoding="utf-8-sig"
-)
-
-print("\n✅ EKSİK VERİLER DOLDURULDU")
+import veri_io
+from asamalar import eksik_doldur
+
+# Aşama mantığı asamalar.py'de (bellek içi zincir: python asamalar.py)
+# Kurallar: asamalar.DOLDURMA_KURALLARI (sütun bazlı stratejiler)
+
+
+def satir_satir_doldur(df):
+    """Eski df.apply(axis=1) uygulaması — yalnızca --benchmark karşılaştırması için"""
+    df = df.copy()
+
+    ram_median_by_cpu = df.groupby("islemci")["ram_gb"].median()
+    global_ram_median = df["ram_gb"].median()
+
+    def fill_ram(row):
+        if pd.notna(row["ram_gb"]):
+            return row["ram_gb"]
+        cpu = row["islemci"]
+        if cpu in ram_median_by_cpu and not pd.isna(ram_median_by_cpu[cpu]):
+            return ram_median_by_cpu[cpu]
+        return global_ram_median
+
+    df["ram_gb"] = df.apply(fill_ram, axis=1)
+
+    ssd_high = df[df["ram_gb"] >= 16]["ssd_gb"].median()
+    ssd_low = df[df["ram_gb"] < 16]["ssd_gb"].median()
+
+    def fill_ssd(row):
+        if pd.notna(row["ssd_gb"]):
+            return row["ssd_gb"]
+        if row["ram_gb"] >= 16:
+            return ssd_high
+        return ssd_low
+
+    df["ssd_gb"] = df.apply(fill_ssd, axis=1)
+
+    def fill_cpu(row):
+        if row["islemci"] != "unknown":
+            return row["islemci"]
+        if row["ram_gb"] >= 16:
+            return "i5"
+        return "i3"
+
+    df["islemci"] = df.apply(fill_cpu, axis=1)
+
+    def fill_gpu(row):
+        if row["ekran_karti_seviyesi"] != "integrated":
+            return row["ekran_karti_seviyesi"]
+        if row["ram_gb"] >= 32 and row["ssd_gb"] >= 512:
+            return "mid"
+        return "integrated"
+
+    df["ekran_karti_seviyesi"] = df.apply(fill_gpu, axis=1)
+    return df
+
+
+def benchmark(df, satir_sayisi, karsilastirma):
+    """Gerçek veriyi satir_sayisi'na kadar örnekleyip vektörel doldurmayı ölç"""
+    print(f"⏱️ BENCHMARK: {len(df)} gerçek satırdan örnekleniyor")
+    buyuk = df.sample(satir_sayisi, replace=True, random_state=42).reset_index(drop=True)
+
+    boyutlar = sorted({min(satir_sayisi, b) for b in (10_000, 100_000, 1_000_000)} | {satir_sayisi})
+    for boyut in boyutlar:
+        parca = buyuk.iloc[:boyut]
+        baslangic = time.perf_counter()
+        eksik_doldur(parca, ozet=False)
+        sure = time.perf_counter() - baslangic
+        print(f"   vektörel   {boyut:>10,} satır: {sure:8.3f} sn ({boyut / sure:>12,.0f} satır/sn)")
+
+    # Satır satır temel çizgi yalnızca küçük bir örnekte (milyonlarca satırda dakikalar sürer)
+    parca = buyuk.iloc[:min(karsilastirma, satir_sayisi)]
+    baslangic = time.perf_counter()
+    eski = satir_satir_doldur(parca)
+    eski_sure = time.perf_counter() - baslangic
+    baslangic = time.perf_counter()
+    yeni = eksik_doldur(parca, ozet=False)
+    yeni_sure = time.perf_counter() - baslangic
+    print(f"   satır satır {len(parca):>9,} satır: {eski_sure:8.3f} sn ({len(parca) / eski_sure:>12,.0f} satır/sn)")
+    print(f"   🚀 hızlanma: {eski_sure / yeni_sure:.0f}x")
+
+    pd.testing.assert_frame_equal(eski, yeni)
+    print("   ✅ Çıktı satır satır uygulamayla birebir aynı")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eksik RAM/SSD/CPU/GPU değerlerini doldur")
+    parser.add_argument("--benchmark", type=int, metavar="SATIR",
+                        help="dosya yazmadan, veriyi SATIR sayısına büyütüp doldurma süresini ölç (ör. 1000000)")
+    parser.add_argument("--karsilastirma", type=int, default=50_000, metavar="SATIR",
+                        help="--benchmark için satır satır temel çizginin satır sayısı (varsayılan: 50000)")
+    args = parser.parse_args()
+
+    df = veri_io.oku("laptops_feature_cikarilmis")
+
+    if args.benchmark:
+        benchmark(df, args.benchmark, args.karsilastirma)
+    else:
+        df = eksik_doldur(df)
+
+        veri_io.yaz(df, "laptops_feature_doldurulmus")
+
+        print("\n✅ EKSİK VERİLER DOLDURULDU")
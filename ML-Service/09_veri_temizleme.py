@@ -1,32 +1,11 @@
-import pandas as pd
-print("\n🧹 ADIM 2: Veri Temizleme Başlıyor...")
-
-df = pd.read_csv("veriler/birlesik/laptops_ozellik_cikarilmis.csv")
-baslangic_sayisi = len(df)
-
-print(f"📊 Başlangıç satır sayısı: {baslangic_sayisi}")
-
-# 1. Kritik alanları '-' olanları temizle
-# (RAM, İşlemci veya Depolama bilgisi çekilemediyse o veri çöp olabilir)
-kritik_kolonlar = ['RAM_Ham', 'Islemci', 'Depolama_Ham']
+import veri_io
+from asamalar import veri_temizle
 
-for col in kritik_kolonlar:
-    df = df[df[col] != '-']
+# Aşama mantığı asamalar.py'de (bellek içi zincir: python asamalar.py)
 
-# 2. Fiyat temizliği
-df = df.dropna(subset=['Fiyat'])
-df = df[df['Fiyat'] > 0] # 0 TL olanları at
-
-# 3. İndeks sıfırlama
-df = df.reset_index(drop=True)
-
-bitis_sayisi = len(df)
-silinen = baslangic_sayisi - bitis_sayisi
+print("\n🧹 ADIM 2: Veri Temizleme Başlıyor...")
 
-print(f"📉 Temizlik Sonrası: {bitis_sayisi} satır (Silinen: {silinen})")
+df = veri_io.oku("laptops_ozellik_cikarilmis")
+df = veri_temizle(df)
 
-df.to_csv(
-    "veriler/birlesik/laptops_veri_temizleme.csv",
-    index=False,
-    encoding="utf-8-sig"
-)
\ No newline at end of file
+veri_io.yaz(df, "laptops_veri_temizleme")
@@ -2,9 +2,11 @@ import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 
+import veri_io
+
 print("\n📊 ADIM 4: Excel Raporu Oluşturuluyor...")
 
-df = pd.read_csv("veriler/birlesik/laptops_sayisal_donusum.csv", sep=';')
+df = veri_io.oku("laptops_sayisal_donusum")
 
 wb = Workbook()
 ws = wb.active
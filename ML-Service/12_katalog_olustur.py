@@ -0,0 +1,37 @@
+import pandas as pd
+
+import veri_io
+
+# Elle düzenlenmiş servis kataloğu (laptops_int_values.csv) korunur: yeni katalog
+# ara klasöre yazılır, kontrol edildikten sonra elle kopyalanır.
+CIKTI = veri_io.ARA_KLASOR / "laptops_katalog.csv"
+
+print(f"\n📦 ADIM 5: Model Kataloğu ({CIKTI}) Oluşturuluyor...")
+
+df = veri_io.oku("laptops_sayisal_donusum")
+
+# ---------------------------------------------------------
+# train_model.py ve API'nin beklediği biçim:
+# Marka;Model;İşlemci;RAM;Depolama;Ekran Kartı;Fiyat (fiyat "8.496,67")
+# ---------------------------------------------------------
+
+df = df.dropna(subset=['RAM_GB', 'SSD_GB', 'Fiyat'])
+
+def fiyat_formatla(fiyat):
+    # 12345.678 -> "12.345,68"
+    return f"{fiyat:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+katalog = pd.DataFrame({
+    'Marka': df['Marka'],
+    'Model': df['Model'].fillna('-'),
+    'İşlemci': df['Islemci'],
+    'RAM': df['RAM_GB'].astype(int),
+    'Depolama': df['SSD_GB'].astype(int),
+    'Ekran Kartı': df['Ekran_Karti'],
+    'Fiyat': df['Fiyat'].astype(float).apply(fiyat_formatla),
+})
+
+CIKTI.parent.mkdir(parents=True, exist_ok=True)
+katalog.to_csv(CIKTI, index=False, sep=';', encoding="utf-8")
+print(f"✅ Katalog kaydedildi: {CIKTI} | Satır: {len(katalog)}")
+print("ℹ️ Servis kataloğunu değiştirmek için laptops_int_values.csv'ye elle kopyalayın")
@@ -0,0 +1,167 @@
+"""
+Akış (streaming) alım: ham CSV'ler parça parça okunur; tepe bellek toplam
+veri boyutundan bağımsızdır (parça boyutu + SQLite sayfa önbelleği).
+
+02_veri_birlestir.py --akis ile çalışır. Her parçada:
+
+1. ham_veri.turkcelestir ile kolon eşleme + fiyat temizliği,
+2. urun_adi normalize edilir (asamalar.normalize_names, 03 ile aynı),
+3. (urun_adi_norm, fiyat) çiftinin 8 baytlık blake2b özeti diskteki özet
+   kümesinde aranır; daha önce görülmüşse satır kesin kopyadır ve atılır,
+4. kalan satırlar diskteki ürün tablosuna upsert edilir: her normalize ad
+   için yalnızca en ucuz satır tutulur (eşit fiyatta ilk görülen).
+
+Sonunda ürün tablosu giriş sırasıyla parça parça okunup laptops_birlesik
+olarak yazılır. Bu satırlar 03'ün kesin + aynı adlı yumuşak duplicate
+adımlarının sonucuyla aynıdır; yakın kopya kümeleme (MinHash/LSH) artık çok
+daha küçük olan bu tablo üzerinde 03'te çalışır.
+
+Anahtar-değer deposu SQLite'tır (standart kütüphane): tablolar diskte,
+bellekte yalnızca sınırlı sayfa önbelleği tutulur. 64 bit özette çakışma
+olasılığı ~n²/2⁶⁵ (10⁸ tekil satırda ~%0.03); çakışan satır kesin kopya
+sayılıp atılır.
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+import veri_io
+from asamalar import normalize_names
+from ham_veri import GEREKLI_KOLONLAR, turkcelestir
+
+PARCA_BOYUTU = 50_000  # satır
+ONBELLEK_MB = 64  # SQLite sayfa önbelleği
+DEPO_YOLU = Path("veriler/akis_deposu.sqlite")
+
+
+def ozet(ad_norm, fiyat):
+    """(urun_adi_norm, fiyat) için 64 bit işaretli tam sayı (SQLite INTEGER PRIMARY KEY)"""
+    anahtar = f"{ad_norm}\x1f{float(fiyat).hex()}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(anahtar, digest_size=8).digest(), "big", signed=True)
+
+
+def _kolon_listesi(kolonlar):
+    return ", ".join(f'"{k}"' for k in kolonlar)
+
+
+class AkisDeposu:
+    """Özet kümesi + normalize ad başına en ucuz satır; ikisi de diskte (SQLite)"""
+
+    def __init__(self, yol=DEPO_YOLU, kolonlar=GEREKLI_KOLONLAR, onbellek_mb=ONBELLEK_MB):
+        self.yol = Path(yol)
+        self.kolonlar = list(kolonlar)
+        self.yol.parent.mkdir(parents=True, exist_ok=True)
+        self.yol.unlink(missing_ok=True)  # yarım kalmış önceki çalıştırmanın deposu
+
+        # Tip belirtilmeyen kolonlar değeri olduğu gibi saklar (dönüşüm yok)
+        kolon_tanimi = _kolon_listesi(self.kolonlar)
+        self.db = sqlite3.connect(self.yol)
+        # Depo geçici: çökmede baştan kurulur, günlük/fsync gereksiz
+        self.db.executescript(f"""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA temp_store = FILE;
+            PRAGMA cache_size = -{onbellek_mb * 1024};
+            CREATE TABLE ozetler (ozet INTEGER PRIMARY KEY);
+            CREATE TABLE urunler (urun_adi_norm TEXT PRIMARY KEY, sira INTEGER, {kolon_tanimi}) WITHOUT ROWID;
+            CREATE TEMP TABLE parca (ozet INTEGER, i INTEGER);
+        """)
+
+        hepsi = ["urun_adi_norm", "sira", *self.kolonlar]
+        guncelle = ", ".join(f'"{k}" = excluded."{k}"' for k in hepsi[1:])
+        self._upsert = (
+            f"INSERT INTO urunler ({_kolon_listesi(hepsi)}) VALUES ({', '.join('?' * len(hepsi))}) "
+            f"ON CONFLICT (urun_adi_norm) DO UPDATE SET {guncelle} WHERE excluded.fiyat < urunler.fiyat"
+        )
+
+    def yeni_ozetler(self, ozetler):
+        """Daha önce görülmemiş özetlerin konumları (ozetler kendi içinde tekil); hepsi kümeye eklenir"""
+        self.db.executemany("INSERT INTO temp.parca VALUES (?, ?)", zip(ozetler, range(len(ozetler))))
+        yeni = [i for (i,) in self.db.execute(
+            "SELECT i FROM temp.parca WHERE ozet NOT IN (SELECT ozet FROM ozetler) ORDER BY i")]
+        self.db.execute("INSERT OR IGNORE INTO ozetler SELECT ozet FROM temp.parca")
+        self.db.execute("DELETE FROM temp.parca")
+        return yeni
+
+    def en_ucuzu_tut(self, df):
+        """df: urun_adi_norm, sira + kolonlar. Ad zaten varsa yalnızca daha ucuzsa değiştirilir"""
+        df = df[["urun_adi_norm", "sira", *self.kolonlar]].astype(object)
+        df = df.where(df.notna(), None)
+        self.db.executemany(self._upsert, df.itertuples(index=False, name=None))
+        self.db.commit()
+
+    def satir_sayisi(self):
+        return self.db.execute("SELECT COUNT(*) FROM urunler").fetchone()[0]
+
+    def _sayisal(self, kolon):
+        metin = self.db.execute(
+            f"SELECT 1 FROM urunler WHERE typeof(\"{kolon}\") NOT IN ('integer', 'real', 'null') LIMIT 1"
+        ).fetchone()
+        return metin is None
+
+    def parcalar(self, kolonlar, boyut=PARCA_BOYUTU):
+        """Tutulan satırlar giriş sırasıyla, boyut'luk DataFrame parçaları (en az bir parça)"""
+        # Parçalar arasında tip sabit kalsın: sayısal kolonlar her parçada float64
+        sayisal = [k for k in kolonlar if self._sayisal(k)]
+        imlec = self.db.execute(f"SELECT {_kolon_listesi(kolonlar)} FROM urunler ORDER BY sira")
+        while True:
+            satirlar = imlec.fetchmany(boyut)
+            df = pd.DataFrame.from_records(satirlar, columns=kolonlar)
+            df[sayisal] = df[sayisal].astype("float64")
+            yield df
+            if len(satirlar) < boyut:
+                break
+
+    def kapat(self):
+        self.db.close()
+        self.yol.unlink(missing_ok=True)
+
+
+def akisla_birlestir(dosyalar, ad="laptops_birlesik", parca_boyutu=PARCA_BOYUTU,
+                     depo_yolu=DEPO_YOLU, onbellek_mb=ONBELLEK_MB):
+    """
+    Ham CSV'leri parça parça oku, kesin kopyaları ve aynı adın pahalı
+    satırlarını ele, sonucu ara tablo olarak yaz. (yol, sayaçlar) döner.
+    """
+    depo = AkisDeposu(depo_yolu, onbellek_mb=onbellek_mb)
+    sayac = {"okunan": 0, "gecerli": 0, "kesin": 0}
+    gorulen = set()
+    sira = 0
+    try:
+        for csv in dosyalar:
+            dosya_satir = 0
+            for parca in pd.read_csv(csv, chunksize=parca_boyutu):
+                sayac["okunan"] += len(parca)
+                parca = turkcelestir(parca)
+                gorulen.update(parca.columns)
+
+                # 03 ile aynı: fiyat sayıya, boş/0 fiyatlar atılır
+                parca = parca.reindex(columns=GEREKLI_KOLONLAR)
+                parca["fiyat"] = pd.to_numeric(parca["fiyat"], errors="coerce")
+                parca = parca[parca["fiyat"].notna() & (parca["fiyat"] > 0)]
+                parca.insert(0, "sira", range(sira, sira + len(parca)))
+                parca.insert(0, "urun_adi_norm", normalize_names(parca["urun_adi"]))
+                sira += len(parca)
+                dosya_satir += len(parca)
+
+                # Kesin kopya: önce parça içinde, sonra diskteki özet kümesine karşı
+                tekil = parca.drop_duplicates(subset=["urun_adi_norm", "fiyat"], keep="first")
+                ozetler = [ozet(a, f) for a, f in zip(tekil["urun_adi_norm"], tekil["fiyat"])]
+                tekil = tekil.iloc[depo.yeni_ozetler(ozetler)]
+                sayac["kesin"] += len(parca) - len(tekil)
+
+                # Parça içinde ad başına en ucuz (eşitlikte ilk görülen); parçalar arası aynı kuralı depo uygular
+                tekil = tekil.sort_values("fiyat", kind="stable").drop_duplicates(subset=["urun_adi_norm"])
+                depo.en_ucuzu_tut(tekil)
+            sayac["gecerli"] += dosya_satir
+            print(f"➡️ Okundu: {Path(csv).name} | Satır: {dosya_satir}")
+
+        kolonlar = [k for k in GEREKLI_KOLONLAR if k in gorulen]
+        yol = veri_io.parca_parca_yaz(depo.parcalar(kolonlar, parca_boyutu), ad)
+        sayac["tekil"] = depo.satir_sayisi()
+    finally:
+        depo.kapat()
+    return yol, sayac
@@ -1,152 +1,333 @@
-from flask import Flask, request, jsonify
-import joblib
+# Soğuk başlangıç ölçümü: import'lar dahil
+import time
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 import numpy as np
-import pandas as pd
 import os
+import sys
+
+# Eğitim ve servisin ortak modülleri ML-Service/ klasöründe
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from feature_parser import parse_cpu, get_gpu_type, parse_cpu_series, parse_gpu_series, cache_info
+from prediction_cache import PredictionCache
+from micro_batcher import MicroBatcher
+from model_registry import ModelRegistry
+from metrics import MetricsRegistry, BATCH_SIZE_BOUNDS, CONTENT_TYPE, process_rss_bytes
+from similar_products import SimilarProducts
+from recommendations import Recommendations
+from fraud_scoring import FraudScorer
+from segmentation import CustomerSegmenter
+import io
+from datetime import datetime
 
 app = Flask(__name__)
 
 # -----------------------
 # Modeli ve Encoderları Yükle
 # -----------------------
-try:
-    # Model ve encoders yolu (ML-Service/model/ klasöründen yükle)
-    model_path = os.path.join(os.path.dirname(__file__), "..", "model", "laptop_fiyat_model.pkl")
-    encoders_path = os.path.join(os.path.dirname(__file__), "..", "model", "label_encoders.pkl")
-    
-    # Modeli yükle
-    model = joblib.load(model_path)
-    label_encoders = joblib.load(encoders_path)
+# Model, encoder'lar, feature şeması, derlenmiş model ve fiyat tablosu tek bir
+# bundle olarak yüklenir. Yenileme (SIGHUP, POST /admin/reload, dosya izleme)
+# yeni bundle'ı arka planda hazırlayıp atomik olarak değiştirir; her istek
+# başında aldığı bundle ile tamamlanır.
+# pandas/sklearn/joblib yalnızca pickle yolu veya toplu istekler için, ihtiyaç
+# anında import edilir; artefakt (.lfm) ile açılışta hiçbiri yüklenmez.
+MODEL_DIR = os.environ.get("ML_MODEL_DIR", os.path.join(os.path.dirname(__file__), "..", "model"))
+registry = ModelRegistry(MODEL_DIR)
 
-    print("✅ Model yüklendi: laptop_fiyat_model.pkl")
-    print(f"✅ Encoders yüklendi: label_encoders.pkl")
-
-    # Encoder keylerini kontrol et
-    print(f"📊 Kullanılabilir encoders: {list(label_encoders.keys())}")
-    
-    # Modelin beklediği feature sayısını kontrol et
-    try:
-        n_features = model.n_features_in_
-        print(f"📊 Model beklenen feature sayısı: {n_features}")
-        if hasattr(model, 'feature_names_in_'):
-            print(f"📊 Feature isimleri: {list(model.feature_names_in_)}")
-    except:
-        print("⚠️ Feature bilgisi modelde bulunamadı")
-    
+try:
+    registry.load()
 except FileNotFoundError as e:
     print(f"❌ HATA: Model dosyaları bulunamadı!")
-    print(f"   Lütfen 'laptop_fiyat_model.pkl' ve 'label_encoders.pkl' dosyalarının")
-    print(f"   ML-Service klasöründe olduğundan emin olun.")
+    print(f"   Lütfen 'laptop_fiyat_model.lfm' veya 'laptop_fiyat_model.pkl' + 'label_encoders.pkl'")
+    print(f"   dosyalarının ML-Service/model klasöründe olduğundan emin olun (python train_model.py).")
     raise e
 except Exception as e:
     print(f"❌ HATA: Model yüklenirken hata oluştu: {str(e)}")
     raise e
 
+# SIGHUP -> yeniden yükle (gunicorn'da worker'larda serve.py kurar)
+registry.install_signal_handler()
+
+# Dosya izleme: train_model.py yeni model yazınca her worker kendisi yeniler
+MODEL_WATCH_SECONDS = float(os.environ.get("ML_MODEL_WATCH_SECONDS", "0"))
+
+# Yenileme endpoint'i: ML_ADMIN_TOKEN tanımlıysa X-Admin-Token başlığı, değilse yalnızca localhost
+ADMIN_TOKEN = os.environ.get("ML_ADMIN_TOKEN")
+
 # -----------------------
-# Helper Functions
+# Micro-batching (opsiyonel, ML_MICRO_BATCH=1)
 # -----------------------
-def get_cpu_tier(cpu_str):
-    """CPU string'inden tier çıkar"""
-    cpu_lower = str(cpu_str).lower()
-    
-    if 'i9' in cpu_lower or 'ryzen 9' in cpu_lower or 'ultra 9' in cpu_lower:
-        return 9
-    elif 'i7' in cpu_lower or 'ryzen 7' in cpu_lower or 'ultra 7' in cpu_lower:
-        return 7
-    elif 'i5' in cpu_lower or 'ryzen 5' in cpu_lower or 'ultra 5' in cpu_lower or 'm2' in cpu_lower or 'm3' in cpu_lower or 'm4' in cpu_lower:
-        return 5
-    elif 'i3' in cpu_lower or 'ryzen 3' in cpu_lower or 'm1' in cpu_lower:
-        return 3
-    elif 'celeron' in cpu_lower or 'pentium' in cpu_lower:
-        return 1
-    return 2  # Default
-
-def get_cpu_generation(cpu_str):
-    """CPU nesli çıkar (Intel için 10, 11, 12, 13, 14, 15 gibi)"""
-    if not cpu_str:
-        return 10  # Default
-    
-    cpu_str = str(cpu_str)
-    
-    # Intel nesilleri (i7-12700H, i5-1335U gibi)
-    import re
-    
-    # Ultra serisi (155H, 258V gibi)
-    if 'ultra' in cpu_str.lower():
-        return 15
-    
-    # Intel Core i3/i5/i7/i9 nesilleri
-    intel_match = re.search(r'[i]\d-(\d{1,2})\d{2,3}', cpu_str.lower())
-    if intel_match:
-        gen = int(intel_match.group(1))
-        return min(gen, 15)  # Max 15. nesil
-    
-    # AMD Ryzen nesilleri (Ryzen 5 5600H -> 5, Ryzen 7 7730U -> 7)
-    ryzen_match = re.search(r'ryzen\s+\d\s+(\d)', cpu_str.lower())
-    if ryzen_match:
-        gen = int(ryzen_match.group(1))
-        return gen
-    
-    # Apple M serisi (M1, M2, M3, M4)
-    if 'm1' in cpu_str.lower():
-        return 11
-    elif 'm2' in cpu_str.lower():
-        return 12
-    elif 'm3' in cpu_str.lower():
-        return 13
-    elif 'm4' in cpu_str.lower():
-        return 14
-    
-    # Celeron, Pentium -> eski nesil
-    if 'celeron' in cpu_str.lower() or 'pentium' in cpu_str.lower():
-        return 8
-    
-    return 10  # Default orta nesil
+# Eşzamanlı tekil istekler ML_MICRO_BATCH_WAIT_MS penceresi veya
+# ML_MICRO_BATCH_SIZE kalem dolana kadar toplanıp tek predict ile tahmin edilir.
+micro_batcher = None
+if os.environ.get("ML_MICRO_BATCH") == "1":
+    micro_batcher = MicroBatcher(
+        lambda X: registry.current.predict_matrix(X),
+        max_batch=int(os.environ.get("ML_MICRO_BATCH_SIZE", "32")),
+        max_wait_ms=float(os.environ.get("ML_MICRO_BATCH_WAIT_MS", "2"))
+    )
+    print(f"✅ Micro-batching açık: ≤{micro_batcher.max_batch} kalem / ≤{micro_batcher.max_wait * 1000:g} ms")
 
-def get_cpu_brand(cpu_str):
-    """CPU markasını belirle"""
-    cpu_lower = str(cpu_str).lower()
-    
-    if 'intel' in cpu_lower or 'core i' in cpu_lower or 'celeron' in cpu_lower or 'pentium' in cpu_lower or 'ultra' in cpu_lower:
-        return 'Intel'
-    elif 'amd' in cpu_lower or 'ryzen' in cpu_lower:
-        return 'AMD'
-    elif 'apple' in cpu_lower or 'm1' in cpu_lower or 'm2' in cpu_lower or 'm3' in cpu_lower or 'm4' in cpu_lower:
-        return 'Apple'
-    return 'Intel'  # Default
-
-def get_gpu_type(gpu_str):
-    """GPU tipini belirle"""
-    if not gpu_str or gpu_str.lower() == 'integrated':
-        return 'Entegre'
-    
-    gpu_lower = str(gpu_str).lower()
-    
-    if 'rtx 40' in gpu_lower or 'rtx40' in gpu_lower or 'rtx 50' in gpu_lower:
-        return 'RTX_Yeni'
-    elif 'rtx 30' in gpu_lower or 'rtx30' in gpu_lower:
-        return 'RTX_30'
-    elif 'rtx' in gpu_lower:
-        return 'RTX'
-    elif 'gtx' in gpu_lower:
-        return 'GTX'
-    elif 'nvidia' in gpu_lower or 'geforce' in gpu_lower or 'mx' in gpu_lower:
-        return 'NVIDIA_Diger'
-    elif 'radeon rx' in gpu_lower:
-        return 'Radeon_RX'
-    elif 'radeon' in gpu_lower or 'amd' in gpu_lower:
-        return 'Radeon'
-    elif 'apple' in gpu_lower:
-        return 'Apple_GPU'
-    elif 'iris' in gpu_lower or 'arc' in gpu_lower:
-        return 'Intel_Iris'
-    
-    if gpu_lower == 'mid':
-        return 'GTX'
-    elif gpu_lower == 'high':
-        return 'RTX_Yeni'
-    
-    return 'Entegre'
+def predict_rows(bundle, X):
+    """Model çağrısı; micro-batching açıksa tekil satırlar ortak kuyruğa girer"""
+    if micro_batcher is not None and len(X) == 1:
+        return np.array([micro_batcher.submit(X[0], bundle.predict_matrix)])
+    return bundle.predict_matrix(X)
+
+# -----------------------
+# Tahmin Cache'i
+# -----------------------
+# Popüler konfigürasyonlar (16GB/512GB/i7/RTX 4060/Asus gibi) tekrar tekrar
+# sorulduğu için encode edilmiş feature tuple'ı -> tahmin eşlemesi tutulur.
+# Model sürümü değişince cache boşaltılır. ML_CACHE_SIZE=0 cache'i kapatır.
+prediction_cache = PredictionCache(
+    max_size=int(os.environ.get("ML_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.environ.get("ML_CACHE_TTL", "3600"))
+)
+
+def predict_cached(bundle, X):
+    """
+    Sırasıyla fiyat tablosu -> tahmin cache'i -> model.
+    Kalan satırlar tek predict_rows çağrısıyla tahmin edilir.
+    """
+    tahminler = np.empty(len(X), dtype=np.float64)
+    kalan = np.arange(len(X))
+
+    if bundle.price_grid is not None:
+        grid_values, on_grid = bundle.price_grid.lookup(X)
+        tahminler[on_grid] = grid_values[on_grid]
+        kalan = np.flatnonzero(~on_grid)
+        if not len(kalan):
+            return tahminler
+
+    if not prediction_cache.enabled:
+        tahminler[kalan] = predict_rows(bundle, X[kalan])
+        return tahminler
+
+    keys = {i: tuple(X[i].tolist()) for i in kalan}
+    eksik = []
+    for i, key in keys.items():
+        cached = prediction_cache.get(key, bundle.version)
+        if cached is None:
+            eksik.append(i)
+        else:
+            tahminler[i] = cached
+
+    if eksik:
+        yeni = predict_rows(bundle, X[eksik])
+        for i, tahmin in zip(eksik, yeni):
+            tahminler[i] = tahmin
+            prediction_cache.put(keys[i], float(tahmin), bundle.version)
+    return tahminler
+
+# -----------------------
+# Metrikler (GET /metrics, Prometheus metin biçimi)
+# -----------------------
+# Aşama süreleri: json_parse, feature_parse, encode, predict, serialize.
+# ML_METRICS=0 tüm ölçümleri ve /metrics endpoint'ini kapatır.
+metrics = MetricsRegistry(enabled=os.environ.get("ML_METRICS", "1") != "0")
+
+STAGE_SECONDS = metrics.histogram(
+    "stage_duration_seconds", "İstek aşaması başına süre (saniye)", ("endpoint", "stage"))
+REQUEST_SECONDS = metrics.histogram(
+    "request_duration_seconds", "Toplam istek süresi (saniye)", ("endpoint",))
+REQUESTS = metrics.counter(
+    "requests_total", "Endpoint, metot ve durum koduna göre istek sayısı", ("endpoint", "method", "status"))
+ERRORS = metrics.counter(
+    "errors_total", "4xx/5xx ile biten istek sayısı", ("endpoint", "status"))
+BATCH_ITEMS = metrics.histogram(
+    "batch_size", "Toplu isteklerde kalem sayısı", ("endpoint",), bounds=BATCH_SIZE_BOUNDS)
+UNKNOWN_CATEGORIES = metrics.counter(
+    "unknown_categories_total", "Modelin tanımadığı, unknown koduyla (ilk sınıf) fiyatlanan değer sayısı",
+    ("endpoint", "feature"))
+
+# Kategorik model kolonu -> cevaptaki input_features adı
+CATEGORICAL_RESPONSE_NAMES = {"CPU_Marka": "cpu_brand", "GPU_Tipi": "gpu_type", "Laptop_Marka": "laptop_brand"}
+
+metrics.gauge("model_load_seconds", "Aktif modelin yüklenme süresi (saniye)",
+              lambda: registry.current.load_seconds)
+metrics.gauge("model_info", "Aktif model sürümü", lambda: {(registry.current.version, registry.current.source): 1},
+              ("version", "source"))
+metrics.gauge("process_resident_memory_bytes", "Süreç RSS (bayt)", process_rss_bytes)
+metrics.gauge("prediction_cache_entries", "Tahmin cache'indeki kayıt sayısı", lambda: prediction_cache.stats()["size"])
+metrics.gauge("prediction_cache_hit_ratio", "Tahmin cache isabet oranı", lambda: prediction_cache.stats()["hit_rate"])
+if micro_batcher is not None:
+    metrics.register_histogram("micro_batch_size", "Micro-batch başına satır sayısı", micro_batcher.batch_size)
+    metrics.register_histogram("micro_batch_queue_wait_milliseconds", "Micro-batch kuyruğunda bekleme (ms)",
+                               micro_batcher.queue_wait_ms)
+
+def observe_stage(endpoint, stage, started):
+    """started'dan bu yana geçen süreyi aşama histogramına yaz; yeni zaman damgasını döner"""
+    now = time.perf_counter()
+    if metrics.enabled:
+        STAGE_SECONDS.labels(endpoint, stage).observe(now - started)
+    return now
+
+# -----------------------
+# İstek Başına Model Sürümü
+# -----------------------
+@app.before_request
+def bind_model():
+    """İstek boyunca kullanılacak bundle'ı sabitle"""
+    g.request_started = time.perf_counter()
+    registry.ensure_watcher(MODEL_WATCH_SECONDS)
+    g.bundle = registry.current
+
+@app.after_request
+def model_headers(response):
+    bundle = g.get("bundle") or registry.current
+    response.headers["X-Model-Version"] = bundle.version
+    response.headers["X-Model-Loaded-At"] = bundle.loaded_at
+
+    if metrics.enabled:
+        # Eşleşmeyen yollar tek etikette toplanır (etiket sayısı sınırlı kalsın)
+        endpoint = request.endpoint or "unmatched"
+        status = response.status_code
+        REQUESTS.inc(endpoint, request.method, str(status))
+        if status >= 400:
+            ERRORS.inc(endpoint, str(status))
+        if "request_started" in g:
+            REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - g.request_started)
+    return response
+
+# -----------------------
+# Açılış Süreleri
+# -----------------------
+# İlk tahmin gerçek istek yolundan (parse + encode + model) geçer; sonuç
+# cache'e yazılmaz. Hangi ağır modüllerin yüklendiği de raporlanır.
+def warm_up():
+    bundle = registry.current
+    cpu_tier, cpu_nesil, cpu_marka = parse_cpu("i5")
+    X = bundle.schema.row({
+        "RAM": 16.0, "Depolama": 512.0, "CPU_Seviye": cpu_tier, "CPU_Nesil": cpu_nesil,
+        "CPU_Marka": cpu_marka, "GPU_Tipi": get_gpu_type("integrated"), "Laptop_Marka": "Asus"
+    })
+    return float(bundle.predict_matrix(X)[0])
+
+import_seconds = time.perf_counter() - STARTUP_STARTED
+# ML_WARM_UP=0: ilk tahmin ilk isteğe kalır (benchmark'ın soğuk senaryosu bunu ölçer)
+WARM_UP = os.environ.get("ML_WARM_UP", "1") != "0"
+if WARM_UP:
+    warm_up()
+STARTUP = {
+    "import_seconds": round(import_seconds, 4),
+    "first_prediction_seconds": round(time.perf_counter() - STARTUP_STARTED, 4) if WARM_UP else None,
+    "heavy_modules_loaded": [m for m in ("pandas", "sklearn", "joblib") if m in sys.modules],
+}
+print(f"⏱️ Import + model yükleme: {STARTUP['import_seconds'] * 1000:.0f} ms | "
+      + (f"ilk tahmin: {STARTUP['first_prediction_seconds'] * 1000:.0f} ms | " if WARM_UP else "ısınma kapalı | ")
+      + f"yüklü ağır modüller: {', '.join(STARTUP['heavy_modules_loaded']) or 'yok'}")
+
+# -----------------------
+# Benzer Ürün İndeksi (ML_SIMILAR_PRODUCTS=0 kapatır)
+# -----------------------
+# Katalog CSV'si açılışta bir kez KD-tree'ye çevrilir (gunicorn'da fork öncesi,
+# worker'lar paylaşır); CSV değişince arka planda yeniden kurulur.
+CATALOG_PATH = os.environ.get("ML_CATALOG_CSV", os.path.join(os.path.dirname(__file__), "..", "laptops_int_values.csv"))
+similar_products = None
+if os.environ.get("ML_SIMILAR_PRODUCTS", "1") != "0" and os.path.exists(CATALOG_PATH):
+    similar_products = SimilarProducts(
+        CATALOG_PATH, check_seconds=float(os.environ.get("ML_CATALOG_CHECK_SECONDS", "5"))
+    )
+    similar_products.index(registry.current)
+    MAX_SIMILAR_LIMIT = int(os.environ.get("ML_MAX_SIMILAR_LIMIT", "50"))
+
+# -----------------------
+# Öneri Deposu (train_recommendations.py ile offline üretilir)
+# -----------------------
+RECOMMENDATIONS_PATH = os.environ.get("ML_RECOMMENDATIONS", os.path.join(MODEL_DIR, "recommendations"))
+recommendations = Recommendations(
+    RECOMMENDATIONS_PATH, check_seconds=float(os.environ.get("ML_RECOMMENDATIONS_CHECK_SECONDS", "5"))
+)
+recommendations.store()
+MAX_RECOMMENDATION_LIMIT = int(os.environ.get("ML_MAX_RECOMMENDATION_LIMIT", "50"))
+
+# -----------------------
+# Fraud Skoru (train_fraud_model.py ile eğitilir)
+# -----------------------
+# Checkout isteği ML_FRAUD_BUDGET_MS içinde cevaplanır (isteğin başından
+# itibaren); model sığmıyorsa kural tabanlı skor döner.
+FRAUD_MODEL_PATH = os.environ.get("ML_FRAUD_MODEL", os.path.join(MODEL_DIR, "fraud_model.json"))
+FRAUD_BUDGET_SECONDS = float(os.environ.get("ML_FRAUD_BUDGET_MS", "5")) / 1000
+fraud_scorer = FraudScorer(FRAUD_MODEL_PATH, check_seconds=float(os.environ.get("ML_FRAUD_CHECK_SECONDS", "5")))
+fraud_scorer.model()
+fraud_scorer.score([{"amount": 1000}])  # ilk skor maliyeti bütçe tahminine girsin
+FRAUD_SCORES = metrics.counter(
+    "fraud_scores_total", "Skorlanan işlem sayısı (model / kural yedeği ve sebebi)", ("scoring", "reason"))
+
+# -----------------------
+# Müşteri Segmentasyonu (train_segment_model.py ile eğitilir)
+# -----------------------
+SEGMENT_MODEL_PATH = os.environ.get("ML_SEGMENT_MODEL", os.path.join(MODEL_DIR, "segment_model.json"))
+SEGMENT_CHUNK_SIZE = int(os.environ.get("ML_SEGMENT_CHUNK_SIZE", "50000"))
+customer_segmenter = CustomerSegmenter(
+    SEGMENT_MODEL_PATH, check_seconds=float(os.environ.get("ML_SEGMENT_CHECK_SECONDS", "5")))
+customer_segmenter.model()
+
+# -----------------------
+# Batch Helper Functions
+# -----------------------
+MAX_BATCH_SIZE = int(os.environ.get("ML_MAX_BATCH_SIZE", "10000"))
+
+def _eksik(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _kategorik(value):
+    """Eksik (None/NaN) değer parser varsayılanına kalır; diğer her şey str (liste/nesne dahil)"""
+    return value if _eksik(value) or isinstance(value, str) else str(value)
+
+
+def _marka(data):
+    # Eğitimdeki gibi fillna("Diğer"): yanıtta NaN (geçersiz JSON) olmasın
+    marka = data.get("marka")
+    return "Diğer" if _eksik(marka) else str(marka)
+
+
+def extract_features_batch(items, schema, endpoint="predict_batch"):
+    """
+    Ham istek listesini doğrular ve feature matrisini tek seferde oluşturur.
+    (parse edilmiş batch, model sırasında float64 matris, index -> hata mesajı) döner.
+    """
+    import pandas as pd
+
+    t = time.perf_counter()
+    errors = {}
+    rows = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[i] = "Her kalem bir JSON nesnesi olmalı"
+            continue
+        try:
+            ram = float(item.get("ram_gb", 16))
+            depolama = float(item.get("ssd_gb", 512))
+        except (TypeError, ValueError) as e:
+            errors[i] = str(e)
+            continue
+        # nan/inf float() ile geçer ama model tüm batch'i reddeder
+        if not (np.isfinite(ram) and np.isfinite(depolama)):
+            errors[i] = "ram_gb ve ssd_gb sonlu sayı olmalı"
+            continue
+        # Liste/nesne gibi değerler factorize'ı bozmasın: eksik olmayan kategorikler metne
+        rows.append((i, ram, depolama, _kategorik(item.get("islemci", "i5")),
+                     _kategorik(item.get("ekran_karti", "integrated")), _marka(item)))
+
+    batch = pd.DataFrame(rows, columns=['idx', 'RAM', 'Depolama', 'islemci', 'ekran_karti', 'marka'])
+
+    # Her farklı CPU/GPU metni yalnızca bir kez parse edilir
+    cpu_features = parse_cpu_series(batch['islemci'])
+    batch['CPU_Seviye'] = cpu_features['CPU_Seviye']
+    batch['CPU_Nesil'] = cpu_features['CPU_Nesil']
+    batch['CPU_Marka'] = cpu_features['CPU_Marka']
+    batch['GPU_Tipi'] = parse_gpu_series(batch['ekran_karti'])
+    batch['Laptop_Marka'] = batch['marka']
+    t = observe_stage(endpoint, "feature_parse", t)
+
+    X = schema.matrix(batch) if len(batch) else np.empty((0, len(schema.feature_names)))
+    observe_stage(endpoint, "encode", t)
+    return batch, X, errors
 
 # -----------------------
 # API Endpoints
@@ -155,7 +336,9 @@ def get_gpu_type(gpu_str):
 def predict():
     """Laptop fiyat tahmini endpoint"""
     try:
+        t = time.perf_counter()
         data = request.get_json()
+        t = observe_stage("predict", "json_parse", t)
         
         # Parametreleri al
         ram = float(data.get("ram_gb", 16))
@@ -163,52 +346,43 @@ def predict():
         
         # CPU bilgisi
         cpu_input = data.get("islemci", "i5")
-        cpu_tier = get_cpu_tier(cpu_input)
-        cpu_nesil = get_cpu_generation(cpu_input)
-        cpu_marka = get_cpu_brand(cpu_input)
+        cpu_tier, cpu_nesil, cpu_marka = parse_cpu(cpu_input)
         
         # GPU bilgisi
         gpu_input = data.get("ekran_karti", "integrated")
         gpu_tipi = get_gpu_type(gpu_input)
         
         # Laptop markası
-        laptop_marka = data.get("marka", "Diğer")
-        
-        # Encode işlemleri
-        try:
-            cpu_marka_enc = label_encoders['CPU_Marka'].transform([cpu_marka])[0]
-        except:
-            cpu_marka_enc = 0
-        
-        try:
-            gpu_tipi_enc = label_encoders['GPU_Tipi'].transform([gpu_tipi])[0]
-        except:
-            gpu_tipi_enc = 0
-        
-        try:
-            laptop_marka_enc = label_encoders['Laptop_Marka'].transform([laptop_marka])[0]
-        except:
-            laptop_marka_enc = 0
+        laptop_marka = _marka(data)
+        t = observe_stage("predict", "feature_parse", t)
         
-        # Feature array oluştur (pandas DataFrame ile - feature isimleri korunur)
-        # Sıralama: RAM, Depolama, CPU_Seviye, CPU_Nesil, CPU_Marka_encoded, GPU_Tipi_encoded, Laptop_Marka_encoded
-        X = pd.DataFrame([[
-            ram,
-            depolama,
-            cpu_tier,
-            cpu_nesil,
-            cpu_marka_enc,
-            gpu_tipi_enc,
-            laptop_marka_enc
-        ]], columns=['RAM', 'Depolama', 'CPU_Seviye', 'CPU_Nesil', 'CPU_Marka_encoded', 'GPU_Tipi_encoded', 'Laptop_Marka_encoded'])
+        # Encode + feature satırı (modelin kolon sırasında, bilinmeyen kategori -> unknown kodu)
+        bundle = g.bundle
+        values = {
+            "RAM": ram,
+            "Depolama": depolama,
+            "CPU_Seviye": cpu_tier,
+            "CPU_Nesil": cpu_nesil,
+            "CPU_Marka": cpu_marka,
+            "GPU_Tipi": gpu_tipi,
+            "Laptop_Marka": laptop_marka
+        }
+        X = bundle.schema.row(values)
+        unknown = [name for col, name in CATEGORICAL_RESPONSE_NAMES.items()
+                   if col in bundle.schema.vocabularies and not bundle.schema.is_known(col, values[col])]
+        for name in unknown:
+            UNKNOWN_CATEGORIES.inc("predict", name)
+        t = observe_stage("predict", "encode", t)
         
         # Tahmin yap
-        tahmin = model.predict(X)[0]
+        tahmin = predict_cached(bundle, X)[0]
+        t = observe_stage("predict", "predict", t)
         
         # Response
-        return jsonify({
+        response = jsonify({
             "tahmini_fiyat": round(float(tahmin), 2),
-            "model_version": "v3_full_features",
+            "model_version": bundle.version,
+            "model_loaded_at": bundle.loaded_at,
             "input_features": {
                 "ram_gb": ram,
                 "ssd_gb": depolama,
@@ -217,8 +391,12 @@ def predict():
                 "cpu_brand": cpu_marka,
                 "gpu_type": gpu_tipi,
                 "laptop_brand": laptop_marka
-            }
+            },
+            # Bu değerler model tarafından tanınmadı, unknown sınıfı olarak fiyatlandı
+            "unknown_features": unknown
         })
+        observe_stage("predict", "serialize", t)
+        return response
     
     except Exception as e:
         return jsonify({
@@ -226,34 +404,389 @@ def predict():
             "message": "Tahmin sırasında hata oluştu"
         }), 400
 
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    """
+    Toplu fiyat tahmini endpoint'i.
+    Body: [{ram_gb, ssd_gb, islemci, ekran_karti, marka}, ...] veya {"items": [...]}
+    Sonuçlar istek sırasıyla döner; hatalı kalemler "error" alanı taşır.
+    """
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    items = data.get("items") if isinstance(data, dict) else data
+    t = observe_stage("predict_batch", "json_parse", t)
+
+    if not isinstance(items, list):
+        return jsonify({
+            "error": "Body bir liste ya da {\"items\": [...]} olmalı",
+            "message": "Tahmin sırasında hata oluştu"
+        }), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({
+            "error": f"En fazla {MAX_BATCH_SIZE} kalem gönderilebilir",
+            "message": "Tahmin sırasında hata oluştu"
+        }), 413
+
+    if metrics.enabled:
+        BATCH_ITEMS.labels("predict_batch").observe(len(items))
+
+    bundle = g.bundle
+    try:
+        batch, X, errors = extract_features_batch(items, bundle.schema)
+
+        # Tek matris, tek model.predict çağrısı
+        t = time.perf_counter()
+        tahminler = predict_cached(bundle, X) if len(batch) else []
+        t = observe_stage("predict_batch", "predict", t)
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "message": "Tahmin sırasında hata oluştu"
+        }), 400
+
+    unknown = {}
+    for col, name in CATEGORICAL_RESPONSE_NAMES.items():
+        if col in bundle.schema.vocabularies and len(batch):
+            mask = bundle.schema.unknown_mask(col, list(batch[col]))
+            if mask.any():
+                UNKNOWN_CATEGORIES.inc("predict_batch", name, amount=int(mask.sum()))
+            unknown[name] = mask
+
+    results = [None] * len(items)
+    for i, message in errors.items():
+        results[i] = {"index": i, "error": message}
+
+    for j, (row, tahmin) in enumerate(zip(batch.itertuples(index=False), tahminler)):
+        results[row.idx] = {
+            "index": row.idx,
+            "tahmini_fiyat": round(float(tahmin), 2),
+            "input_features": {
+                "ram_gb": row.RAM,
+                "ssd_gb": row.Depolama,
+                "cpu_tier": int(row.CPU_Seviye),
+                "cpu_generation": int(row.CPU_Nesil),
+                "cpu_brand": row.CPU_Marka,
+                "gpu_type": row.GPU_Tipi,
+                "laptop_brand": row.Laptop_Marka
+            },
+            "unknown_features": [name for name, mask in unknown.items() if mask[j]]
+        }
+
+    response = jsonify({
+        "model_version": bundle.version,
+        "model_loaded_at": bundle.loaded_at,
+        "count": len(items),
+        "error_count": len(errors),
+        "results": results
+    })
+    observe_stage("predict_batch", "serialize", t)
+    return response
+
+# -----------------------
+# SmartShop ML Endpoint'leri (4-Integration-Layer MLServiceClient)
+# -----------------------
+# İstek gövdeleri snake_case, cevaplar .NET DTO'larına uygun camelCase.
+def ml_error(message, status):
+    return jsonify({"success": False, "error": message, "timestamp": datetime.now().isoformat()}), status
+
+
+def _tam_sayi(value):
+    """JSON tam sayısı (ya da "42" gibi metin); 1.7, true, "1.0" ValueError"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"tam sayı değil: {value!r}")
+    return int(value)
+
+@app.route("/api/ml/similar-products", methods=["POST"])
+def similar_products_endpoint():
+    """
+    Benzer ürünler (KD-tree, normalize model feature'ları).
+    Body: {"product_id": 42, "limit": 5}
+    """
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("similar_products", "json_parse", t)
+    if similar_products is None:
+        return ml_error("Benzer ürün indeksi kapalı veya katalog bulunamadı", 503)
+    if not isinstance(data, dict):
+        return ml_error("Body bir JSON nesnesi olmalı", 400)
+
+    try:
+        product_id = _tam_sayi(data.get("product_id"))
+        limit = _tam_sayi(data.get("limit", 5))
+    except (TypeError, ValueError):
+        return ml_error("product_id ve limit tam sayı olmalı", 400)
+    limit = max(1, min(limit, MAX_SIMILAR_LIMIT))
+
+    index = similar_products.index(g.bundle)
+    if index is None:
+        return ml_error("Benzer ürün indeksi hazır değil", 503)
+    neighbours = index.query(product_id, limit)
+    t = observe_stage("similar_products", "query", t)
+    if neighbours is None:
+        return ml_error(f"Ürün bulunamadı: {product_id}", 404)
+
+    response = jsonify({
+        "success": True,
+        "productId": product_id,
+        "similarProducts": [
+            {"productId": pid, "similarityScore": score} for pid, score in neighbours
+        ],
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("similar_products", "serialize", t)
+    return response
+
+@app.route("/api/ml/recommendations", methods=["POST"])
+def recommendations_endpoint():
+    """
+    Kişisel öneriler (önceden hesaplanmış top-K; bilinmeyen kullanıcıya popüler ürünler).
+    Body: {"user_id": 7, "limit": 10}
+    """
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("recommendations", "json_parse", t)
+    if not isinstance(data, dict):
+        return ml_error("Body bir JSON nesnesi olmalı", 400)
+
+    try:
+        user_id = _tam_sayi(data.get("user_id"))
+        limit = _tam_sayi(data.get("limit", 10))
+    except (TypeError, ValueError):
+        return ml_error("user_id ve limit tam sayı olmalı", 400)
+    limit = max(1, min(limit, MAX_RECOMMENDATION_LIMIT))
+
+    store = recommendations.store()
+    if store is None:
+        return ml_error("Öneri deposu bulunamadı (python train_recommendations.py)", 503)
+    items, personal = store.recommend(user_id, limit)
+    t = observe_stage("recommendations", "lookup", t)
+
+    response = jsonify({
+        "success": True,
+        "userId": user_id,
+        "recommendations": [{"productId": pid, "score": score} for pid, score in items],
+        "personalized": personal,
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("recommendations", "serialize", t)
+    return response
+
+def fraud_results(risk, is_fraud, confidence):
+    return [
+        {"isFraud": bool(f), "riskScore": round(float(r), 6), "confidence": round(float(c), 6)}
+        for r, f, c in zip(risk, is_fraud, confidence)
+    ]
+
+@app.route("/api/ml/detect-fraud", methods=["POST"])
+def detect_fraud():
+    """
+    Checkout fraud skoru (gecikme bütçeli).
+    Body: {"transaction_data": {"amount": 15000, "user_id": 1, "card_country": "TR", ...}}
+    """
+    deadline = g.request_started + FRAUD_BUDGET_SECONDS
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("detect_fraud", "json_parse", t)
+    transaction = data.get("transaction_data") if isinstance(data, dict) else None
+    if not isinstance(transaction, dict):
+        return ml_error("transaction_data bir JSON nesnesi olmalı", 400)
+
+    risk, is_fraud, confidence, scoring, reason = fraud_scorer.score([transaction], deadline=deadline)
+    t = observe_stage("detect_fraud", "score", t)
+    if metrics.enabled:
+        FRAUD_SCORES.inc(scoring, reason or "")
+
+    result = fraud_results(risk, is_fraud, confidence)[0]
+    response = jsonify({
+        "success": True,
+        **result,
+        "scoring": scoring,
+        "fallbackReason": reason,
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("detect_fraud", "serialize", t)
+    return response
+
+@app.route("/api/ml/detect-fraud/batch", methods=["POST"])
+def detect_fraud_batch():
+    """
+    Geçmiş işlemleri toplu yeniden skorla (bütçesiz, tek matris çarpımı).
+    Body: {"transactions": [{...}, {...}]}
+    """
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("detect_fraud_batch", "json_parse", t)
+    transactions = data.get("transactions") if isinstance(data, dict) else None
+    if not isinstance(transactions, list) or not all(isinstance(tx, dict) for tx in transactions):
+        return ml_error("transactions bir JSON nesneleri listesi olmalı", 400)
+    if len(transactions) > MAX_BATCH_SIZE:
+        return ml_error(f"En fazla {MAX_BATCH_SIZE} işlem gönderilebilir", 400)
+    if metrics.enabled:
+        BATCH_ITEMS.labels("detect_fraud_batch").observe(len(transactions))
+
+    results, scoring, reason = [], None, None
+    if transactions:
+        risk, is_fraud, confidence, scoring, reason = fraud_scorer.score(transactions)
+        results = fraud_results(risk, is_fraud, confidence)
+        if metrics.enabled:
+            FRAUD_SCORES.inc(scoring, reason or "", amount=len(results))
+    t = observe_stage("detect_fraud_batch", "score", t)
+
+    response = jsonify({
+        "success": True,
+        "count": len(results),
+        "flagged": sum(r["isFraud"] for r in results),
+        "results": results,
+        "scoring": scoring,
+        "fallbackReason": reason,
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("detect_fraud_batch", "serialize", t)
+    return response
+
+@app.route("/api/ml/segment-customer", methods=["POST"])
+def segment_customer():
+    """
+    Müşteri segmenti (en yakın KMeans merkezi).
+    Body: {"customer_data": {"total_spent": 5500, "order_count": 12, "days_since_last_order": 20}}
+    """
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("segment_customer", "json_parse", t)
+    customer = data.get("customer_data") if isinstance(data, dict) else None
+    if not isinstance(customer, dict):
+        return ml_error("customer_data bir JSON nesnesi olmalı", 400)
+    model = customer_segmenter.model()
+    if model is None:
+        return ml_error("Segment modeli bulunamadı (python train_segment_model.py)", 503)
+
+    segment, segment_id, confidence = customer_segmenter.assign(model, [customer])[0]
+    t = observe_stage("segment_customer", "assign", t)
+    response = jsonify({
+        "success": True,
+        "segment": segment,
+        "segmentId": segment_id,
+        "confidence": round(confidence, 6),
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("segment_customer", "serialize", t)
+    return response
+
+@app.route("/api/ml/segment-customer/batch", methods=["POST"])
+def segment_customer_batch():
+    """
+    Toplu segmentasyon.
+    JSON:     {"customers": [{...}, {...}]}  -> results listesi
+    text/csv: müşteri CSV'si (başlıklı) -> segment, segment_id, confidence kolonları
+              eklenmiş CSV, parça parça okunup akış olarak döner
+    """
+    model = customer_segmenter.model()
+    if model is None:
+        return ml_error("Segment modeli bulunamadı (python train_segment_model.py)", 503)
+
+    if request.mimetype == "text/csv":
+        lines = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+        chunks = customer_segmenter.stream_csv(model, lines, SEGMENT_CHUNK_SIZE)
+        return Response(stream_with_context(chunks), mimetype="text/csv")
+
+    t = time.perf_counter()
+    data = request.get_json(silent=True)
+    t = observe_stage("segment_customer_batch", "json_parse", t)
+    customers = data.get("customers") if isinstance(data, dict) else None
+    if not isinstance(customers, list) or not all(isinstance(c, dict) for c in customers):
+        return ml_error("customers bir JSON nesneleri listesi olmalı", 400)
+    if len(customers) > MAX_BATCH_SIZE:
+        return ml_error(f"En fazla {MAX_BATCH_SIZE} müşteri gönderilebilir (daha fazlası için text/csv)", 400)
+    if metrics.enabled:
+        BATCH_ITEMS.labels("segment_customer_batch").observe(len(customers))
+
+    assigned = customer_segmenter.assign(model, customers) if customers else []
+    t = observe_stage("segment_customer_batch", "assign", t)
+    response = jsonify({
+        "success": True,
+        "count": len(assigned),
+        "results": [
+            {"segment": segment, "segmentId": segment_id, "confidence": round(confidence, 6)}
+            for segment, segment_id, confidence in assigned
+        ],
+        "timestamp": datetime.now().isoformat()
+    })
+    observe_stage("segment_customer_batch", "serialize", t)
+    return response
+
 @app.route("/health", methods=["GET"])
 def health():
     """API sağlık kontrolü"""
+    bundle = g.bundle
     return jsonify({
         "status": "healthy",
-        "model": "laptop_fiyat_model.pkl",
-        "features": [
-            "RAM",
-            "Depolama", 
-            "CPU_Seviye",
-            "CPU_Nesil",
-            "CPU_Marka_encoded",
-            "GPU_Tipi_encoded",
-            "Laptop_Marka_encoded"
-        ],
-        "available_encoders": list(label_encoders.keys()) if label_encoders else []
+        "model": bundle.source,
+        "model_path": bundle.path,
+        "model_format": bundle.info()["format"],
+        "model_checksum": bundle.checksum,
+        "model_version": bundle.version,
+        "features": bundle.schema.feature_names,
+        "available_encoders": list(bundle.schema.vocabularies.keys()),
+        "inference_engine": "compiled" if bundle.fast_model is not None else "sklearn",
+        "parser_cache": cache_info(),
+        "prediction_cache": prediction_cache.stats(),
+        "unknown_categories": bundle.schema.unknown_stats(),
+        "micro_batch": micro_batcher.stats() if micro_batcher is not None else {"enabled": False},
+        "price_grid": bundle.info()["price_grid"],
+        "model_registry": registry.status(),
+        "similar_products": similar_products.status() if similar_products is not None else {"enabled": False},
+        "recommendations": recommendations.status(),
+        "fraud": {**fraud_scorer.status(), "budget_ms": FRAUD_BUDGET_SECONDS * 1000},
+        "segmentation": customer_segmenter.status(),
+        "startup": STARTUP
     })
 
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Prometheus metrikleri (ML_METRICS=0 ise kapalı)"""
+    if not metrics.enabled:
+        return jsonify({"error": "Metrikler kapalı", "message": "ML_METRICS=0"}), 404
+    return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
+
+@app.route("/admin/reload", methods=["POST"])
+def admin_reload():
+    """
+    Modeli kesintisiz yeniden yükle (arka planda yükle + doğrula + değiştir).
+    Çoklu worker'da yalnızca isteği alan worker yenilenir; tümü için
+    ML_MODEL_WATCH_SECONDS ile dosya izleme kullanın.
+    """
+    if ADMIN_TOKEN:
+        if request.headers.get("X-Admin-Token") != ADMIN_TOKEN:
+            return jsonify({"error": "Yetkisiz", "message": "Geçersiz X-Admin-Token"}), 403
+    elif request.remote_addr not in ("127.0.0.1", "::1"):
+        return jsonify({"error": "Yetkisiz", "message": "Yalnızca localhost'tan çağrılabilir"}), 403
+
+    started = registry.reload(background=True)
+    return jsonify({
+        "reload_started": started,
+        "message": "Model arka planda yükleniyor" if started else "Yenileme zaten sürüyor",
+        "model_registry": registry.status()
+    }), 202
+
 @app.route("/", methods=["GET"])
 def index():
     """Ana sayfa - API bilgisi"""
     return jsonify({
         "service": "Laptop Fiyat Tahmin API",
         "version": "3.0",
-        "model": "laptop_fiyat_model.pkl",
+        "model": registry.current.source,
         "endpoints": {
             "POST /predict": "Fiyat tahmini yap",
+            "POST /predict/batch": "Toplu fiyat tahmini (liste)",
+            "POST /api/ml/similar-products": "Benzer ürünler (KD-tree)",
+            "POST /api/ml/recommendations": "Kişisel öneriler (top-K depo)",
+            "POST /api/ml/detect-fraud": "Fraud skoru (gecikme bütçeli)",
+            "POST /api/ml/detect-fraud/batch": "Toplu fraud skoru",
+            "POST /api/ml/segment-customer": "Müşteri segmenti",
+            "POST /api/ml/segment-customer/batch": "Toplu müşteri segmenti (JSON veya CSV akışı)",
+            "POST /admin/reload": "Modeli kesintisiz yeniden yükle",
             "GET /health": "Sistem durumu",
+            "GET /metrics": "Prometheus metrikleri",
             "GET /": "Bu sayfa"
         },
         "example_request": {
@@ -272,18 +805,27 @@ if __name__ == "__main__":
     print("\n" + "="*70)
     print("🚀 LAPTOP FİYAT TAHMİN API - GELİŞMİŞ MODEL")
     print("="*70)
-    print(f"📦 Model: laptop_fiyat_model.pkl")
-    print(f"🔧 Encoders: label_encoders.pkl")
+    print(f"📦 Model: {registry.current.path} (sha256 {registry.current.checksum[:12]})")
     print(f"🌐 URL: http://127.0.0.1:5000")
     print(f"📝 Endpoints:")
     print(f"   POST /predict  - Fiyat tahmini")
+    print(f"   POST /predict/batch - Toplu fiyat tahmini")
+    print(f"   POST /api/ml/similar-products - Benzer ürünler")
+    print(f"   POST /api/ml/recommendations - Kişisel öneriler")
+    print(f"   POST /api/ml/detect-fraud - Fraud skoru (+ /batch)")
+    print(f"   POST /api/ml/segment-customer - Müşteri segmenti (+ /batch)")
+    print(f"   POST /admin/reload - Modeli yeniden yükle")
     print(f"   GET  /health   - Sistem durumu")
+    print(f"   GET  /metrics  - Prometheus metrikleri")
     print(f"   GET  /         - API bilgisi")
     print("="*70)
     print("💡 Örnek request:")
     print('   {"ram_gb": 16, "ssd_gb": 512,')
     print('    "islemci": "Intel Core i7-12700H",')
     print('    "ekran_karti": "NVIDIA RTX 3060"}')
+    print("="*70)
+    print("⚠️ Geliştirme sunucusu! Production için: python api/serve.py")
     print("="*70 + "\n")
     
-    app.run(host="127.0.0.1", port=5000, debug=True)
+    # Debug (reloader + debugger) yalnızca açıkça istenirse: FLASK_DEBUG=1
+    app.run(host="127.0.0.1", port=5000, debug=os.environ.get("FLASK_DEBUG") == "1")
@@ -0,0 +1,108 @@
+"""
+Checkout fraud skoru: lojistik model + sabit gecikme bütçesi + kural yedeği.
+
+Her istek bir bitiş zamanı (deadline) ile gelir. Feature'lar çıkarıldıktan
+sonra kalan süre modelin son ölçülen maliyetine yetmiyorsa (veya model
+yüklü değilse / hata verirse) kural tabanlı skor döner; checkout hiçbir
+zaman modeli beklemez. Toplu yeniden skorlama bütçesizdir.
+
+Model dosyası (model/fraud_model.json) değişince WatchedFile ile yeniden
+okunur; okunamazsa eski model kalır.
+"""
+
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from fraud_model import FraudModel, build_schema, transaction_columns, rule_scores
+from watched_file import WatchedFile
+
+# Kural skoru modelden daha kaba: eşik ve güven üst sınırı
+RULE_THRESHOLD = 0.5
+RULE_MAX_CONFIDENCE = 0.75
+
+# Tek satırlık (checkout) model maliyeti tahmini (üstel hareketli ortalama)
+COST_SMOOTHING = 0.1
+
+
+def confidence_scores(risk, threshold, max_confidence=1.0):
+    """Eşiğe uzaklık -> [0.5, max_confidence] güven"""
+    margin = np.where(risk >= threshold, (risk - threshold) / max(1.0 - threshold, 1e-9),
+                      (threshold - risk) / max(threshold, 1e-9))
+    return np.minimum(0.5 + 0.5 * np.clip(margin, 0.0, 1.0), max_confidence)
+
+
+class FraudScorer:
+    """Fraud modelini yükler, güncel tutar ve bütçeli skorlar"""
+
+    def __init__(self, path, check_seconds=5.0):
+        self.path = path
+        self.schema = build_schema()
+        self._watch = WatchedFile([path], self._load, check_seconds, name="Fraud modeli")
+        self.model_cost = 0.0
+        self.last_error = None
+        self.scored = Counter()  # "model" / "rules:<sebep>"
+
+    def _load(self):
+        model = FraudModel.load(self.path)
+        print(f"🛡️ Fraud modeli yüklendi (eşik {model.threshold:.2f})")
+        return model
+
+    def model(self):
+        """Güncel model (yoksa None); dosya değiştiyse yeniden okunur"""
+        return self._watch.get()
+
+    def _model_scores(self, model, X):
+        started = time.perf_counter()
+        risk = model.predict_proba(X)
+        cost = time.perf_counter() - started
+        if len(X) == 1:
+            self.model_cost = (cost if not self.model_cost
+                               else (1 - COST_SMOOTHING) * self.model_cost + COST_SMOOTHING * cost)
+        return risk
+
+    def score(self, transactions, deadline=None):
+        """
+        transaction_data listesi -> (risk, is_fraud, confidence, scoring, fallback_reason).
+        deadline (perf_counter) verilirse model yalnızca kalan süreye sığıyorsa çalışır.
+        """
+        X = self.schema.matrix(transaction_columns(transactions))
+        model = self.model()
+
+        reason = None
+        if model is None:
+            reason = "no_model"
+        elif deadline is not None and time.perf_counter() + self.model_cost > deadline:
+            reason = "budget"
+        else:
+            try:
+                risk = self._model_scores(model, X)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                reason = "error"
+
+        if reason is None:
+            self.scored["model"] += len(X)
+            return risk, risk >= model.threshold, confidence_scores(risk, model.threshold), "model", None
+
+        self.scored[f"rules:{reason}"] += len(X)
+        risk = rule_scores(X)
+        confidence = confidence_scores(risk, RULE_THRESHOLD, RULE_MAX_CONFIDENCE)
+        return risk, risk >= RULE_THRESHOLD, confidence, "rules", reason
+
+    def status(self):
+        model = self._watch.current
+        return {
+            "model": os.path.basename(self.path),
+            "ready": model is not None,
+            "threshold": model.threshold if model is not None else None,
+            "trained_at": model.metadata.get("trained_at") if model is not None else None,
+            "test_auc": model.metadata.get("test_auc") if model is not None else None,
+            "model_cost_us": round(self.model_cost * 1e6, 2),
+            "scored": dict(self.scored),
+            "loads": self._watch.loads,
+            "last_error": self.last_error or self._watch.last_error,
+            "unknown_categories": self.schema.unknown_stats(),
+        }
@@ -0,0 +1,185 @@
+"""
+Prometheus metin biçiminde (text exposition 0.0.4) basit metrik katmanı.
+
+Harici bağımlılık yok: histogram, etiketli sayaç ve geri çağırmalı gauge.
+Gözlem başına maliyet bir kilit + bisect (~1 µs); ML_METRICS=0 ile tamamen
+kapatılır. Değerler süreç başınadır; gunicorn'da her worker kendi
+değerlerini tutar (scrape hangi worker'a düşerse onun sayıları döner).
+"""
+
+import os
+import sys
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden aşama süreleri: 10 µs .. 2.5 sn
+LATENCY_BOUNDS = [0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                  0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+BATCH_SIZE_BOUNDS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class Histogram:
+    """Sabit sınırlı, thread-safe basit histogram"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # son kova: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect_left(self.bounds, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            # JSON anahtar sıralamasından etkilenmesin diye [sınır, adet] listesi
+            buckets = [[b, c] for b, c in zip(self.bounds, self.counts)]
+            buckets.append(["+Inf", self.counts[-1]])
+            return {
+                "count": self.count,
+                "sum": round(self.sum, 6),
+                "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+                "buckets": buckets,
+            }
+
+    def cumulative(self):
+        """Prometheus için (sınırlar, kümülatif adetler, toplam, adet)"""
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        running = 0
+        cumulative = []
+        for c in counts:
+            running += c
+            cumulative.append(running)
+        return self.bounds, cumulative, total, count
+
+
+class HistogramVec:
+    """Etiket kombinasyonu başına bir Histogram"""
+
+    def __init__(self, label_names, bounds):
+        self.label_names = tuple(label_names)
+        self.bounds = bounds
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, Histogram(self.bounds))
+        return child
+
+    def items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class CounterVec:
+    """Etiketli, yalnızca artan sayaç"""
+
+    def __init__(self, label_names):
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values, amount=1):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def items(self):
+        with self._lock:
+            return list(self._values.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def process_rss_bytes():
+    """Sürecin anlık RSS'i (Linux: /proc, diğerleri: tepe değer veya None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:  # Windows
+        return None
+
+
+class MetricsRegistry:
+    """Kayıtlı metrikleri Prometheus metnine çevirir"""
+
+    def __init__(self, enabled=True, prefix="ml_"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._metrics = []  # (isim, tip, açıklama, nesne)
+
+    def histogram(self, name, help_text, label_names=(), bounds=LATENCY_BOUNDS):
+        metric = HistogramVec(label_names, bounds)
+        self._metrics.append((self.prefix + name, "histogram", help_text, metric))
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        metric = CounterVec(label_names)
+        self._metrics.append((self.prefix + name, "counter", help_text, metric))
+        return metric
+
+    def gauge(self, name, help_text, fn, label_names=()):
+        """fn() -> sayı, None (atlanır) veya {etiket değerleri tuple'ı: sayı}"""
+        self._metrics.append((self.prefix + name, "gauge", help_text, (label_names, fn)))
+
+    def register_histogram(self, name, help_text, histogram):
+        """Başka bir bileşenin (ör. MicroBatcher) etiketsiz histogramını yayınla"""
+        self._metrics.append((self.prefix + name, "histogram", help_text, {(): histogram}))
+
+    def render(self):
+        lines = []
+        for name, kind, help_text, metric in self._metrics:
+            if kind == "gauge":
+                names, fn = metric
+                value = fn()
+                if value is None:
+                    continue
+                series = list(value.items()) if isinstance(value, dict) else [((), value)]
+            else:
+                names = getattr(metric, "label_names", ())
+                series = metric.items()
+
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for label_values, value in series:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(names, label_values)} {_number(value)}")
+                    continue
+                bounds, cumulative, total, count = value.cumulative()
+                for bound, c in zip(bounds + [float("inf")], cumulative):
+                    le = f'le="{_number(bound)}"'
+                    lines.append(f"{name}_bucket{_labels(names, label_values, le)} {c}")
+                lines.append(f"{name}_sum{_labels(names, label_values)} {_number(float(total))}")
+                lines.append(f"{name}_count{_labels(names, label_values)} {count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,111 @@
+"""
+Eşzamanlı tekil /predict isteklerini mikro-batch'lere toplayan katman.
+
+Her istek kendi model.predict çağrısını yapmak yerine bir kuyruğa girer;
+arka plandaki worker thread kısa bir pencere (ör. ≤2 ms) veya N kalem dolana
+kadar bekler, hepsini tek vektörel çağrıyla tahmin eder ve sonuçları bekleyen
+isteklere dağıtır. Batch boyutu ve kuyrukta bekleme süresi histogramları
+pencereyi p99 gecikmeye göre ayarlamak için dışarı verilir.
+
+Model yenilenirken kuyrukta farklı modellere ait satırlar bulunabilir; her
+kalem kendi predict_fn'ini taşır ve batch bu fonksiyona göre gruplanır.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from metrics import Histogram
+
+
+class MicroBatcher:
+    """predict_fn(X) çağrılarını eşzamanlı istekler arasında birleştirir"""
+
+    BATCH_SIZE_BOUNDS = [1, 2, 4, 8, 16, 32, 64, 128]
+    QUEUE_WAIT_MS_BOUNDS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50]
+
+    def __init__(self, predict_fn, max_batch=32, max_wait_ms=2.0, timeout=5.0):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+
+        self.batch_size = Histogram(self.BATCH_SIZE_BOUNDS)
+        self.queue_wait_ms = Histogram(self.QUEUE_WAIT_MS_BOUNDS)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+
+    def _ensure_started(self):
+        # Thread'ler fork'tan sonra kopyalanmaz: her worker süreci kendi thread'ini açar
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+
+    def submit(self, row, predict_fn=None):
+        """Tek feature satırını kuyruğa koy, tahmin gelene kadar bekle"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((np.asarray(row, dtype=np.float64), future, time.perf_counter(),
+                         predict_fn or self.predict_fn))
+        return future.result(timeout=self.timeout)
+
+    def _collect(self):
+        items = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            started = time.perf_counter()
+            for _, _, enqueued, _ in items:
+                self.queue_wait_ms.observe((started - enqueued) * 1000.0)
+            self.batch_size.observe(len(items))
+
+            groups = {}
+            for item in items:
+                groups.setdefault(item[3], []).append(item)
+
+            for predict_fn, group in groups.items():
+                try:
+                    tahminler = predict_fn(np.vstack([row for row, _, _, _ in group]))
+                except Exception:
+                    # Tek hatalı satır (ör. NaN) diğer isteklerin batch'ini düşürmesin:
+                    # satır satır yeniden dene, hatayı yalnızca ilgili isteğe ver
+                    for row, future, _, _ in group:
+                        try:
+                            future.set_result(float(predict_fn(row[None, :])[0]))
+                        except Exception as e:
+                            future.set_exception(e)
+                    continue
+
+                for (_, future, _, _), tahmin in zip(group, tahminler):
+                    future.set_result(float(tahmin))
+
+    def stats(self):
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
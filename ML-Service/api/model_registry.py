@@ -0,0 +1,339 @@
+"""
+Model registry: sıfır kesintili model yenileme (hot reload).
+
+Model, encoder'lar ve bunlardan türetilen her şey (feature şeması, derlenmiş
+model, fiyat tablosu) tek bir ModelBundle içinde tutulur. Yeni artefakt arka
+planda yüklenip doğrulanır; başarılı olursa registry'nin işaret ettiği bundle
+tek bir atama ile değiştirilir. Devam eden istekler başladıkları bundle ile
+tamamlanır, hatalı bir artefakt eski modeli asla düşürmez.
+
+Tetikleyiciler:
+  - SIGHUP (Windows hariç; gunicorn'da worker süreçlerine gönderilmeli)
+  - POST /admin/reload
+  - dosya izleme (ML_MODEL_WATCH_SECONDS > 0) - çoklu worker'da önerilen yol
+
+Kaynak: model/laptop_fiyat_model.lfm varsa (train_model.py yazar) yalnızca
+NumPy ile mmap üzerinden açılır; pandas/sklearn/joblib hiç import edilmez.
+Yoksa (veya ML_MODEL_ARTIFACT=0) pickle dosyalarına düşülür.
+"""
+
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from feature_schema import FeatureSchema
+from model_artifact import read_artifact
+from price_grid import PriceGrid, grid_axes, file_sha256
+from tree_ensemble import CompiledTreeEnsemble, verify_against
+
+MODEL_FILE = "laptop_fiyat_model.pkl"
+ENCODERS_FILE = "label_encoders.pkl"
+ARTIFACT_FILE = "laptop_fiyat_model.lfm"
+PRICE_GRID_FILE = "price_grid"
+
+# Modelin beklediği feature sırası (train_model.py ile aynı)
+FEATURE_COLUMNS = ['RAM', 'Depolama', 'CPU_Seviye', 'CPU_Nesil', 'CPU_Marka_encoded', 'GPU_Tipi_encoded', 'Laptop_Marka_encoded']
+
+# Tek satır ve küçük batch'ler derlenmiş model ile; büyük batch'lerde sklearn'in
+# Cython yolu daha hızlı olduğu için FAST_BATCH_LIMIT üstünde model.predict kullanılır
+FAST_BATCH_LIMIT = int(os.environ.get("ML_FAST_BATCH_LIMIT", "64"))
+
+
+class ModelBundle:
+    """Birlikte yüklenip birlikte değiştirilen model parçaları"""
+
+    def __init__(self, model, label_encoders, schema, fast_model, version, loaded_at, load_seconds, model_sha256,
+                 source=MODEL_FILE, metadata=None, path=None, checksum=None):
+        self.model = model
+        self.label_encoders = label_encoders
+        self.schema = schema
+        self.fast_model = fast_model
+        self.price_grid = None
+        self.version = version
+        self.loaded_at = loaded_at
+        self.load_seconds = load_seconds
+        self.model_sha256 = model_sha256
+        self.source = source
+        self.metadata = metadata or {}
+        self.path = path or source
+        # Yüklenen dosyanın sağlaması (.lfm: başlıktaki buffer sha256'sı, .pkl: dosya sha256'sı)
+        self.checksum = checksum or model_sha256
+
+    def predict_matrix(self, X):
+        """(n, 7) float64 feature matrisi için tahmin dizisi döner"""
+        # Artefakttan yüklendiyse sklearn modeli yok: her boyut derlenmiş modelle
+        if self.fast_model is not None and (len(X) <= FAST_BATCH_LIMIT or self.model is None):
+            return self.fast_model.predict(X)
+        import pandas as pd
+        return self.model.predict(pd.DataFrame(X, columns=self.schema.feature_names))
+
+    def info(self):
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "load_seconds": round(self.load_seconds, 3),
+            "source": self.source,
+            "path": self.path,
+            "format": os.path.splitext(self.source)[1].lstrip("."),
+            "checksum": self.checksum,
+            "inference_engine": "compiled" if self.fast_model is not None else "sklearn",
+            "price_grid": {
+                "enabled": self.price_grid is not None,
+                "cells": self.price_grid.n_cells if self.price_grid is not None else 0
+            },
+        }
+
+
+def _load_price_grid(bundle, model_dir):
+    """model/price_grid dosyasını aç; yoksa veya eskiyse yükleme anında üret"""
+    grid_path = os.path.join(model_dir, PRICE_GRID_FILE)
+    try:
+        grid = PriceGrid.load(grid_path)
+        if grid.meta.get("model_sha256") == bundle.model_sha256:
+            print(f"✅ Fiyat tablosu yüklendi (mmap): {grid.n_cells:,} hücre")
+            return grid
+        print("⚠️ Fiyat tablosu farklı bir modele ait, yeniden hesaplanıyor...")
+    except FileNotFoundError:
+        print("ℹ️ Fiyat tablosu bulunamadı, yükleme anında hesaplanıyor...")
+    except ValueError as e:
+        print(f"⚠️ Fiyat tablosu bozuk ({e}), yeniden hesaplanıyor...")
+
+    predict_fn = bundle.predict_matrix
+    model_path = os.path.join(model_dir, MODEL_FILE)
+    if bundle.model is None and os.path.exists(model_path) and file_sha256(model_path) == bundle.model_sha256:
+        # Milyonlarca hücrede sklearn'in Cython yolu derlenmiş modelden ~5 kat hızlı;
+        # tablo kaydedildiği için bu yalnızca ilk açılışta olur
+        import joblib
+        import pandas as pd
+        model = joblib.load(model_path)
+        predict_fn = lambda X: model.predict(pd.DataFrame(X, columns=bundle.schema.feature_names))
+
+    grid = PriceGrid.build(bundle.schema.feature_names, grid_axes(bundle.schema.vocabularies),
+                           predict_fn, meta={"model_sha256": bundle.model_sha256})
+    try:
+        grid.save(grid_path)
+    except OSError as e:
+        print(f"⚠️ Fiyat tablosu kaydedilemedi: {e}")
+    print(f"✅ Fiyat tablosu hazır: {grid.n_cells:,} hücre")
+    return grid
+
+
+def use_artifact(model_dir):
+    return os.environ.get("ML_MODEL_ARTIFACT", "1") != "0" and os.path.exists(os.path.join(model_dir, ARTIFACT_FILE))
+
+
+def _version(path, sha256):
+    mtime = datetime.fromtimestamp(os.stat(path).st_mtime)
+    return f"{mtime:%Y%m%d-%H%M%S}-{sha256[:8]}"
+
+
+def _load_artifact(model_dir):
+    """Tek dosyalık artefakt: yalnızca NumPy, ağaç dizileri mmap"""
+    artifact_path = os.path.join(model_dir, ARTIFACT_FILE)
+    artifact = read_artifact(artifact_path)
+
+    print(f"✅ Artefakt yüklendi (mmap): {ARTIFACT_FILE}")
+    print(f"📊 Kullanılabilir encoders: {list(artifact.vocabularies.keys())}")
+    print(f"📊 Feature isimleri: {artifact.feature_names}")
+    print(f"✅ Derlenmiş model: {artifact.engine.n_trees} ağaç "
+          f"(eğitim: {artifact.metadata.get('trained_at', '?')}, sha256 {artifact.checksum[:12]})")
+
+    return ModelBundle(
+        model=None,
+        label_encoders=None,
+        schema=FeatureSchema(artifact.feature_names, artifact.vocabularies),
+        fast_model=artifact.engine,
+        version=_version(artifact_path, artifact.checksum),
+        loaded_at=datetime.now().isoformat(timespec="seconds"),
+        load_seconds=0.0,
+        # Fiyat tablosu pickle'ın sha256'sı ile eşleştirilir (train_model.py ile aynı)
+        model_sha256=artifact.metadata.get("model_sha256", artifact.checksum),
+        source=ARTIFACT_FILE,
+        metadata=artifact.metadata,
+        path=os.path.abspath(artifact_path),
+        checksum=artifact.checksum,
+    )
+
+
+def _load_pickle(model_dir):
+    """Pickle dosyaları: joblib + sklearn (ağır import'lar burada yapılır)"""
+    import joblib
+
+    model_path = os.path.join(model_dir, MODEL_FILE)
+    encoders_path = os.path.join(model_dir, ENCODERS_FILE)
+
+    model = joblib.load(model_path)
+    label_encoders = joblib.load(encoders_path)
+
+    print(f"✅ Model yüklendi: {MODEL_FILE}")
+    print(f"✅ Encoders yüklendi: {ENCODERS_FILE}")
+    print(f"📊 Kullanılabilir encoders: {list(label_encoders.keys())}")
+
+    feature_names = list(getattr(model, "feature_names_in_", FEATURE_COLUMNS))
+    if model.n_features_in_ != len(feature_names):
+        raise ValueError(f"Model {model.n_features_in_} feature bekliyor, şema {len(feature_names)} içeriyor")
+    print(f"📊 Feature isimleri: {feature_names}")
+
+    # Encoder sözlükleri + modelin kolon sırası: istek başına LabelEncoder/DataFrame yok
+    schema = FeatureSchema.from_label_encoders(label_encoders, feature_names)
+
+    fast_model = None
+    if os.environ.get("ML_FAST_INFERENCE", "1") != "0":
+        try:
+            fast_model = CompiledTreeEnsemble.from_sklearn(model)
+            if verify_against(model, fast_model):
+                print(f"✅ Derlenmiş model doğrulandı: {fast_model.n_trees} ağaç, model.predict ile birebir aynı")
+            else:
+                print("⚠️ Derlenmiş model sonuçları model.predict ile eşleşmedi, sklearn kullanılacak")
+                fast_model = None
+        except ValueError as e:
+            print(f"⚠️ Derlenmiş model oluşturulamadı ({e}), sklearn kullanılacak")
+
+    model_sha = file_sha256(model_path)
+    return ModelBundle(
+        model=model,
+        label_encoders=label_encoders,
+        schema=schema,
+        fast_model=fast_model,
+        version=_version(model_path, model_sha),
+        loaded_at=datetime.now().isoformat(timespec="seconds"),
+        load_seconds=0.0,
+        model_sha256=model_sha,
+        path=os.path.abspath(model_path),
+    )
+
+
+def load_bundle(model_dir):
+    """Model dosyalarını yükle, türetilmiş yapıları kur ve doğrula"""
+    start = time.perf_counter()
+    bundle = _load_artifact(model_dir) if use_artifact(model_dir) else _load_pickle(model_dir)
+
+    # Doğrulama: örnek bir satır sonlu bir fiyat üretmeli
+    schema = bundle.schema
+    sample = schema.matrix({
+        source: [schema.vocabularies[source][0]] if source in schema.vocabularies else [8]
+        for source in schema.sources
+    })
+    if not np.isfinite(bundle.predict_matrix(sample)).all():
+        raise ValueError("Model doğrulaması başarısız: tahmin sonlu değil")
+
+    if os.environ.get("ML_PRICE_GRID") == "1":
+        try:
+            bundle.price_grid = _load_price_grid(bundle, model_dir)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Fiyat tablosu kullanılamıyor ({e}), canlı model kullanılacak")
+
+    bundle.load_seconds = time.perf_counter() - start
+    return bundle
+
+
+class ModelRegistry:
+    """Aktif ModelBundle'ı tutar; yenilemeyi arka planda yapıp atomik değiştirir"""
+
+    def __init__(self, model_dir, loader=load_bundle):
+        self.model_dir = model_dir
+        self.loader = loader
+        self._current = None
+        self._lock = threading.Lock()
+        self._reloading = False
+        self.last_error = None
+        self.reload_count = 0
+        self._watch_pid = None
+        self._loaded_token = None
+        self._failed_token = None
+
+    @property
+    def current(self):
+        # Tek referans okuması: istek boyunca aynı bundle kullanılır
+        return self._current
+
+    def files_token(self):
+        """Model dosyalarının (mtime, boyut) imzası"""
+        token = []
+        names = (ARTIFACT_FILE,) if use_artifact(self.model_dir) else (MODEL_FILE, ENCODERS_FILE)
+        for name in names:
+            st = os.stat(os.path.join(self.model_dir, name))
+            token.append((st.st_mtime_ns, st.st_size))
+        return tuple(token)
+
+    def load(self):
+        """İlk yükleme (senkron, hata yukarı fırlatılır)"""
+        token = self.files_token()
+        self._current = self.loader(self.model_dir)
+        self._loaded_token = token
+        return self._current
+
+    def reload(self, background=True):
+        """Yeni modeli yükle; zaten yenileme sürüyorsa False döner"""
+        with self._lock:
+            if self._reloading:
+                return False
+            self._reloading = True
+        if background:
+            threading.Thread(target=self._reload, name="model-reload", daemon=True).start()
+        else:
+            self._reload()
+        return True
+
+    def _reload(self):
+        token = None
+        try:
+            token = self.files_token()
+            bundle = self.loader(self.model_dir)
+            self._current = bundle
+            self._loaded_token = token
+            self.last_error = None
+            self.reload_count += 1
+            print(f"🔄 Model yenilendi: {bundle.version} ({bundle.load_seconds:.2f} sn)")
+        except Exception as e:
+            # Eski model hizmet vermeye devam eder
+            self.last_error = f"{type(e).__name__}: {e}"
+            self._failed_token = token
+            print(f"❌ Model yenilenemedi, eski model kullanılmaya devam ediyor: {self.last_error}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def install_signal_handler(self):
+        """SIGHUP ile yenileme (yalnızca ana thread'de, Windows'ta yok)"""
+        if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+        return True
+
+    def ensure_watcher(self, interval):
+        """Dosya izleme thread'ini (fork sonrası her süreçte bir kez) başlat"""
+        if interval <= 0 or self._watch_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watch_pid == os.getpid():
+                return
+            self._watch_pid = os.getpid()
+        threading.Thread(target=self._watch, args=(interval,), name="model-watch", daemon=True).start()
+
+    def _watch(self, interval):
+        previous = None
+        while True:
+            time.sleep(interval)
+            try:
+                token = self.files_token()
+            except OSError:
+                continue  # dosya yazılırken geçici olarak yok olabilir
+            # Yazma bitsin diye imza iki ardışık kontrolde aynı kalmalı;
+            # yüklenemeyen dosya değişene kadar tekrar denenmez
+            if token == previous and token not in (self._loaded_token, self._failed_token):
+                self.reload(background=False)
+            previous = token
+
+    def status(self):
+        bundle = self._current
+        return {
+            **(bundle.info() if bundle is not None else {}),
+            "reloading": self._reloading,
+            "reload_count": self.reload_count,
+            "last_error": self.last_error,
+        }
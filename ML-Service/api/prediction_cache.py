@@ -0,0 +1,94 @@
+"""
+Süreç içi tahmin cache'i (LRU + TTL).
+
+Anahtar, ham JSON değil parse/encode sonrası feature tuple'ıdır; böylece
+"Intel Core i7-13620H" ile "i7-13620h" gibi aynı modele giden istekler aynı
+kaydı paylaşır. Her kayıt yüklenen modelin kimliğine (model_token) bağlıdır;
+model değiştiğinde cache kendiliğinden boşaltılır.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Boyut sınırlı, süreli, thread-safe tahmin cache'i"""
+
+    def __init__(self, max_size=10000, ttl_seconds=3600, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_token = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def _check_model(self, model_token):
+        # Model değiştiyse eski tahminler geçersiz
+        if model_token != self._model_token:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._model_token = model_token
+
+    def get(self, key, model_token):
+        """Kayıt varsa ve süresi dolmadıysa tahmini döner, yoksa None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_model(model_token)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, model_token):
+        if not self.enabled:
+            return
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._check_model(model_token)
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
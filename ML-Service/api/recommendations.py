@@ -0,0 +1,44 @@
+"""
+Kişisel öneriler: train_recommendations.py'nin yazdığı top-K deposunu sunar.
+
+İstek yolunda model veya matris çarpımı yoktur; depo mmap ile açılır
+(gunicorn worker'ları aynı sayfaları paylaşır) ve kullanıcı listesi
+dilimlenir. Offline iş yeni depo yazınca (WatchedFile yalnızca <yol>.json
+işaretçisini izler) yeni nesil açılıp tek atama ile değiştirilir. Yükleme
+başarısız olursa eski depo kullanılmaya devam eder.
+"""
+
+import os
+
+from recommendation_store import TopKStore
+from watched_file import WatchedFile
+
+
+class Recommendations:
+    """Top-K deposunu yükler ve güncel tutar"""
+
+    def __init__(self, path, check_seconds=5.0):
+        self.path = path
+        self._watch = WatchedFile([TopKStore.pointer(path)], self._load, check_seconds, name="Öneri deposu")
+
+    def _load(self):
+        store = TopKStore.load(self.path, mmap=True)
+        print(f"🤝 Öneri deposu yüklendi: {len(store.users)} kullanıcı, top-{store.k}")
+        return store
+
+    def store(self):
+        """Güncel depo (yoksa None); dosyalar değiştiyse yeniden açılır"""
+        return self._watch.get()
+
+    def status(self):
+        store = self._watch.current
+        return {
+            "store": os.path.basename(self.path),
+            "ready": store is not None,
+            "users": len(store.users) if store is not None else 0,
+            "top_k": store.k if store is not None else 0,
+            "created_at": store.meta.get("created_at") if store is not None else None,
+            "source": store.meta.get("source") if store is not None else None,
+            "loads": self._watch.loads,
+            "last_error": self._watch.last_error,
+        }
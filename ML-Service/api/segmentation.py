@@ -0,0 +1,57 @@
+"""
+Müşteri segmentasyonu: eğitimde hesaplanmış merkezlere en yakın atama.
+
+Tekli istek, JSON listesi ve CSV akışı aynı vektörel atamayı kullanır
+(segment_model.SegmentModel.assign). Model dosyası değişince WatchedFile ile
+yeniden okunur; okunamazsa eski model kalır.
+"""
+
+import os
+from collections import Counter
+
+from segment_model import SegmentModel, customer_matrix
+from segment_customers import segment_stream
+from watched_file import WatchedFile
+
+
+class CustomerSegmenter:
+    """Segment modelini yükler ve güncel tutar"""
+
+    def __init__(self, path, check_seconds=5.0):
+        self.path = path
+        self._watch = WatchedFile([path], self._load, check_seconds, name="Segment modeli")
+        self.assigned = Counter()
+
+    def _load(self):
+        model = SegmentModel.load(self.path)
+        print(f"👥 Segment modeli yüklendi: {', '.join(model.segments)}")
+        return model
+
+    def model(self):
+        return self._watch.get()
+
+    def assign(self, model, customers):
+        """customer_data listesi -> [(segment, segment_id, güven), ...]"""
+        labels, confidence = model.assign(customer_matrix(customers))
+        segments = [model.segments[i] for i in labels.tolist()]
+        self.assigned.update(segments)
+        return list(zip(segments, labels.tolist(), confidence.tolist()))
+
+    def stream_csv(self, model, lines, chunk_size):
+        """CSV satırları -> segment kolonları eklenmiş CSV parçaları"""
+        stats = {}
+        for text in segment_stream(model, lines, chunk_size, stats):
+            yield text
+        self.assigned["csv_rows"] += stats.get("rows", 0)
+
+    def status(self):
+        model = self._watch.current
+        return {
+            "model": os.path.basename(self.path),
+            "ready": model is not None,
+            "segments": model.segments if model is not None else [],
+            "trained_at": model.metadata.get("trained_at") if model is not None else None,
+            "assigned": dict(self.assigned),
+            "loads": self._watch.loads,
+            "last_error": self._watch.last_error,
+        }
@@ -0,0 +1,127 @@
+"""
+Laptop Fiyat Tahmin API - production başlatıcı
+
+Model ve encoder'lar ana süreçte bir kez yüklenir, ardından N worker fork
+edilir; worker'lar model sayfalarını copy-on-write ile paylaşır.
+
+Linux/macOS : gunicorn (preload_app=True, çoklu süreç + thread)
+Windows     : waitress (tek süreç, çoklu thread - fork yok)
+
+Kullanım:
+    python api/serve.py --bind 0.0.0.0:5000 --workers 4 --threads 2
+    ML_BIND=127.0.0.1:5000 ML_WORKERS=4 python api/serve.py
+
+Debug modu burada hiç açılmaz; geliştirme için `FLASK_DEBUG=1 python api/app.py`.
+"""
+
+import argparse
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Laptop Fiyat Tahmin API (production)")
+    parser.add_argument("--bind", default=os.environ.get("ML_BIND", "127.0.0.1:5000"),
+                        help="host:port (varsayılan: 127.0.0.1:5000, env: ML_BIND)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("ML_WORKERS", os.cpu_count() or 1)),
+                        help="worker süreç sayısı (varsayılan: CPU sayısı, env: ML_WORKERS)")
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("ML_THREADS", "2")),
+                        help="worker başına thread (env: ML_THREADS)")
+    parser.add_argument("--timeout", type=int, default=int(os.environ.get("ML_TIMEOUT", "30")),
+                        help="istek zaman aşımı, saniye (env: ML_TIMEOUT)")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "waitress"],
+                        default=os.environ.get("ML_SERVER", "auto"),
+                        help="auto: fork destekleniyorsa gunicorn, yoksa waitress")
+    return parser.parse_args(argv)
+
+
+def load_app():
+    """Flask uygulamasını (ve modeli) ana süreçte yükle"""
+    from app import app
+    return app
+
+
+def run_gunicorn(app, args):
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    def pre_fork(server, worker):
+        # Model nesnelerini GC taramasından çıkar; fork sonrası sayfalar
+        # GC yüzünden kopyalanmaz (copy-on-write paylaşımı korunur)
+        gc.freeze()
+
+    def post_worker_init(worker):
+        # gunicorn worker'da SIGHUP'ı varsayılana çevirir; model yenileme için
+        # tekrar bağla (`pkill -HUP -P <master pid>` tüm worker'ları yeniler)
+        from app import registry
+        registry.install_signal_handler()
+
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread" if args.threads > 1 else "sync",
+        "timeout": args.timeout,
+        "preload_app": True,
+        "pre_fork": pre_fork,
+        "post_worker_init": post_worker_init,
+        "accesslog": "-",
+    }
+    PreloadedApplication(app, options).run()
+
+
+def run_waitress(app, args):
+    from waitress import serve
+
+    if args.workers > 1:
+        print(f"ℹ️ waitress çoklu süreç desteklemez; {args.workers} worker yerine "
+              f"{args.workers * args.threads} thread kullanılıyor")
+    host, _, port = args.bind.rpartition(":")
+    serve(app, host=host or "127.0.0.1", port=int(port),
+          threads=max(1, args.workers * args.threads), channel_timeout=args.timeout)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    server = args.server
+    if server == "auto":
+        server = "gunicorn" if hasattr(os, "fork") else "waitress"
+
+    app = load_app()
+
+    print("\n" + "=" * 70)
+    print("🚀 LAPTOP FİYAT TAHMİN API - PRODUCTION")
+    print("=" * 70)
+    print(f"🌐 Bind    : {args.bind}")
+    print(f"🖥️ Sunucu  : {server}")
+    print(f"👷 Worker  : {args.workers}  |  Thread: {args.threads}")
+    print("=" * 70 + "\n")
+
+    try:
+        if server == "gunicorn":
+            run_gunicorn(app, args)
+        else:
+            run_waitress(app, args)
+    except ImportError as e:
+        print(f"❌ HATA: {server} kurulu değil ({e}). `pip install -r requirements.txt` çalıştırın.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benzer ürünler: katalog üzerinde önceden kurulmuş en yakın komşu indeksi.
+
+Katalog (laptops_int_values.csv) satırları fiyat modelinin kullandığı 7
+feature'a çevrilir (aynı parser). Sayısal kolonlar z-skoru ile normalize
+edilir; kategorik kolonlar (marka, CPU markası, GPU tipi) one-hot kodlanır:
+encoder kodları arasındaki fark anlamsızdır (alfabetik sıra), farklı kategori
+her zaman aynı uzaklığı (CATEGORY_DISTANCE) ekler. Vektörler bir KD-tree'ye
+(scipy cKDTree) yerleştirilir; sorguda tüm katalog taranmaz.
+
+Ürün kimliği CSV'deki 1 tabanlı veri satırı numarasıdır.
+
+Yenileme: CSV'nin (mtime, boyut) imzası en fazla check_seconds'ta bir
+kontrol edilir; değişmişse yeni indeks arka planda kurulup tek atama ile
+değiştirilir. Parse edilmiş satırlar satır içeriğine göre cache'lendiği için
+yalnızca yeni/değişen satırlar parse edilir. Model sürümü değişirse (farklı
+encoder sözlükleri) indeks de yeniden kurulur. Başarısız kurulum aynı model
+sürümü + katalog imzası için tekrarlanmaz; ikisinden biri değişince denenir.
+"""
+
+import csv
+import os
+import threading
+import time
+
+import numpy as np
+
+from feature_parser import parse_cpu, get_gpu_type
+
+CSV_COLUMNS = ("Marka", "İşlemci", "RAM", "Depolama", "Ekran Kartı")
+
+# Farklı kategori = sayısal kolonda 1 standart sapmalık fark
+CATEGORY_DISTANCE = 1.0
+
+
+class CatalogIndex:
+    """Değişmez (immutable) indeks: kimlikler + normalize vektörler + KD-tree"""
+
+    def __init__(self, product_ids, vectors, tree, token, model_version, build_seconds, skipped):
+        self.product_ids = product_ids
+        self.vectors = vectors
+        self.tree = tree
+        self.token = token
+        self.model_version = model_version
+        self.build_seconds = build_seconds
+        self.skipped = skipped
+        self.row_of = {pid: row for row, pid in enumerate(product_ids)}
+
+    def __len__(self):
+        return len(self.product_ids)
+
+    def query(self, product_id, k):
+        """product_id'ye en yakın k ürün: [(productId, benzerlik 0-1], ...]"""
+        row = self.row_of.get(product_id)
+        if row is None:
+            return None
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return []
+
+        # Kendisi (ve aynı vektörlü kopyalar) sonuçta olabilir: bir fazla iste, kendini çıkar
+        distances, rows = self.tree.query(self.vectors[row], k=k + 1)
+        results = []
+        for distance, other in zip(np.atleast_1d(distances), np.atleast_1d(rows)):
+            if other == row:
+                continue
+            results.append((int(self.product_ids[other]), round(1.0 / (1.0 + float(distance)), 6)))
+        return results[:k]
+
+
+def _one_hot(values):
+    """Kategorik değerler -> (n, kategori sayısı); iki farklı kategori arası uzaklık CATEGORY_DISTANCE"""
+    _, codes = np.unique(np.asarray([str(v) for v in values], dtype=object), return_inverse=True)
+    one_hot = np.zeros((len(codes), codes.max() + 1), dtype=np.float64)
+    one_hot[np.arange(len(codes)), codes] = CATEGORY_DISTANCE / np.sqrt(2.0)
+    return one_hot
+
+
+class SimilarProducts:
+    """Katalog indeksini kurar, güncel tutar ve atomik olarak değiştirir"""
+
+    def __init__(self, csv_path, check_seconds=5.0):
+        self.csv_path = csv_path
+        self.check_seconds = check_seconds
+        self._index = None
+        self._lock = threading.Lock()
+        self._building = False
+        self._last_check = 0.0
+        self._row_cache = {}  # ham satır -> parse edilmiş feature'lar
+        self._failed = None  # son başarısız kurulumun (model sürümü, katalog imzası)
+        self.last_error = None
+        self.builds = 0
+
+    def catalog_token(self):
+        st = os.stat(self.csv_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _parse_rows(self):
+        """CSV satırlarını (kimlik, ham feature) listesine çevir; değişmeyen satırlar cache'ten"""
+        rows, skipped = [], 0
+        cache = {}
+        with open(self.csv_path, encoding="utf-8") as f:
+            for product_id, row in enumerate(csv.DictReader(f, delimiter=";"), start=1):
+                key = tuple(row.get(col) for col in CSV_COLUMNS)
+                features = self._row_cache.get(key)
+                if features is None:
+                    marka, islemci, ram, depolama, gpu = key
+                    try:
+                        ram, depolama = float(ram), float(depolama)
+                    except (TypeError, ValueError):
+                        skipped += 1
+                        continue
+                    cpu_tier, cpu_nesil, cpu_marka = parse_cpu(islemci)
+                    features = {
+                        "RAM": ram, "Depolama": depolama, "CPU_Seviye": cpu_tier, "CPU_Nesil": cpu_nesil,
+                        "CPU_Marka": cpu_marka, "GPU_Tipi": get_gpu_type(gpu), "Laptop_Marka": marka
+                    }
+                cache[key] = features
+                rows.append((product_id, features))
+        # Katalogdan silinen satırlar cache'te birikmesin
+        self._row_cache = cache
+        return rows, skipped
+
+    def build(self, bundle):
+        """Yeni indeks kur (mevcut indeksi etkilemez)"""
+        from scipy.spatial import cKDTree
+
+        started = time.perf_counter()
+        token = self.catalog_token()
+        rows, skipped = self._parse_rows()
+        if not rows:
+            raise ValueError(f"{self.csv_path} içinde geçerli ürün yok")
+
+        schema = bundle.schema
+        parts = []
+        for source in schema.sources:
+            values = [features[source] for _, features in rows]
+            if source in schema.vocabularies:
+                parts.append(_one_hot(values))
+            else:
+                # Z-skoru: RAM (GB) ile depolama (GB) gibi farklı ölçekler eşit ağırlıkta
+                column = np.asarray(values, dtype=np.float64)
+                std = column.std() or 1.0
+                parts.append(((column - column.mean()) / std)[:, None])
+        vectors = np.ascontiguousarray(np.hstack(parts))
+
+        return CatalogIndex(
+            product_ids=np.array([pid for pid, _ in rows], dtype=np.int64),
+            vectors=vectors,
+            tree=cKDTree(vectors),
+            token=token,
+            model_version=bundle.version,
+            build_seconds=time.perf_counter() - started,
+            skipped=skipped,
+        )
+
+    def _rebuild(self, bundle):
+        try:
+            token = self.catalog_token()
+        except OSError:
+            token = None
+        try:
+            self._index = self.build(bundle)
+            self._failed = None
+            self.last_error = None
+            self.builds += 1
+            index = self._index
+            print(f"🔎 Benzer ürün indeksi hazır: {len(index)} ürün ({index.build_seconds * 1000:.0f} ms)")
+        except Exception as e:
+            # Eski indeks (varsa) kullanılmaya devam eder
+            self._failed = (bundle.version, token)
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ Benzer ürün indeksi kurulamadı: {self.last_error}")
+        finally:
+            with self._lock:
+                self._building = False
+
+    def _start_rebuild(self, bundle, background):
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        if background:
+            threading.Thread(target=self._rebuild, args=(bundle,), name="similar-index", daemon=True).start()
+        else:
+            self._rebuild(bundle)
+
+    def _catalog_changed(self, token):
+        now = time.monotonic()
+        if now - self._last_check < self.check_seconds:
+            return False
+        self._last_check = now
+        try:
+            return self.catalog_token() != token
+        except OSError:
+            return False  # dosya yazılıyor olabilir; bir sonraki kontrolde bakılır
+
+    def _is_stale(self, index, bundle):
+        failed = self._failed
+        if failed is not None and failed[0] == bundle.version:
+            # Bu model için son kurulum başarısız: katalog değişene kadar tekrar deneme
+            return self._catalog_changed(failed[1])
+        if index.model_version != bundle.version:
+            return True
+        return self._catalog_changed(index.token)
+
+    def index(self, bundle):
+        """Güncel indeks; yoksa senkron kurulur, eskiyse arka planda yenilenir"""
+        index = self._index
+        if index is None:
+            failed = self._failed
+            if failed is None or failed[0] != bundle.version or self._catalog_changed(failed[1]):
+                self._start_rebuild(bundle, background=False)
+            return self._index
+        if self._is_stale(index, bundle):
+            self._start_rebuild(bundle, background=True)
+        return index
+
+    def status(self):
+        index = self._index
+        return {
+            "catalog": os.path.basename(self.csv_path),
+            "ready": index is not None,
+            "products": len(index) if index is not None else 0,
+            "skipped_rows": index.skipped if index is not None else 0,
+            "build_ms": round(index.build_seconds * 1000, 2) if index is not None else None,
+            "builds": self.builds,
+            "building": self._building,
+            "last_error": self.last_error,
+        }
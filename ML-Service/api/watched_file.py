@@ -0,0 +1,68 @@
+"""
+Diskteki bir model/depo dosyasını açık tutar ve değişince yeniden yükler.
+
+Offline işlerin (train_*.py) yazdığı öneri deposu, fraud ve segment modelleri
+ortak olarak bunu kullanır. Dosyaların (mtime, boyut) imzası en fazla
+check_seconds'ta bir kontrol edilir; istek yolunda yalnızca bir zaman
+karşılaştırması kalır. Yükleme başarısız olursa eski nesne kullanılmaya
+devam eder ve aynı bozuk dosya her kontrolde yeniden denenmez.
+"""
+
+import os
+import threading
+import time
+
+
+class WatchedFile:
+    """files: izlenecek dosya yolları, loader: () -> yüklenmiş nesne"""
+
+    def __init__(self, files, loader, check_seconds=5.0, name="dosya"):
+        self.files = list(files)
+        self.loader = loader
+        self.check_seconds = check_seconds
+        self.name = name
+        self._value = None
+        self._token = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.loaded_at = None
+        self.last_error = None
+        self.loads = 0
+
+    def files_token(self):
+        try:
+            return tuple((st.st_mtime_ns, st.st_size) for st in map(os.stat, self.files))
+        except OSError:
+            return None  # dosyalar yok veya yazılıyor
+
+    def _load(self, token):
+        try:
+            self._value = self.loader()
+            self.loaded_at = time.time()
+            self.last_error = None
+            self.loads += 1
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ {self.name} yüklenemedi: {self.last_error}")
+        self._token = token
+
+    def get(self):
+        """Güncel nesne (yoksa None); dosyalar değiştiyse yeniden yüklenir"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_seconds:
+            return self._value
+        if not self._lock.acquire(blocking=False):
+            return self._value  # başka bir thread kontrol ediyor
+        try:
+            self._last_check = now
+            token = self.files_token()
+            if token is not None and token != self._token:
+                self._load(token)
+        finally:
+            self._lock.release()
+        return self._value
+
+    @property
+    def current(self):
+        """Kontrol yapmadan son yüklenen nesne (status için)"""
+        return self._value
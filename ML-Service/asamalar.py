@@ -0,0 +1,642 @@
+"""
+Veri hattı aşamaları (03 → 04 → 06 → 07 → 08 → 09 → 10) DataFrame → DataFrame fonksiyonları olarak.
+
+Numaralı script'ler bu fonksiyonların ince sarmalayıcılarıdır: ara dosyayı
+okur, fonksiyonu çağırır, sonucu yazar. Zincir modu ise tüm aşamaları tek
+süreçte, DataFrame'leri bellekte aktararak çalıştırır; diske yalnızca son
+çıktı (ve istenen ara tablolar) yazılır.
+
+Kullanım:
+    python asamalar.py                          # laptops_birlesik → laptops_sayisal_donusum
+    python asamalar.py --kaydet ozellik         # ayrıca 08'in çıktısını da yaz
+    python asamalar.py --hepsini-kaydet         # script'lerle aynı ara dosyalar
+    python asamalar.py --bitis temizleme        # zinciri erken bitir
+"""
+
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+import veri_io
+import yakin_kopya
+
+
+# =========================================================
+# 03 - Duplicate temizleme
+# =========================================================
+
+NOKTALAMA_DESENI = re.compile(r"[^\w\s\-\.]")
+
+
+# Ürün adı normalize (yumuşak duplicate için)
+def normalize_name(s):
+    s = str(s).lower()
+    s = " ".join(s.split())               # fazla boşluk (re \s+ ile aynı karakterler, ~4x hızlı)
+    s = NOKTALAMA_DESENI.sub("", s)       # noktalama temizle (hafif)
+    # bazı gereksiz kelimeleri kırp (istersen genişletiriz)
+    for junk in ["türkiye garantili", "free dos", "freedos", "windows 11", "windows 10"]:
+        s = s.replace(junk, "")
+    return " ".join(s.split())
+
+
+def normalize_names(seri):
+    """normalize_name'in seri hali: her farklı ad bir kez işlenir (kazınan veride ad tekrarı çok)"""
+    kodlar, adlar = pd.factorize(seri, use_na_sentinel=False)
+    return pd.Series(np.array([normalize_name(a) for a in adlar], dtype=object)[kodlar], index=seri.index)
+
+
+YAKIN_KOPYA_RAPORU = "veriler/birlesik/laptops_yakin_kopya_raporu.csv"
+
+
+def yakin_kopya_raporu(df):
+    """
+    Birden fazla farklı adı birleştiren kümelerin satırları. df fiyata göre
+    sıralı olmalı: her kümenin ilk satırı tutulan (en ucuz) satırdır.
+    """
+    birlesen = df.groupby("kume")["urun_adi_norm"].transform("nunique") > 1
+    rapor = df.loc[birlesen, ["kume", "urun_adi", "fiyat"]].copy()
+    if rapor.empty:
+        return pd.DataFrame(columns=["kume", "boyut", "urun_adi", "fiyat", "durum", "benzerlik"])
+    tutulan = rapor.groupby("kume").head(1)
+    rapor["durum"] = np.where(rapor.index.isin(tutulan.index), "tutuldu", "silindi")
+    tutulan_belirtec = {k: yakin_kopya.belirtecler(u) for k, u in zip(tutulan["kume"], tutulan["urun_adi"])}
+    rapor["benzerlik"] = [
+        round(yakin_kopya.jaccard(yakin_kopya.belirtecler(u), tutulan_belirtec[k]), 3)
+        for k, u in zip(rapor["kume"], rapor["urun_adi"])
+    ]
+    rapor.insert(1, "boyut", rapor.groupby("kume")["kume"].transform("size"))
+    return rapor
+
+
+def duplicate_temizle(df, yakin_esik=yakin_kopya.VARSAYILAN_ESIK, rapor_yolu=None):
+    """
+    yakin_esik: yakın kopya Jaccard eşiği (None: yalnızca birebir aynı adlar).
+    rapor_yolu verilirse birleştirilen yakın kopya kümeleri CSV olarak yazılır.
+    """
+    print("📊 Başlangıç satır:", len(df))
+
+    # 1) Temel kolon kontrol (yoksa hata vermesin)
+    for col in ["urun_adi", "fiyat"]:
+        if col not in df.columns:
+            raise ValueError(f"❌ Gerekli kolon yok: {col}")
+
+    df = df.copy()
+    df["urun_adi_norm"] = normalize_names(df["urun_adi"])
+
+    # 2) Fiyatı sayıya çevir (olası stringleri temizle)
+    df["fiyat"] = pd.to_numeric(df["fiyat"], errors="coerce")
+    df = df[df["fiyat"].notna()]
+    df = df[df["fiyat"] > 0]
+
+    # 3) Kesin duplicate: aynı normalized isim + aynı fiyat
+    before = len(df)
+    df = df.drop_duplicates(subset=["urun_adi_norm", "fiyat"], keep="first")
+    print("✅ Kesin duplicate sonrası:", len(df), " (silinen:", before - len(df), ")")
+
+    # 4) Yakın kopya kümeleri: aynı normalized isim her zaman aynı kümede;
+    # farklı isimler MinHash/LSH + Jaccard >= yakin_esik ile birleşir
+    isimler = df["urun_adi_norm"].drop_duplicates()
+    if yakin_esik is None:
+        etiketler = np.arange(len(isimler))
+    else:
+        baslangic_zamani = time.perf_counter()
+        temsilci = df.loc[isimler.index, "urun_adi"]
+        etiketler, ciftler = yakin_kopya.kumele(temsilci.tolist(), yakin_esik)
+        print(f"🔗 Yakın kopya (eşik {yakin_esik}): {len(ciftler)} benzer çift, "
+              f"{len(isimler) - len(set(etiketler))} isim birleşti ({time.perf_counter() - baslangic_zamani:.2f} sn)")
+    df["kume"] = df["urun_adi_norm"].map(dict(zip(isimler, etiketler)))
+
+    # 5) Yumuşak duplicate: aynı küme
+    # Burada aynı üründen farklı fiyatlar kalabilir. Ne yapacağız?
+    # En mantıklısı: aynı üründe EN DÜŞÜK fiyatı tut (piyasadaki en ucuz gibi)
+    before2 = len(df)
+    df = df.sort_values("fiyat", ascending=True)
+    if rapor_yolu is not None:
+        rapor = yakin_kopya_raporu(df).sort_values(["kume", "fiyat"], kind="stable")
+        rapor.to_csv(rapor_yolu, index=False, encoding="utf-8-sig")
+        print(f"📝 Yakın kopya raporu: {rapor_yolu} ({rapor['kume'].nunique()} küme, {len(rapor)} satır)")
+    df = df.drop_duplicates(subset=["kume"], keep="first")
+    print("✅ Yumuşak duplicate sonrası:", len(df), " (silinen:", before2 - len(df), ")")
+
+    # 6) Temizlik kolonlarını kaldır
+    return df.drop(columns=["urun_adi_norm", "kume"])
+
+
+# =========================================================
+# 04 - Aykırı değer temizliği
+# =========================================================
+
+def aykiri_temizle(df):
+    print("📊 Başlangıç satır:", len(df))
+
+    # 1️⃣ Sayısal kolonlar
+    df = df.copy()
+    for col in ["fiyat", "ram_gb", "ssd_gb"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    # 2️⃣ Mantıksız değerleri at
+    df = df[df["fiyat"] > 1000]        # aşırı ucuz (hatalı)
+    df = df[df["fiyat"] < 300000]      # aşırı pahalı (uç değer)
+
+    if "ram_gb" in df.columns:
+        df = df[df["ram_gb"].between(2, 128)]
+
+    if "ssd_gb" in df.columns:
+        df = df[df["ssd_gb"].between(64, 8192)]
+
+    print("🧹 Mantıksız değer temizliği sonrası:", len(df))
+
+    # 3️⃣ IQR ile aykırı fiyat temizliği
+    Q1 = df["fiyat"].quantile(0.25)
+    Q3 = df["fiyat"].quantile(0.75)
+    IQR = Q3 - Q1
+
+    alt_sinir = Q1 - 1.5 * IQR
+    ust_sinir = Q3 + 1.5 * IQR
+
+    before = len(df)
+    df = df[(df["fiyat"] >= alt_sinir) & (df["fiyat"] <= ust_sinir)]
+    print("📉 IQR aykırı temizliği sonrası:", len(df), "(silinen:", before - len(df), ")")
+
+    # 4️⃣ Boş kritik alanları at
+    kritik = ["urun_adi", "fiyat", "islemci"]
+    df = df.dropna(subset=[c for c in kritik if c in df.columns])
+
+    print("✅ Son satır sayısı:", len(df))
+    return df
+
+
+# =========================================================
+# 06 - Feature çıkarma
+# =========================================================
+
+# RAM çıkarımı
+def extract_ram(text):
+    m = re.search(r'(\d+)\s?gb\s?ram', text.lower())
+    if m:
+        return int(m.group(1))
+    return None
+
+# SSD çıkarımı
+def extract_ssd(text):
+    m = re.search(r'(\d+)\s?gb\s?(ssd|nvme)', text.lower())
+    if m:
+        return int(m.group(1))
+    return None
+
+# CPU çıkarımı (basit)
+def extract_cpu(text):
+    text = text.lower()
+    if "i3" in text:
+        return "i3"
+    if "i5" in text:
+        return "i5"
+    if "i7" in text:
+        return "i7"
+    if "ryzen 3" in text:
+        return "ryzen 3"
+    if "ryzen 5" in text:
+        return "ryzen 5"
+    if "ryzen 7" in text:
+        return "ryzen 7"
+    return "unknown"
+
+# GPU seviyesi çıkarımı
+def extract_gpu_tier(text):
+    text = text.lower()
+
+    if "rtx 40" in text or "rtx 4070" in text or "rtx 4060" in text:
+        return "high"
+    if "rtx" in text or "gtx" in text:
+        return "mid"
+    if "iris" in text or "uhd" in text or "radeon" in text:
+        return "integrated"
+    return "integrated"
+
+
+def feature_cikar(df):
+    print("📊 Başlangıç satır:", len(df))
+
+    df = df.copy()
+    df["ram_gb"] = df["urun_adi"].apply(extract_ram)
+    df["ssd_gb"] = df["urun_adi"].apply(extract_ssd)
+    df["islemci"] = df["urun_adi"].apply(extract_cpu)
+    df["ekran_karti_seviyesi"] = df["urun_adi"].apply(extract_gpu_tier)
+
+    print("\n💾 RAM dağılımı:")
+    print(df["ram_gb"].value_counts(dropna=False).head(10))
+
+    print("\n🗄️ SSD dağılımı:")
+    print(df["ssd_gb"].value_counts(dropna=False).head(10))
+
+    print("\n🧠 CPU dağılımı:")
+    print(df["islemci"].value_counts())
+
+    print("\n🎮 GPU seviyesi dağılımı:")
+    print(df["ekran_karti_seviyesi"].value_counts())
+
+    return df
+
+
+# =========================================================
+# 07 - Eksik veri doldurma
+# =========================================================
+
+# Stratejiler sütun bazlıdır (satır döngüsü yok): strateji(df, kolon, **parametreler) -> yeni kolon
+
+def grup_medyani(df, kolon, grup):
+    """Boşları grubun medyanıyla, grup medyanı da yoksa genel medyanla doldur"""
+    grup_medyan = df.groupby(grup)[kolon].transform("median")
+    return df[kolon].fillna(grup_medyan).fillna(df[kolon].median())
+
+
+def esik_medyani(df, kolon, esik_kolonu, esik):
+    """
+    Boşları eşiğin üstündeki/altındaki satırların medyanıyla doldur.
+    esik_kolonu boşsa (karşılaştırma yanlış) alt medyan kullanılır.
+    """
+    ust = df[esik_kolonu] >= esik
+    ust_medyan = df.loc[ust, kolon].median()
+    alt_medyan = df.loc[df[esik_kolonu] < esik, kolon].median()
+    return df[kolon].fillna(pd.Series(np.where(ust, ust_medyan, alt_medyan), index=df.index))
+
+
+def esige_gore_degistir(df, kolon, deger, esik_kolonu, esik, ust, alt):
+    """kolon == deger olan satırlarda: esik_kolonu >= esik ise ust, değilse alt"""
+    return df[kolon].mask(df[kolon].eq(deger), np.where(df[esik_kolonu] >= esik, ust, alt))
+
+
+def kosulla_degistir(df, kolon, deger, yeni, alt_sinirlar):
+    """kolon == deger ve tüm alt_sinirlar ({kolon: en az}) sağlanıyorsa yeni değeri yaz"""
+    kosul = df[kolon].eq(deger)
+    for sinir_kolonu, en_az in alt_sinirlar.items():
+        kosul &= df[sinir_kolonu] >= en_az
+    return df[kolon].mask(kosul, yeni)
+
+
+# (kolon, strateji, parametreler) — sırayla uygulanır, sonraki kurallar doldurulmuş kolonları görür
+DOLDURMA_KURALLARI = [
+    # 1️⃣ RAM: CPU grubunun medyan RAM'i, CPU da bilinmiyorsa genel medyan
+    ("ram_gb", grup_medyani, {"grup": "islemci"}),
+    # 2️⃣ SSD: RAM >= 16 → SSD medyan (yüksek), RAM < 16 → SSD medyan (düşük)
+    ("ssd_gb", esik_medyani, {"esik_kolonu": "ram_gb", "esik": 16}),
+    # 3️⃣ CPU unknown: basit ama savunulabilir: RAM >= 16 → i5, RAM < 16 → i3
+    ("islemci", esige_gore_degistir,
+     {"deger": "unknown", "esik_kolonu": "ram_gb", "esik": 16, "ust": "i5", "alt": "i3"}),
+    # 4️⃣ GPU: çok nadir high/mid var, integrated normal; RAM >= 32 ve SSD >= 512 ise mid
+    ("ekran_karti_seviyesi", kosulla_degistir,
+     {"deger": "integrated", "yeni": "mid", "alt_sinirlar": {"ram_gb": 32, "ssd_gb": 512}}),
+]
+
+
+def eksik_doldur(df, kurallar=None, ozet=True):
+    if ozet:
+        print("📊 Başlangıç satır:", len(df))
+    df = df.copy()
+
+    for kolon, strateji, parametreler in (DOLDURMA_KURALLARI if kurallar is None else kurallar):
+        df[kolon] = strateji(df, kolon, **parametreler)
+
+    if ozet:
+        print("\n💾 RAM (son):")
+        print(df["ram_gb"].value_counts().head())
+
+        print("\n🗄️ SSD (son):")
+        print(df["ssd_gb"].value_counts().head())
+
+        print("\n🧠 CPU (son):")
+        print(df["islemci"].value_counts())
+
+        print("\n🎮 GPU (son):")
+        print(df["ekran_karti_seviyesi"].value_counts())
+
+    return df
+
+
+# =========================================================
+# 08 - Özellik çıkarımı (Senin gelişmiş regex motorun, vektörel)
+# =========================================================
+# Kurallar öncelik sırasıyla denenir, ilk eşleşen kazanır (eski satır satır
+# re.search döngüsüyle birebir aynı çıktı). Her desen tek seferde derlenir
+# ve yalnızca henüz eşleşmemiş başlıklara Series.str.extract ile uygulanır.
+# Regex'ten önce küçük harfli başlıkta ucuz bir alt dizi ön filtresi aranır
+# (ör. 'tb'). Ön filtreler i/s/k içermez: re.I bunları 'ı', 'İ', 'ſ', 'K' ile
+# de eşleştirir, str.lower() eşleştirmez.
+
+MARKALAR = [
+    ('HP', ['hp ', 'hp-', 'elitebook', 'probook', 'pavilion', 'omen', 'envy']),
+    ('Dell', ['dell ']),
+    ('Acer', ['acer ']),
+    ('Lenovo', ['lenovo ', 'thinkpad', 'ideapad', 'thinkbook', 'legion']),
+    ('Asus', ['asus ', 'vivobook', 'zenbook', 'rog ', 'tuf ']),
+    ('Apple', ['macbook', 'apple ']),
+    ('MSI', ['msi ']),
+    ('Samsung', ['samsung ', 'galaxy book']),
+    ('Toshiba', ['toshiba ', 'dynabook']),
+    ('Huawei', ['huawei ', 'matebook']),
+    ('Casper', ['casper ', 'nirvana', 'excalibur']),
+    ('Monster', ['monster ']),
+    ('Microsoft', ['surface']),
+]
+
+MODEL_DESENLERI = {
+    'HP': [r'HP\s+(\d{2}[\-\w]*)', r'(EliteBook|ProBook|Pavilion|Omen|Envy|Spectre)[\s\-]?([A-Za-z0-9\-\s]*)'],
+    'Dell': [r'Dell\s+(Latitude|Inspiron|XPS|Vostro|Precision|G\d+)[\s\-]?([A-Za-z0-9\-]*)'],
+    'Lenovo': [r'(ThinkPad|IdeaPad|ThinkBook|Legion|Yoga)[\s\-]?([A-Za-z0-9\-\s]*)'],
+    'Asus': [r'(Vivobook|Zenbook|ROG|TUF)[\s\-]?([A-Za-z0-9\-\s]*)'],
+    'Apple': [r'MacBook\s+(Air|Pro)(?:\s+(M\d+))?'],
+    'MSI': [r'MSI\s+([A-Za-z]+[\s\-]?[A-Za-z0-9\-]*)'],
+}
+
+
+def _bosluksuz(grup, onek):
+    # 'RTX 4060' -> '4060' (büyük/küçük harf duyarlı replace: 'rtx 4060' -> 'rtx4060', eskisi gibi)
+    return grup.str.replace(onek, '', regex=False).str.replace(' ', '', regex=False)
+
+
+# (desen, biçimlendirici, ön filtre) — biçimlendirici extract sonucunu alır; g[1], g[2]... desenin grupları
+GPU_KURALLARI = [
+    (r'(RTX\s*5\d{3}(?:\s*Ti)?)', lambda g: 'NVIDIA RTX' + _bosluksuz(g[1], 'RTX'), 'rtx'),
+    (r'(RTX\s*4\d{3}(?:\s*Ti)?)', lambda g: 'NVIDIA RTX' + _bosluksuz(g[1], 'RTX'), 'rtx'),
+    (r'(RTX\s*3\d{3}(?:\s*Ti)?)', lambda g: 'NVIDIA RTX' + _bosluksuz(g[1], 'RTX'), 'rtx'),
+    (r'(GTX\s*\d{3,4}(?:\s*Ti)?)', lambda g: 'NVIDIA GTX' + _bosluksuz(g[1], 'GTX'), 'gtx'),
+    (r'(Arc\s+\d{3})', lambda g: 'Intel ' + g[1], 'arc'),
+    (r'Iris\s+Xe', lambda g: 'Intel Iris Xe', None),
+]
+APPLE_GPU_KURALLARI = [
+    (r'\b(M\d+)(?:\s+(Pro|Max|Ultra))?\b', lambda g: 'Apple ' + g[1] + ' GPU', None),
+]
+
+ISLEMCI_KURALLARI = [
+    (r'(M\d+)(?:\s+(Pro|Max|Ultra))?', lambda g: 'Apple ' + g[1], None),
+    (r'Ultra\s*(\d+)', lambda g: 'Intel Core Ultra ' + g[1], 'ultra'),
+    (r'Core\s*(5|7|9)\s*(\d{3})', lambda g: 'Intel Core ' + g[1] + ' ' + g[2], 'core'),
+    (r'(i[3579])[\-\s]?(\d{4,5})', lambda g: 'Intel Core ' + g[1] + '-' + g[2], None),
+    (r'Ryzen\s*(\d+)', lambda g: 'AMD Ryzen ' + g[1], 'ryzen'),
+]
+
+DEPOLAMA_KURALLARI = [
+    (r'(\d+)\s*TB', lambda g: g[1] + ' TB SSD', 'tb'),
+    (r'(\d{3,4})\s*GB', lambda g: g[1] + ' GB SSD', 'gb'),
+]
+
+# Sadece metni bulur ("16 GB" gibi), sayıya çevirme işlemi Adım 3'te
+RAM_DESENI = re.compile(r'(\d{1,3})\s*GB\s*(?:RAM|DDR|LPDDR)?(?!\s*(?:SSD|HDD))', re.I)
+RAM_DEGERLERI = [4, 8, 12, 16, 24, 32, 48, 64, 96, 128]
+
+
+def _derle(kurallar):
+    # Dış grup (0) eşleşme olup olmadığını gösterir; desenin kendi grupları 1'den başlar
+    return [(re.compile(f"({desen})", re.I), bicim, on_filtre) for desen, bicim, on_filtre in kurallar]
+
+
+GPU_KURALLARI = _derle(GPU_KURALLARI)
+APPLE_GPU_KURALLARI = _derle(APPLE_GPU_KURALLARI)
+ISLEMCI_KURALLARI = _derle(ISLEMCI_KURALLARI)
+DEPOLAMA_KURALLARI = _derle(DEPOLAMA_KURALLARI)
+
+
+def _grup_birlestir(g):
+    # ' '.join([g for g in m.groups() if g]).strip()[:50] — boş ve katılmayan gruplar atlanır
+    parcalar = [g[c].fillna('').to_numpy(dtype=object) for c in g.columns[1:]]
+    birlesik = parcalar[0]
+    for parca in parcalar[1:]:
+        birlesik = np.where(birlesik == '', parca, np.where(parca == '', birlesik, birlesik + ' ' + parca))
+    return pd.Series(birlesik, dtype=object).str.strip().str[:50]
+
+
+MODEL_DESENLERI = {
+    marka: _derle([(desen, _grup_birlestir, None) for desen in desenler])
+    for marka, desenler in MODEL_DESENLERI.items()
+}
+
+
+def ilk_eslesen(metin, kucuk, kurallar, varsayilan, maske=None):
+    """
+    Her başlık için sıradaki ilk eşleşen kuralın çıktısı (yoksa varsayılan).
+    Yalnızca maske'deki satırlara bakılır; (sonuç, eşleşmeyenler) döner.
+    """
+    sonuc = np.full(len(metin), varsayilan, dtype=object)
+    kalan = np.ones(len(metin), dtype=bool) if maske is None else np.asarray(maske, dtype=bool).copy()
+    for desen, bicim, on_filtre in kurallar:
+        aday = kalan
+        if on_filtre is not None and aday.any():
+            aday = aday.copy()
+            aday[aday] = kucuk[aday].str.contains(on_filtre, regex=False).to_numpy()
+        if not aday.any():
+            continue
+        g = metin[aday].str.extract(desen)
+        eslesti = g[0].notna().to_numpy()
+        if not eslesti.any():
+            continue
+        satirlar = np.flatnonzero(aday)[eslesti]
+        sonuc[satirlar] = np.asarray(bicim(g[eslesti]), dtype=object)
+        kalan[satirlar] = False
+    return sonuc, kalan
+
+
+def marka_bul(kucuk):
+    # Koşullar yalnızca önceki markalara uymayan satırlarda hesaplanır; np.select ilk doğruyu seçer
+    kalan = np.ones(len(kucuk), dtype=bool)
+    kosullar = []
+    for _, desenler in MARKALAR:
+        kosul = np.zeros(len(kucuk), dtype=bool)
+        if kalan.any():
+            kosul[kalan] = kucuk[kalan].str.contains('|'.join(map(re.escape, desenler)), regex=True).to_numpy()
+            kalan &= ~kosul
+        kosullar.append(kosul)
+    return np.select(kosullar, [marka for marka, _ in MARKALAR], default='Diğer').astype(object)
+
+
+def model_bul(metin, marka):
+    sonuc = np.full(len(metin), '-', dtype=object)
+    for ad, kurallar in MODEL_DESENLERI.items():
+        maske = marka == ad
+        if maske.any():
+            bulunan, kalan = ilk_eslesen(metin, None, kurallar, '-', maske)
+            sonuc = np.where(maske & ~kalan, bulunan, sonuc)
+    return sonuc
+
+
+def gpu_bul(metin, kucuk):
+    sonuc, kalan = ilk_eslesen(metin, kucuk, GPU_KURALLARI, 'Entegre')
+    mac = kalan & (kucuk.str.contains('macbook', regex=False) | kucuk.str.contains('apple', regex=False)).to_numpy()
+    apple, apple_kalan = ilk_eslesen(metin, kucuk, APPLE_GPU_KURALLARI, 'Entegre', mac)
+    return np.where(mac & ~apple_kalan, apple, sonuc)
+
+
+def ram_text_bul(metin, kucuk):
+    # Yalnızca ilk eşleşmeye bakılır (re.search gibi); sayı listede değilse '-'
+    sonuc = np.full(len(metin), '-', dtype=object)
+    aday = kucuk.str.contains('gb', regex=False).to_numpy()
+    g = metin[aday].str.extract(RAM_DESENI)[0].dropna()
+    g = g[np.isin(g.to_numpy(dtype=object).astype(np.int64), RAM_DEGERLERI)]
+    sonuc[g.index] = (g + ' GB').to_numpy(dtype=object)  # metin'in index'i 0..n-1
+    return sonuc
+
+
+def islemci_bul(metin, kucuk):
+    return ilk_eslesen(metin, kucuk, ISLEMCI_KURALLARI, '-')[0]
+
+
+def depolama_text_bul(metin, kucuk):
+    return ilk_eslesen(metin, kucuk, DEPOLAMA_KURALLARI, '-')[0]
+
+
+def ozellik_cikar(df):
+    print(f"📊 Ham veri sayısı: {len(df)}")
+
+    # str(row['urun_adi']) ile aynı: NaN -> 'nan'
+    metin = pd.Series([str(v) for v in df['urun_adi']], dtype=object)
+    kucuk = metin.str.lower()
+
+    marka = marka_bul(kucuk)
+
+    return pd.DataFrame({
+        'Marka': marka,
+        'Model': model_bul(metin, marka),
+        'Islemci': islemci_bul(metin, kucuk),
+        'RAM_Ham': ram_text_bul(metin, kucuk),
+        'Depolama_Ham': depolama_text_bul(metin, kucuk),
+        'Ekran_Karti': gpu_bul(metin, kucuk),
+        'Fiyat': df['fiyat'].to_numpy(),
+    })
+
+
+# =========================================================
+# 09 - Veri temizleme
+# =========================================================
+
+def veri_temizle(df):
+    baslangic_sayisi = len(df)
+
+    print(f"📊 Başlangıç satır sayısı: {baslangic_sayisi}")
+
+    # 1. Kritik alanları '-' olanları temizle
+    # (RAM, İşlemci veya Depolama bilgisi çekilemediyse o veri çöp olabilir)
+    kritik_kolonlar = ['RAM_Ham', 'Islemci', 'Depolama_Ham']
+
+    for col in kritik_kolonlar:
+        df = df[df[col] != '-']
+
+    # 2. Fiyat temizliği
+    df = df.dropna(subset=['Fiyat'])
+    df = df[df['Fiyat'] > 0] # 0 TL olanları at
+
+    # 3. İndeks sıfırlama
+    df = df.reset_index(drop=True)
+
+    bitis_sayisi = len(df)
+    silinen = baslangic_sayisi - bitis_sayisi
+
+    print(f"📉 Temizlik Sonrası: {bitis_sayisi} satır (Silinen: {silinen})")
+    return df
+
+
+# =========================================================
+# 10 - Sayısal dönüşüm
+# =========================================================
+
+def ram_to_int(val):
+    if pd.isna(val): return None
+    m = re.search(r'(\d+)', str(val))
+    return int(m.group(1)) if m else None
+
+def storage_to_int(val):
+    if pd.isna(val): return None
+    val_str = str(val)
+
+    # TB kontrolü (TB -> GB çevrimi)
+    m = re.search(r'(\d+)\s*TB', val_str, re.I)
+    if m: return int(m.group(1)) * 1024
+
+    # GB kontrolü
+    m = re.search(r'(\d+)\s*GB', val_str, re.I)
+    if m: return int(m.group(1))
+
+    return None
+
+
+def sayisal_donustur(df):
+    df = df.copy()
+    df['RAM_GB'] = df['RAM_Ham'].apply(ram_to_int)
+    df['SSD_GB'] = df['Depolama_Ham'].apply(storage_to_int)
+
+    # Gereksiz ham kolonları istersen atabilirsin, şimdilik tutuyoruz.
+    print("💾 RAM Dağılımı (İlk 5):")
+    print(df['RAM_GB'].value_counts().head())
+
+    print("\n🗄️ Depolama Dağılımı (İlk 5):")
+    print(df['SSD_GB'].value_counts().head())
+
+    return df
+
+
+# =========================================================
+# ZİNCİR
+# =========================================================
+
+# (aşama, fonksiyon, çıktı ara tablosu) — pipeline.py aşama isimleriyle aynı
+ZINCIR = [
+    ("dedup", duplicate_temizle, "laptops_birlesik_dedup"),
+    ("aykiri", aykiri_temizle, "laptops_birlesik_temiz"),
+    ("feature", feature_cikar, "laptops_feature_cikarilmis"),
+    ("doldurma", eksik_doldur, "laptops_feature_doldurulmus"),
+    ("ozellik", ozellik_cikar, "laptops_ozellik_cikarilmis"),
+    ("temizleme", veri_temizle, "laptops_veri_temizleme"),
+    ("sayisal", sayisal_donustur, "laptops_sayisal_donusum"),
+]
+ZINCIR_GIRDI = "laptops_birlesik"
+
+
+def zincir_calistir(df=None, kaydet=(), baslangic="dedup", bitis="sayisal"):
+    """
+    Aşamaları bellekte art arda çalıştır.
+
+    df verilmezse başlangıç aşamasının girdisi veri_io ile okunur. kaydet
+    içindeki aşamaların ("hepsi": tümü) çıktıları diske yazılır; son aşamanın
+    çıktısı her zaman yazılır. Son DataFrame'i döndürür.
+    """
+    isimler = [ad for ad, _, _ in ZINCIR]
+    for ad in (baslangic, bitis, *[k for k in kaydet if k != "hepsi"]):
+        if ad not in isimler:
+            raise ValueError(f"❌ Bilinmeyen aşama: {ad} ({', '.join(isimler)})")
+    bas, son = isimler.index(baslangic), isimler.index(bitis)
+    if bas > son:
+        raise ValueError(f"❌ {baslangic} aşaması {bitis} aşamasından sonra geliyor")
+
+    if df is None:
+        girdi = ZINCIR_GIRDI if bas == 0 else ZINCIR[bas - 1][2]
+        df = veri_io.oku(girdi)
+
+    for ad, fonksiyon, cikti in ZINCIR[bas:son + 1]:
+        print(f"\n▶️ {ad}")
+        baslangic_zamani = time.perf_counter()
+        df = fonksiyon(df)
+        print(f"⏱️ {ad}: {time.perf_counter() - baslangic_zamani:.2f} sn | Satır: {len(df)}")
+        if ad == bitis or ad in kaydet or "hepsi" in kaydet:
+            print(f"💾 Kaydedildi: {veri_io.yaz(df, cikti)}")
+
+    return df
+
+
+if __name__ == "__main__":
+    isimler = [ad for ad, _, _ in ZINCIR]
+    parser = argparse.ArgumentParser(description="03-10 aşamalarını tek süreçte, bellekte çalıştır")
+    parser.add_argument("--kaydet", nargs="+", default=[], choices=isimler, metavar="AŞAMA",
+                        help=f"çıktısı diske de yazılacak ara aşamalar ({', '.join(isimler)})")
+    parser.add_argument("--hepsini-kaydet", action="store_true", help="tüm ara tabloları yaz (script'lerle aynı)")
+    parser.add_argument("--baslangic", default=isimler[0], choices=isimler)
+    parser.add_argument("--bitis", default=isimler[-1], choices=isimler)
+    args = parser.parse_args()
+
+    kaydet = ["hepsi"] if args.hepsini_kaydet else args.kaydet
+
+    print("🔗 Bellek içi zincir: " + " → ".join(isimler[isimler.index(args.baslangic):isimler.index(args.bitis) + 1]))
+    baslangic_zamani = time.perf_counter()
+    sonuc = zincir_calistir(kaydet=kaydet, baslangic=args.baslangic, bitis=args.bitis)
+    print(f"\n✅ Zincir tamamlandı: {len(sonuc)} satır ({time.perf_counter() - baslangic_zamani:.2f} sn)")
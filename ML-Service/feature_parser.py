@@ -0,0 +1,221 @@
+"""
+CPU / GPU metinlerinden model feature'larını çıkaran ortak parser.
+
+train_model.py ve api/app.py aynı kuralları buradan kullanır; böylece
+eğitim ve servis arasında kural farkı (training/serving skew) oluşmaz.
+Katalogda aynı birkaç yüz işlemci/ekran kartı metni sürekli tekrar ettiği
+için sonuçlar ham metne göre sınırlı bir LRU cache'te tutulur.
+"""
+
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+CACHE_SIZE = int(os.environ.get("ML_PARSER_CACHE_SIZE", "4096"))
+
+# Derlenmiş regex'ler (her çağrıda yeniden derlenmez)
+_INTEL_GEN = re.compile(r'[i]\d-(\d{1,2})\d{2,3}')
+_RYZEN_GEN = re.compile(r'ryzen\s+\d\s+(\d)')
+
+CpuFeatures = namedtuple("CpuFeatures", ["tier", "generation", "brand"])
+
+# Eksik (NaN / None) değerler için varsayılanlar - eğitimdeki davranış
+_MISSING_CPU = CpuFeatures(tier=5, generation=10, brand='Intel')
+_MISSING_GPU = 'Entegre'
+
+
+def _is_missing(value):
+    """None veya NaN mı (pandas import etmeden pd.isna karşılığı)"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _has(text, *patterns):
+    return any(p in text for p in patterns)
+
+
+# -----------------------
+# CPU
+# -----------------------
+def _cpu_tier(cpu_lower):
+    if _has(cpu_lower, 'i9', 'ryzen 9', 'ultra 9'):
+        return 9
+    elif _has(cpu_lower, 'i7', 'ryzen 7', 'ultra 7'):
+        return 7
+    elif _has(cpu_lower, 'i5', 'ryzen 5', 'ultra 5', 'm2', 'm3', 'm4'):
+        return 5
+    elif _has(cpu_lower, 'i3', 'ryzen 3', 'm1'):
+        return 3
+    elif _has(cpu_lower, 'celeron', 'pentium', 'n4020', 'n4120', 'n100', 'n150'):
+        return 1
+    return 2  # Default
+
+
+def _cpu_generation(cpu_lower):
+    # Ultra serisi (155H, 258V gibi) -> 15. nesil sayılır
+    if 'ultra' in cpu_lower:
+        return 15
+
+    # Intel Core i3/i5/i7/i9 nesilleri (i7-12700H, i5-1335U gibi)
+    intel_match = _INTEL_GEN.search(cpu_lower)
+    if intel_match:
+        return min(int(intel_match.group(1)), 15)  # Max 15. nesil
+
+    # AMD Ryzen nesilleri (Ryzen 5 5600H -> 5, Ryzen 7 7730U -> 7)
+    ryzen_match = _RYZEN_GEN.search(cpu_lower)
+    if ryzen_match:
+        return int(ryzen_match.group(1))
+
+    # Apple M serisi (M1, M2, M3, M4)
+    if 'm1' in cpu_lower:
+        return 11
+    elif 'm2' in cpu_lower:
+        return 12
+    elif 'm3' in cpu_lower:
+        return 13
+    elif 'm4' in cpu_lower:
+        return 14
+
+    # Celeron, Pentium -> eski nesil
+    if _has(cpu_lower, 'celeron', 'pentium'):
+        return 8
+
+    return 10  # Default orta nesil
+
+
+def _cpu_brand(cpu_lower):
+    if _has(cpu_lower, 'intel', 'core i', 'celeron', 'pentium', 'ultra'):
+        return 'Intel'
+    elif _has(cpu_lower, 'amd', 'ryzen'):
+        return 'AMD'
+    elif _has(cpu_lower, 'apple', 'm1', 'm2', 'm3', 'm4'):
+        return 'Apple'
+    return 'Intel'  # Default
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_cpu_cached(cpu_str):
+    cpu_lower = cpu_str.lower()
+    return CpuFeatures(_cpu_tier(cpu_lower), _cpu_generation(cpu_lower), _cpu_brand(cpu_lower))
+
+
+def parse_cpu(cpu_str):
+    """CPU metninden (tier, nesil, marka) üçlüsünü çıkar"""
+    if _is_missing(cpu_str):
+        return _MISSING_CPU
+    return _parse_cpu_cached(str(cpu_str))
+
+
+def get_cpu_tier(cpu_str):
+    """CPU string'inden tier çıkar"""
+    return parse_cpu(cpu_str).tier
+
+
+def get_cpu_generation(cpu_str):
+    """CPU nesli çıkar (Intel için 10, 11, 12, 13, 14, 15 gibi)"""
+    return parse_cpu(cpu_str).generation
+
+
+def get_cpu_brand(cpu_str):
+    """CPU markasını belirle"""
+    return parse_cpu(cpu_str).brand
+
+
+# -----------------------
+# GPU
+# -----------------------
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_gpu_cached(gpu_str):
+    gpu_lower = gpu_str.lower()
+
+    if gpu_lower == 'integrated':
+        return 'Entegre'
+
+    if _has(gpu_lower, 'rtx 50', 'rtx50', 'rtx 40', 'rtx40'):
+        return 'RTX_Yeni'
+    elif _has(gpu_lower, 'rtx 30', 'rtx30'):
+        return 'RTX_30'
+    elif 'rtx' in gpu_lower:
+        return 'RTX'
+    elif 'gtx' in gpu_lower:
+        return 'GTX'
+    elif _has(gpu_lower, 'nvidia', 'geforce', 'mx'):
+        return 'NVIDIA_Diger'
+    elif 'radeon rx' in gpu_lower:
+        return 'Radeon_RX'
+    elif _has(gpu_lower, 'radeon', 'amd'):
+        return 'Radeon'
+    elif 'apple' in gpu_lower:
+        return 'Apple_GPU'
+    elif _has(gpu_lower, 'iris', 'arc'):
+        return 'Intel_Iris'
+    elif 'uhd' in gpu_lower:
+        return 'Intel_UHD'
+    elif _has(gpu_lower, 'entegre', 'integrated'):
+        return 'Entegre'
+
+    # Veri hattındaki ekran_karti_seviyesi etiketleri
+    if gpu_lower == 'mid':
+        return 'GTX'
+    elif gpu_lower == 'high':
+        return 'RTX_Yeni'
+
+    return 'Entegre'  # Default
+
+
+def get_gpu_type(gpu_str):
+    """GPU tipini belirle"""
+    if _is_missing(gpu_str):
+        return _MISSING_GPU
+    return _parse_gpu_cached(str(gpu_str))
+
+
+parse_gpu = get_gpu_type
+
+
+# -----------------------
+# Vektörel (pandas.Series) giriş noktaları
+# -----------------------
+def _map_unique(values, parse):
+    """Her farklı değeri bir kez parse et, sonucu kodlarla tüm satırlara yay"""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    return codes, [parse(u) for u in uniques]
+
+
+def parse_cpu_series(values):
+    """CPU Series'inden CPU_Seviye / CPU_Nesil / CPU_Marka kolonlarını üret"""
+    import numpy as np
+    import pandas as pd
+
+    codes, parsed = _map_unique(values, parse_cpu)
+    index = values.index if isinstance(values, pd.Series) else None
+    if not parsed:
+        return pd.DataFrame({'CPU_Seviye': [], 'CPU_Nesil': [], 'CPU_Marka': []}, index=index)
+
+    tiers, generations, brands = (np.asarray(col) for col in zip(*parsed))
+    return pd.DataFrame({
+        'CPU_Seviye': tiers[codes],
+        'CPU_Nesil': generations[codes],
+        'CPU_Marka': brands.astype(object)[codes],
+    }, index=index)
+
+
+def parse_gpu_series(values):
+    """GPU Series'inden GPU_Tipi kolonunu üret"""
+    import numpy as np
+    import pandas as pd
+
+    codes, parsed = _map_unique(values, get_gpu_type)
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.Series(np.asarray(parsed, dtype=object)[codes] if parsed else [],
+                     index=index, name='GPU_Tipi', dtype=object)
+
+
+def cache_info():
+    """Parser cache istatistikleri (hits / misses / currsize)"""
+    return {
+        "cpu": _parse_cpu_cached.cache_info()._asdict(),
+        "gpu": _parse_gpu_cached.cache_info()._asdict(),
+    }
@@ -0,0 +1,129 @@
+"""
+Derlenmiş feature şeması.
+
+label_encoders.pkl ve modelin feature_names_in_ bilgisinden bir kez kurulur.
+Kategoriler düz dict ile kodlanır (LabelEncoder.transform'daki searchsorted
+ve sklearn doğrulaması yok). Çıktı, modelin kolon sırasında hazır float64
+satır/matristir.
+
+Bilinmeyen değerler: model eğitimde ayrı bir "bilinmeyen" sınıfı görmediği
+için bu değerler unknown_code'a (varsayılan 0 = encoder'ın ilk sınıfı, ör.
+ilk marka) gider ve o sınıf gibi fiyatlanır. Sessiz kalmaması için sayılır
+(unknown_stats, /health), unknown_mask ile istek bazında bulunur ve API
+cevabında "unknown_features" + ml_unknown_categories_total metriği olarak
+gösterilir.
+"""
+
+import threading
+from collections import Counter
+
+import numpy as np
+
+ENCODED_SUFFIX = "_encoded"
+
+# Bilinmeyen değer örneklerinden en fazla bu kadar farklısı saklanır
+MAX_TRACKED_UNKNOWNS = 100
+
+
+class FeatureSchema:
+    """Kolon sırası + kategorik sözlükler"""
+
+    def __init__(self, feature_names, vocabularies, unknown_code=0):
+        self.feature_names = list(feature_names)
+        self.vocabularies = {col: list(classes) for col, classes in vocabularies.items()}
+        self.unknown_code = unknown_code
+        self._mappings = {
+            col: {value: code for code, value in enumerate(classes)}
+            for col, classes in self.vocabularies.items()
+        }
+
+        # Her model kolonu ham girdide hangi isimle gelir: 'CPU_Marka_encoded' <- 'CPU_Marka'
+        self.sources = []
+        for name in self.feature_names:
+            source = name[:-len(ENCODED_SUFFIX)] if name.endswith(ENCODED_SUFFIX) else name
+            if name.endswith(ENCODED_SUFFIX) and source not in self._mappings:
+                raise ValueError(f"{name} için sözlük bulunamadı")
+            self.sources.append(source)
+
+        self._lock = threading.Lock()
+        self.unknown_counts = Counter()
+        self.unknown_values = {col: Counter() for col in self._mappings}
+
+    @classmethod
+    def from_label_encoders(cls, label_encoders, feature_names, unknown_code=0):
+        return cls(
+            feature_names,
+            {col: [str(c) for c in encoder.classes_] for col, encoder in label_encoders.items()},
+            unknown_code=unknown_code
+        )
+
+    def _record_unknown(self, col, value, count=1):
+        with self._lock:
+            self.unknown_counts[col] += count
+            seen = self.unknown_values[col]
+            if value in seen or len(seen) < MAX_TRACKED_UNKNOWNS:
+                seen[value] += count
+
+    @staticmethod
+    def _lookup(mapping, value, default=None):
+        try:
+            return mapping.get(value, default)
+        except TypeError:  # JSON'dan gelen liste/sözlük gibi hashlenemeyen değerler
+            return default
+
+    def encode(self, col, value):
+        """Tek kategorik değeri kodla; bilinmeyen -> unknown_code"""
+        code = self._lookup(self._mappings[col], value)
+        if code is None:
+            self._record_unknown(col, value if isinstance(value, str) else repr(value))
+            return self.unknown_code
+        return code
+
+    def is_known(self, col, value):
+        return self._lookup(self._mappings[col], value) is not None
+
+    def unknown_mask(self, col, values):
+        """Sözlükte olmayan (unknown_code ile kodlanan) değerler için True; sayaçları değiştirmez"""
+        mapping = self._mappings[col]
+        return np.fromiter((self._lookup(mapping, v) is None for v in values), dtype=bool, count=len(values))
+
+    def encode_many(self, col, values):
+        """Kategorik değer listesini kodla"""
+        mapping = self._mappings[col]
+        codes = np.fromiter((self._lookup(mapping, v, -1) for v in values), dtype=np.int64, count=len(values))
+        unknown = codes < 0
+        if unknown.any():
+            for i in np.flatnonzero(unknown):
+                value = values[i]
+                self._record_unknown(col, value if isinstance(value, str) else repr(value))
+            codes[unknown] = self.unknown_code
+        return codes
+
+    def row(self, values):
+        """{ham kolon adı: değer} -> (1, n_features) float64 satır"""
+        return np.array([[
+            self.encode(source, values[source]) if source in self._mappings else values[source]
+            for source in self.sources
+        ]], dtype=np.float64)
+
+    def matrix(self, columns):
+        """{ham kolon adı: dizi} -> (n, n_features) float64 matris"""
+        n_rows = len(columns[self.sources[0]])
+        X = np.empty((n_rows, len(self.sources)), dtype=np.float64)
+        for j, source in enumerate(self.sources):
+            if source in self._mappings:
+                X[:, j] = self.encode_many(source, list(columns[source]))
+            else:
+                X[:, j] = np.asarray(columns[source], dtype=np.float64)
+        return X
+
+    def unknown_stats(self):
+        with self._lock:
+            return {
+                "unknown_code": self.unknown_code,
+                # Bilinmeyen değerlerin fiyatlandığı sınıf
+                "priced_as": {col: classes[self.unknown_code] for col, classes in self.vocabularies.items()
+                              if 0 <= self.unknown_code < len(classes)},
+                "counts": dict(self.unknown_counts),
+                "top_values": {col: dict(c.most_common(10)) for col, c in self.unknown_values.items() if c},
+            }
@@ -0,0 +1,192 @@
+"""
+Dolandırıcılık (fraud) skoru: feature'lar, lojistik model ve kural tabanlı yedek skor.
+
+Eğitim (train_fraud_model.py) ve servis (api/app.py) aynı modülü kullanır.
+Serbest biçimli transaction_data sözlükleri kolonlara çevrilir ve fiyat
+modelindeki FeatureSchema ile tek seferde (n, n_features) matrise kodlanır.
+Model, sklearn LogisticRegression'ın katsayılarından oluşan küçük bir JSON
+dosyasıdır; skor tek matris çarpımıdır (sklearn/pandas gerekmez).
+
+Kategorik kolonlar one-hot yerine ağırlık tablosundan okunur: kod ->
+katsayı. Sonuç one-hot + lineer modelle aynıdır.
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+
+from feature_schema import FeatureSchema
+
+FRAUD_MODEL_FILE = "fraud_model.json"
+
+# Model kolonları (sıra önemli); *_encoded kolonlar FeatureSchema ile kodlanır
+FEATURE_NAMES = [
+    "log_amount", "night", "item_count", "discount_ratio", "log_account_age",
+    "orders_last_24h", "country_mismatch", "payment_method_encoded", "card_country_encoded",
+]
+NUMERIC_COLUMNS = [j for j, name in enumerate(FEATURE_NAMES) if not name.endswith("_encoded")]
+CATEGORICAL_COLUMNS = [(j, name[:-len("_encoded")]) for j, name in enumerate(FEATURE_NAMES) if name.endswith("_encoded")]
+OTHER = "Diğer"
+VOCABULARIES = {
+    "payment_method": [OTHER, "BankTransfer", "Cash", "CreditCard", "DebitCard"],
+    "card_country": [OTHER, "CN", "DE", "GB", "NG", "RU", "TR", "US"],
+}
+
+# Eksik alanların varsayılanları (checkout'ta .NET tarafı çoğu alanı göndermeyebilir)
+DEFAULTS = {
+    "amount": 0.0,
+    "item_count": 1,
+    "discount_amount": 0.0,
+    "account_age_days": 365,
+    "orders_last_24h": 0,
+    "payment_method": "CreditCard",
+    "card_country": "TR",
+}
+AMOUNT_KEYS = ("amount", "final_amount", "total_amount")
+TIME_KEYS = ("timestamp", "order_date", "created_at")
+
+
+def build_schema():
+    """Bilinmeyen kategori -> 'Diğer' (her sözlükte kod 0)"""
+    return FeatureSchema(FEATURE_NAMES, VOCABULARIES, unknown_code=0)
+
+
+def _number(value, default):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return float(default)
+    return number if math.isfinite(number) else float(default)
+
+
+def _hour(tx, default_hour):
+    if "hour" in tx:
+        return _number(tx["hour"], default_hour)
+    for key in TIME_KEYS:
+        value = tx.get(key)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).hour
+            except ValueError:
+                pass
+    return default_hour
+
+
+def _amount(tx):
+    for key in AMOUNT_KEYS:
+        if tx.get(key) is not None:
+            return max(_number(tx[key], 0.0), 0.0)
+    return DEFAULTS["amount"]
+
+
+def transaction_columns(transactions, now=None):
+    """
+    transaction_data sözlükleri -> {schema kaynak kolonu: liste}.
+    Saat bilgisi yoksa isteğin saati kullanılır.
+    """
+    default_hour = (now or datetime.now()).hour
+    amounts = [_amount(tx) for tx in transactions]
+    hours = [_hour(tx, default_hour) for tx in transactions]
+    cards = [str(tx.get("card_country") or DEFAULTS["card_country"]).upper() for tx in transactions]
+    shipping = [str(tx.get("shipping_country") or card).upper() for tx, card in zip(transactions, cards)]
+    discounts = [_number(tx.get("discount_amount"), DEFAULTS["discount_amount"]) for tx in transactions]
+
+    amount = np.array(amounts)
+    hour = np.array(hours) % 24
+    return {
+        "log_amount": np.log1p(amount),
+        "night": (hour < 6).astype(np.float64),
+        "item_count": [_number(tx.get("item_count", tx.get("quantity")), DEFAULTS["item_count"]) for tx in transactions],
+        "discount_ratio": np.clip(np.array(discounts) / np.maximum(amount + np.array(discounts), 1.0), 0.0, 1.0),
+        "log_account_age": np.log1p(np.maximum(
+            [_number(tx.get("account_age_days"), DEFAULTS["account_age_days"]) for tx in transactions], 0.0)),
+        "orders_last_24h": [_number(tx.get("orders_last_24h"), DEFAULTS["orders_last_24h"]) for tx in transactions],
+        "country_mismatch": np.array([c != s for c, s in zip(cards, shipping)], dtype=np.float64),
+        "payment_method": [str(tx.get("payment_method") or DEFAULTS["payment_method"]) for tx in transactions],
+        "card_country": cards,
+    }
+
+
+# -----------------------
+# Kural Tabanlı Yedek Skor
+# -----------------------
+# (kolon, eşik, puan): kolon değeri eşiği aşarsa puan eklenir. Bütçe aşıldığında
+# veya model yüklenemediğinde kullanılır; maliyeti birkaç karşılaştırmadır.
+RULES = [
+    ("log_amount", math.log1p(20000), 0.35),
+    ("night", 0.5, 0.15),
+    ("orders_last_24h", 2.5, 0.2),
+    ("country_mismatch", 0.5, 0.25),
+]
+NEW_ACCOUNT_DAYS = 7
+NEW_ACCOUNT_POINTS = 0.25
+RULE_BASE_SCORE = 0.02
+
+
+def rule_scores(X):
+    """(n, n_features) matris -> [0, 1) risk skorları"""
+    scores = np.full(len(X), RULE_BASE_SCORE)
+    for name, threshold, points in RULES:
+        scores += points * (X[:, FEATURE_NAMES.index(name)] > threshold)
+    scores += NEW_ACCOUNT_POINTS * (X[:, FEATURE_NAMES.index("log_account_age")] < math.log1p(NEW_ACCOUNT_DAYS))
+    return np.minimum(scores, 0.99)
+
+
+class FraudModel:
+    """Ölçekleme + lineer katsayılar + kategorik ağırlık tabloları"""
+
+    def __init__(self, mean, scale, coef, category_weights, intercept, threshold, metadata=None):
+        self.schema = build_schema()
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.category_weights = {col: np.asarray(w, dtype=np.float64) for col, w in category_weights.items()}
+        self.intercept = float(intercept)
+        self.threshold = float(threshold)
+        self.metadata = metadata or {}
+        for col, weights in self.category_weights.items():
+            if len(weights) != len(VOCABULARIES[col]):
+                raise ValueError(f"{col} ağırlık sayısı sözlükle uyuşmuyor")
+        if not (len(self.mean) == len(self.scale) == len(self.coef) == len(NUMERIC_COLUMNS)):
+            raise ValueError("Sayısal katsayı boyutları uyuşmuyor")
+
+    def decision_function(self, X):
+        z = ((X[:, NUMERIC_COLUMNS] - self.mean) / self.scale) @ self.coef + self.intercept
+        for j, col in CATEGORICAL_COLUMNS:
+            z += self.category_weights[col][X[:, j].astype(np.int64)]
+        return z
+
+    def predict_proba(self, X):
+        """(n, n_features) -> fraud olasılığı"""
+        return 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+
+    def to_dict(self):
+        return {
+            "feature_names": FEATURE_NAMES,
+            "vocabularies": VOCABULARIES,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "coef": self.coef.tolist(),
+            "category_weights": {col: w.tolist() for col, w in self.category_weights.items()},
+            "intercept": self.intercept,
+            "threshold": self.threshold,
+            "metadata": self.metadata,
+        }
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("feature_names") != FEATURE_NAMES or data.get("vocabularies") != VOCABULARIES:
+            raise ValueError(f"{os.path.basename(path)} bu koddaki feature listesiyle uyuşmuyor; modeli yeniden eğitin")
+        return cls(data["mean"], data["scale"], data["coef"], data["category_weights"],
+                   data["intercept"], data["threshold"], data.get("metadata"))
@@ -0,0 +1,82 @@
+"""
+Ham CSV alımı: kolonları Türkçeleştir + temel temizlik (01 ve 02 ortak).
+
+01_kolonlari_turkcelestir.py her dosyayı ayrı turkce_*.csv olarak yazar;
+02_veri_birlestir.py --hamdan ise ham dosyaları bir süreç havuzunda aynı
+anda okuyup normalize eder, bellekte tek seferde birleştirir ve yalnızca
+birleşik çıktıyı yazar (ara dosyalar isteğe bağlı). 02 --akis ise aynı
+normalizasyonu parça parça uygular (akis_alim.py).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+HAM_KLASOR = Path("veriler/ham")
+ISLENMIS_KLASOR = Path("veriler/islenmis")
+
+# Kolon eşleme
+KOLON_ESLEME = {
+    "title": "urun_adi",
+    "price": "fiyat",
+    "brand": "marka",
+    "cpu": "islemci",
+    "ram_gb": "ram_gb",
+    "storage_gb": "ssd_gb",
+    "gpu": "ekran_karti",
+    "gpu_tier": "ekran_karti_seviyesi",
+    "gpu_tier_filled": "ekran_karti_seviyesi"
+}
+
+GEREKLI_KOLONLAR = [
+    "urun_adi",
+    "fiyat",
+    "marka",
+    "islemci",
+    "ram_gb",
+    "ssd_gb",
+    "ekran_karti_seviyesi"
+]
+
+
+def temizle_ve_turkcelestir(csv_yolu):
+    return turkcelestir(pd.read_csv(csv_yolu))
+
+
+def turkcelestir(df):
+    """Tek bir ham tablo (veya akış modunda bir parçası) için kolon eşleme + temel temizlik"""
+    # Kolonları Türkçeleştir
+    df = df.rename(columns=KOLON_ESLEME)
+
+    mevcut = [k for k in GEREKLI_KOLONLAR if k in df.columns]
+    df = df[mevcut]
+
+    # Temel temizlik
+    if "fiyat" in df.columns:
+        df = df[df["fiyat"].notna()]
+        df = df[df["fiyat"] > 0]
+
+    return df
+
+
+def ham_dosyalar(klasor=HAM_KLASOR):
+    # Sıralı: glob sırası dosya sistemine bağlı, birleşik çıktı her yerde aynı olsun
+    return sorted(Path(klasor).glob("*.csv"))
+
+
+def ara_dosya_yolu(csv_yolu, klasor=ISLENMIS_KLASOR):
+    return Path(klasor) / f"turkce_{Path(csv_yolu).name}"
+
+
+def paralel_oku(dosyalar, isci=None):
+    """
+    Dosyaları süreç havuzunda oku + normalize et; sonuçlar dosya sırasıyla döner.
+    isci=1 (veya tek dosya) ise havuz kurulmaz.
+    """
+    isci = isci or min(len(dosyalar), os.cpu_count() or 1)
+    if isci <= 1 or len(dosyalar) <= 1:
+        return [temizle_ve_turkcelestir(d) for d in dosyalar]
+    with ProcessPoolExecutor(max_workers=isci) as havuz:
+        return list(havuz.map(temizle_ve_turkcelestir, dosyalar))
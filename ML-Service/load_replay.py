@@ -0,0 +1,318 @@
+"""
+Katalog CSV'sini (laptops_int_values.csv) yerel API'ye yeniden oynatan yük üreteci.
+
+Her satır gerçek bir /predict isteğine çevrilir (marka, işlemci, RAM, depolama,
+ekran kartı). aiohttp ile keep-alive bağlantı havuzu kullanılır.
+
+Modlar:
+    open   : Poisson varışlı sabit hız (istek/sn). Sunucu yavaşlasa da istekler
+             gelmeye devam eder; gecikme planlanan varış anından ölçülür
+             (coordinated omission yok).
+    closed : N eşzamanlı kullanıcı; her biri cevabı alınca bir sonrakini gönderir.
+
+--steps ile kademeli yük verilir (open: hızlar, closed: eşzamanlılıklar).
+Her kademe için throughput / yüzdelikler / hata oranı raporlanır; ilk doyan
+kademe (hedef hızın gerisinde kalma, SLO aşımı veya hata) doyma noktasıdır.
+
+Kullanım:
+    python load_replay.py --mode open --steps 50,100,200,400 --step-seconds 10
+    python load_replay.py --mode closed --steps 1,2,4,8,16 --output load.json
+    python load_replay.py --endpoint /predict/batch --batch-size 50 --mode closed --steps 4
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV = os.path.join(BASE_DIR, "laptops_int_values.csv")
+
+# Doyma kriterleri
+THROUGHPUT_RATIO = 0.95   # open: gerçekleşen / hedef hız bunun altına düşerse
+GAIN_RATIO = 1.05         # closed: eşzamanlılık artınca throughput en az bu kadar artmalı
+MAX_ERROR_RATE = 0.01
+
+
+def load_payloads(csv_path):
+    """CSV satırlarını /predict gövdelerine çevir (pandas gerekmez)"""
+    payloads = []
+    with open(csv_path, encoding="utf-8") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            payloads.append({
+                "ram_gb": row["RAM"] or 16,
+                "ssd_gb": row["Depolama"] or 512,
+                "islemci": row["İşlemci"],
+                "ekran_karti": row["Ekran Kartı"],
+                "marka": row["Marka"]
+            })
+    return payloads
+
+
+class Recorder:
+    """(başlangıç, gecikme, başarı) kayıtları"""
+
+    def __init__(self, started):
+        self.started = started
+        self.samples = []  # (göreli başlangıç sn, gecikme sn, ok)
+        self.errors = {}
+        self.dropped = 0
+
+    def add(self, scheduled, latency, ok, error=None):
+        self.samples.append((scheduled - self.started, latency, ok))
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+
+async def send(session, url, payload, recorder, scheduled):
+    try:
+        async with session.post(url, json=payload) as response:
+            await response.read()
+            ok = response.status == 200
+            recorder.add(scheduled, time.perf_counter() - scheduled, ok, None if ok else f"HTTP {response.status}")
+    except Exception as e:  # bağlantı hatası, zaman aşımı...
+        recorder.add(scheduled, time.perf_counter() - scheduled, False, type(e).__name__)
+
+
+def payload_stream(payloads, batch_size, seed):
+    """Katalogu karıştırıp sonsuz döngüde sırayla ver (batch ise N'li listeler)"""
+    rng = random.Random(seed)
+    order = list(payloads)
+    while True:
+        rng.shuffle(order)
+        if batch_size <= 1:
+            yield from order
+        else:
+            for i in range(0, len(order) - batch_size + 1, batch_size):
+                yield order[i:i + batch_size]
+
+
+async def run_open(session, url, stream, rate, duration, max_inflight, seed):
+    """Poisson varışlar: bir sonraki istek cevabı beklemeden planlanır"""
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    recorder = Recorder(started)
+    tasks = set()
+    next_at = started
+    while True:
+        next_at += rng.expovariate(rate)
+        if next_at - started >= duration:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(tasks) >= max_inflight:
+            recorder.dropped += 1  # istemci tarafı sınır: sunucu çoktan doymuş
+            continue
+        task = asyncio.create_task(send(session, url, next(stream), recorder, next_at))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return recorder, time.perf_counter() - started
+
+
+async def run_closed(session, url, stream, concurrency, duration):
+    """N kullanıcı: her biri cevabı alır almaz yeni istek gönderir"""
+    started = time.perf_counter()
+    recorder = Recorder(started)
+    deadline = started + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await send(session, url, next(stream), recorder, time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return recorder, time.perf_counter() - started
+
+
+def percentiles(latencies):
+    if not len(latencies):
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def summarize_step(recorder, elapsed, window):
+    samples = recorder.samples
+    latencies = [lat for _, lat, ok in samples if ok]
+    n_errors = sum(1 for _, _, ok in samples if not ok)
+
+    # Zaman içinde gecikme: pencere başına istek sayısı, hata, p50/p99
+    timeline = []
+    if samples:
+        starts = np.array([s for s, _, _ in samples])
+        lats = np.array([lat for _, lat, _ in samples])
+        oks = np.array([ok for _, _, ok in samples])
+        for w in range(int(starts.max() // window) + 1):
+            mask = (starts >= w * window) & (starts < (w + 1) * window)
+            ok_lats = lats[mask & oks]
+            timeline.append({
+                "t": round(w * window, 3),
+                "requests": int(mask.sum()),
+                "errors": int((mask & ~oks).sum()),
+                **{k: v for k, v in percentiles(ok_lats).items() if k in ("p50_ms", "p99_ms")},
+            })
+
+    return {
+        "requests": len(samples),
+        "ok": len(latencies),
+        "errors": n_errors,
+        "error_rate": round(n_errors / len(samples), 4) if samples else 0.0,
+        "error_types": recorder.errors,
+        "dropped": recorder.dropped,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        **percentiles(latencies),
+        "timeline": timeline,
+    }
+
+
+def is_saturated(step, previous, mode, slo_ms):
+    """Kademe doydu mu? (neden metni veya None)"""
+    if step["error_rate"] > MAX_ERROR_RATE:
+        return f"hata oranı %{step['error_rate'] * 100:.1f}"
+    if step["p99_ms"] is not None and step["p99_ms"] > slo_ms:
+        return f"p99 {step['p99_ms']:.1f} ms > SLO {slo_ms:g} ms"
+    if mode == "open":
+        if step["dropped"]:
+            return f"{step['dropped']} istek istemci sınırında düştü"
+        # Poisson gürültüsü yüzünden hedef değil, gerçekten gönderilen hız ile karşılaştırılır
+        if step["throughput_rps"] < step["offered_rps"] * THROUGHPUT_RATIO:
+            return f"throughput {step['throughput_rps']:.1f} < gönderilen {step['offered_rps']:.1f} istek/sn"
+    elif previous is not None and step["throughput_rps"] < previous["throughput_rps"] * GAIN_RATIO:
+        return f"eşzamanlılık {previous['target']} -> {step['target']} throughput'u artırmadı"
+    return None
+
+
+async def replay(args):
+    try:
+        import aiohttp
+    except ImportError:
+        print("❌ HATA: aiohttp kurulu değil. `pip install -r requirements.txt` çalıştırın.")
+        return None
+
+    payloads = load_payloads(args.csv)
+    print(f"📂 {len(payloads)} katalog satırı yüklendi: {args.csv}")
+    stream = payload_stream(payloads, args.batch_size, args.seed)
+    url = args.url.rstrip("/") + args.endpoint
+    steps = [float(s) if args.mode == "open" else int(s) for s in args.steps.split(",")]
+
+    limit = args.max_inflight if args.mode == "open" else max(steps)
+    connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+
+    results = []
+    saturation = None
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # Bağlantıları ısıt ve sunucu ayakta mı kontrol et
+        async with session.get(args.url.rstrip("/") + "/health") as response:
+            if response.status != 200:
+                print(f"❌ /health {response.status} döndü")
+                return None
+
+        for target in steps:
+            label = f"{target:g} istek/sn" if args.mode == "open" else f"{target} eşzamanlı"
+            print(f"\n▶️ Kademe: {label} ({args.step_seconds:g} sn)")
+            if args.mode == "open":
+                recorder, elapsed = await run_open(session, url, stream, target, args.step_seconds,
+                                                   args.max_inflight, args.seed)
+            else:
+                recorder, elapsed = await run_closed(session, url, stream, target, args.step_seconds)
+
+            step = {"target": target, **summarize_step(recorder, elapsed, args.window)}
+            step["offered_rps"] = round((step["requests"] + step["dropped"]) / args.step_seconds, 2)
+            reason = is_saturated(step, results[-1] if results else None, args.mode, args.slo_ms)
+            step["saturated"] = reason
+            results.append(step)
+
+            print(f"   {step['throughput_rps']:.1f} istek/sn | p50 {step['p50_ms']} ms | "
+                  f"p95 {step['p95_ms']} ms | p99 {step['p99_ms']} ms | hata %{step['error_rate'] * 100:.2f}")
+            if reason and saturation is None:
+                saturation = {"target": target, "reason": reason}
+                print(f"   ⚠️ Doyma: {reason}")
+                if args.stop_on_saturation:
+                    break
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "url": url,
+            "mode": args.mode,
+            "batch_size": args.batch_size,
+            "step_seconds": args.step_seconds,
+            "slo_ms": args.slo_ms,
+            "catalog_rows": len(payloads),
+        },
+        "steps": results,
+        "saturation": saturation,
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 86)
+    print(f"📈 YÜK TESTİ ÖZETİ ({report['meta']['mode']}-loop, {report['meta']['url']})")
+    print("=" * 86)
+    print(f"{'Hedef':>10}{'istek/sn':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'hata %':>9}{'düşen':>8}")
+    for s in report["steps"]:
+        fmt = lambda v: f"{v:>10.2f}" if v is not None else f"{'-':>10}"
+        print(f"{s['target']:>10g}{s['throughput_rps']:>11.1f}{fmt(s['p50_ms'])}{fmt(s['p95_ms'])}"
+              f"{fmt(s['p99_ms'])}{fmt(s['max_ms'])}{s['error_rate'] * 100:>9.2f}{s['dropped']:>8}")
+    print("=" * 86)
+    saturation = report["saturation"]
+    if saturation:
+        print(f"🔴 Doyma noktası: {saturation['target']:g} ({saturation['reason']})")
+    else:
+        print("🟢 Denenen kademelerde doyma görülmedi")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Katalog CSV'si ile API yük testi")
+    parser.add_argument("--url", default=os.environ.get("ML_LOAD_URL", "http://127.0.0.1:5000"))
+    parser.add_argument("--endpoint", default="/predict", choices=["/predict", "/predict/batch"])
+    parser.add_argument("--batch-size", type=int, default=1, help="/predict/batch için kalem sayısı")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open")
+    parser.add_argument("--steps", default="25,50,100,200",
+                        help="virgüllü kademeler (open: istek/sn, closed: eşzamanlı kullanıcı)")
+    parser.add_argument("--step-seconds", type=float, default=10.0, help="kademe süresi")
+    parser.add_argument("--max-inflight", type=int, default=256, help="open: en fazla açık istek / bağlantı")
+    parser.add_argument("--timeout", type=float, default=30.0, help="istek zaman aşımı (sn)")
+    parser.add_argument("--slo-ms", type=float, default=100.0, help="p99 hedefi; aşılırsa doymuş sayılır")
+    parser.add_argument("--window", type=float, default=1.0, help="zaman serisi pencere uzunluğu (sn)")
+    parser.add_argument("--stop-on-saturation", action="store_true", help="ilk doymada dur")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="sonuç JSON dosyası (zaman serisi dahil)")
+    args = parser.parse_args(argv)
+
+    if args.endpoint == "/predict":
+        args.batch_size = 1
+    elif args.batch_size < 2:
+        args.batch_size = 10
+
+    report = asyncio.run(replay(args))
+    if report is None:
+        return 1
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Sonuçlar kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
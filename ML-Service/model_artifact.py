@@ -0,0 +1,140 @@
+"""
+Tek dosyalık, sürümlü model artefaktı (.lfm).
+
+train_model.py modeli pickle'a ek olarak bu biçimde de yazar. API bu dosyayı
+pandas / sklearn / joblib import etmeden açar: ağaç dizileri np.memmap ile
+doğrudan dosyadan okunur, encoder sözlükleri ve feature sırası başlıktadır.
+
+Dosya düzeni:
+    MAGIC (8 bayt) | başlık uzunluğu (uint64, little-endian) | JSON başlık
+    | hizalama | dizi buffer'ları (her biri ALIGNMENT baytına hizalı)
+
+Başlık: biçim sürümü, feature sırası, sözlükler, ağaç parametreleri, eğitim
+metadatası, her dizinin offset/dtype/shape bilgisi ve buffer bölgesinin sha256'sı.
+"""
+
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+from tree_ensemble import CompiledTreeEnsemble
+
+MAGIC = b"LFTMODL\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Diziler platformdan bağımsız sabit tiplerle saklanır; indeksler int64 olduğu
+# için 64-bit sistemlerde np.intp'ye kopyasız dönüşür (gerçek mmap)
+ARRAY_DTYPES = {
+    "feature": "<i8",
+    "threshold": "<f8",
+    "left": "<i8",
+    "right": "<i8",
+    "value": "<f8",
+    "roots": "<i8",
+}
+
+
+class ArtifactError(ValueError):
+    """Bozuk, uyumsuz veya doğrulanamayan artefakt"""
+
+
+class ModelArtifact:
+    """Okunmuş artefakt: derlenmiş model + şema bilgisi + metadata"""
+
+    def __init__(self, engine, feature_names, vocabularies, metadata, checksum):
+        self.engine = engine
+        self.feature_names = feature_names
+        self.vocabularies = vocabularies
+        self.metadata = metadata
+        self.checksum = checksum
+
+
+def _padding(size):
+    return (-size) % ALIGNMENT
+
+
+def write_artifact(path, engine, feature_names, vocabularies, metadata=None):
+    """Derlenmiş modeli tek dosyaya yaz (geçici dosya + os.replace)"""
+    arrays = {name: np.ascontiguousarray(array, dtype=ARRAY_DTYPES[name])
+              for name, array in engine.to_arrays().items()}
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset += _padding(offset)
+        layout[name] = {"offset": offset, "dtype": ARRAY_DTYPES[name], "shape": list(array.shape)}
+        offset += array.nbytes
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "feature_names": list(feature_names),
+        "vocabularies": {col: [str(c) for c in classes] for col, classes in vocabularies.items()},
+        "base_value": engine.base_value,
+        "max_depth": engine.max_depth,
+        "n_features": engine.n_features,
+        "arrays": layout,
+        "metadata": metadata or {},
+    }
+
+    # Buffer bölgesini bellekte kur, sha256'yı başlığa yaz
+    body = bytearray(offset)
+    for name, array in arrays.items():
+        start = layout[name]["offset"]
+        body[start:start + array.nbytes] = array.tobytes()
+    header["sha256"] = hashlib.sha256(body).hexdigest()
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    prefix = len(MAGIC) + 8 + len(header_bytes)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\x00" * _padding(prefix))
+        f.write(body)
+    os.replace(tmp_path, path)
+    return header["sha256"]
+
+
+def read_artifact(path, mmap=True, verify=True):
+    """Artefaktı aç; diziler varsayılan olarak dosyadan memory-map edilir"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ArtifactError(f"{path} bir model artefaktı değil")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(f"Desteklenmeyen artefakt sürümü: {header.get('format_version')}")
+
+    prefix = len(MAGIC) + 8 + header_len
+    body_offset = prefix + _padding(prefix)
+    body_size = os.path.getsize(path) - body_offset
+
+    if mmap:
+        body = np.memmap(path, dtype=np.uint8, mode="r", offset=body_offset, shape=(body_size,))
+    else:
+        body = np.fromfile(path, dtype=np.uint8, offset=body_offset)
+
+    if verify and hashlib.sha256(body).hexdigest() != header["sha256"]:
+        raise ArtifactError(f"{path} sağlama toplamı (sha256) tutmuyor")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = spec["offset"]
+        if start + count * dtype.itemsize > body_size:
+            raise ArtifactError(f"{name} dizisi dosya sınırını aşıyor")
+        arrays[name] = body[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    engine = CompiledTreeEnsemble.from_arrays(
+        arrays, header["base_value"], header["max_depth"], header["n_features"]
+    )
+    return ModelArtifact(engine, header["feature_names"], header["vocabularies"],
+                         header["metadata"], header["sha256"])
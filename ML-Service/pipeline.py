@@ -0,0 +1,365 @@
+"""
+Veri hattı çalıştırıcı: 01 → 12 aşamaları + model eğitimi tek komutla
+
+Her aşamanın girdi/çıktı dosyaları aşağıda tanımlıdır; bağımlılıklar (DAG)
+bu tanımlardan çıkarılır. Bir aşama yalnızca kodu veya girdi dosyalarının
+içeriği değiştiyse (ya da çıktıları silinmiş/elle değiştirilmişse) çalışır.
+Birbirine bağlı olmayan aşamalar (ör. EDA ile feature çıkarma, rapor ile
+katalog) aynı anda çalışır. Ara tablolar veri_io.py üzerinden yazılır
+(pyarrow varsa Feather; --bicim / --csv ile değiştirilebilir).
+
+Katalog, model ve öneri deposu aşamaları servis edilen dosyaları ürettiği
+için varsayılan hedeflerde değildir; adlarıyla ya da --yayin ile istenir.
+Katalog aşaması elle düzenlenmiş laptops_int_values.csv'nin üzerine yazmaz,
+yeni katalogu veriler/birlesik/laptops_katalog.csv olarak üretir.
+
+Özetler ve dosya imzaları .pipeline_cache.json içinde tutulur; dosyalar
+yalnızca (mtime, boyut) değiştiyse yeniden hash'lenir.
+
+Kullanım:
+    python pipeline.py                 # veri aşamalarını güncelle (01-11, rapor dahil)
+    python pipeline.py --yayin         # + katalog, model ve öneri deposu
+    python pipeline.py model           # yalnızca model (laptops_int_values.csv'den)
+    python pipeline.py rapor           # yalnızca rapor ve ihtiyaç duyduğu aşamalar
+    python pipeline.py --dry-run       # neyin çalışacağını göster
+    python pipeline.py --force dedup   # önbelleğe bakmadan çalıştır
+    python pipeline.py --list
+    python pipeline.py --bicim parquet --csv   # ara tablolar Parquet + insanlar için CSV
+    python pipeline.py --akis          # büyük veri: ham CSV'ler parça parça alınır (akis_alim.py)
+"""
+
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import veri_io
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, ".pipeline_cache.json")
+
+BIRLESIK = "veriler/birlesik/"
+IO = ["veri_io.py"]  # ara tabloları okuyan/yazan aşamalar
+ASAMA = [*IO, "asamalar.py", "yakin_kopya.py"]  # mantığı asamalar.py'de olan aşamalar (03-10, 05 hariç)
+
+
+class Stage:
+    """Bir script (+ argümanları) + girdi/çıktı glob desenleri + izlenen ek kod dosyaları"""
+
+    def __init__(self, name, script, inputs=(), outputs=(), code=(), args=(), default=True):
+        self.name = name
+        self.default = default  # False: yalnızca adıyla ya da --yayin ile çalışır
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.code = [script, *code]
+
+
+STAGES = [
+    # 01 + 02 tek aşama: ham CSV'ler paralel okunur, turkce_*.csv ara dosyaları yazılmaz
+    Stage("alim", "02_veri_birlestir.py", ["veriler/ham/*.csv"], [BIRLESIK + "laptops_birlesik.*"],
+          code=["ham_veri.py", *IO], args=["--hamdan"]),
+    Stage("dedup", "03_duplicate_temizleme.py",
+          [BIRLESIK + "laptops_birlesik.*"],
+          [BIRLESIK + "laptops_birlesik_dedup.*", BIRLESIK + "laptops_yakin_kopya_raporu.csv"], code=ASAMA),
+    Stage("aykiri", "04_veri_temizleme_aykiri.py",
+          [BIRLESIK + "laptops_birlesik_dedup.*"], [BIRLESIK + "laptops_birlesik_temiz.*"], code=ASAMA),
+    Stage("eda", "05_eda_analizi.py", [BIRLESIK + "laptops_birlesik_temiz.*"], code=IO),
+    Stage("feature", "06_feature_cikarma.py",
+          [BIRLESIK + "laptops_birlesik_temiz.*"], [BIRLESIK + "laptops_feature_cikarilmis.*"], code=ASAMA),
+    Stage("doldurma", "07_eksik_veri_doldurma.py",
+          [BIRLESIK + "laptops_feature_cikarilmis.*"], [BIRLESIK + "laptops_feature_doldurulmus.*"], code=ASAMA),
+    Stage("ozellik", "08_ozellik_cikarimi.py",
+          [BIRLESIK + "laptops_feature_doldurulmus.*"], [BIRLESIK + "laptops_ozellik_cikarilmis.*"], code=ASAMA),
+    Stage("temizleme", "09_veri_temizleme.py",
+          [BIRLESIK + "laptops_ozellik_cikarilmis.*"], [BIRLESIK + "laptops_veri_temizleme.*"], code=ASAMA),
+    Stage("sayisal", "10_sayisai_donusum.py",
+          [BIRLESIK + "laptops_veri_temizleme.*"], [BIRLESIK + "laptops_sayisal_donusum.*"], code=ASAMA),
+    Stage("rapor", "11_raporlama.py",
+          [BIRLESIK + "laptops_sayisal_donusum.*"], [BIRLESIK + "laptops_rapor.xlsx"], code=IO),
+    Stage("katalog", "12_katalog_olustur.py",
+          [BIRLESIK + "laptops_sayisal_donusum.*"], [BIRLESIK + "laptops_katalog.csv"], code=IO, default=False),
+    Stage("model", "train_model.py", ["laptops_int_values.csv"],
+          ["model/laptop_fiyat_model.pkl", "model/label_encoders.pkl", "model/laptop_fiyat_model.lfm"],
+          code=["feature_parser.py", "feature_schema.py", "price_grid.py", "tree_ensemble.py", "model_artifact.py"],
+          default=False),
+    Stage("oneriler", "train_recommendations.py", ["laptops_int_values.csv"], ["model/recommendations.*"],
+          code=["recommendation_store.py"], default=False),
+]
+
+# Durumlar
+CALISTI, GUNCEL, HATA, ENGELLENDI, CALISACAK = "çalıştı", "güncel", "HATA", "engellendi", "çalışacak"
+
+
+def _overlaps(pattern_a, pattern_b):
+    return pattern_a == pattern_b or fnmatch.fnmatch(pattern_a, pattern_b) or fnmatch.fnmatch(pattern_b, pattern_a)
+
+
+def dependencies(stages):
+    """{aşama: {önceki aşamalar}} — girdi deseni başka bir aşamanın çıktısıyla örtüşüyorsa"""
+    deps = {}
+    for stage in stages:
+        deps[stage.name] = {
+            other.name for other in stages if other is not stage
+            if any(_overlaps(i, o) for i in stage.inputs for o in other.outputs)
+        }
+    # Döngü kontrolü (topolojik sıralama)
+    seen, order = set(), []
+    while len(order) < len(stages):
+        ready = [s.name for s in stages if s.name not in seen and deps[s.name] <= seen]
+        if not ready:
+            raise ValueError(f"Aşamalar arasında döngü var: {sorted(set(deps) - seen)}")
+        seen.update(ready)
+        order.extend(ready)
+    return deps
+
+
+def ancestors(names, deps):
+    result, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in result:
+            result.add(name)
+            stack.extend(deps[name])
+    return result
+
+
+class HashCache:
+    """Dosya içerik hash'leri; (mtime, boyut) değişmediyse yeniden okunmaz"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    def file(self, path):
+        full = os.path.join(BASE_DIR, path)
+        st = os.stat(full)
+        entry = self.entries.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return entry[2]
+        digest = hashlib.sha256()
+        with open(full, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        sha = digest.hexdigest()
+        self.entries[path] = [st.st_mtime_ns, st.st_size, sha]
+        return sha
+
+    def files(self, patterns):
+        """{göreli yol: hash} — desenlere uyan tüm dosyalar"""
+        result = {}
+        for pattern in patterns:
+            for full in sorted(glob.glob(os.path.join(BASE_DIR, pattern))):
+                path = os.path.relpath(full, BASE_DIR).replace(os.sep, "/")
+                result[path] = self.file(path)
+        return result
+
+
+def stage_key(stage, hashes):
+    """Kod + girdi içeriklerinden (+ ara dosya biçimi ayarlarından) aşama anahtarı"""
+    digest = hashlib.sha256()
+    digest.update(f"io {veri_io.ayar_ozeti()}\n".encode())
+    digest.update(f"args {' '.join(stage.args)}\n".encode())
+    for path, sha in sorted(hashes.files(stage.code).items()):
+        digest.update(f"code {path} {sha}\n".encode())
+    for path, sha in sorted(hashes.files(stage.inputs).items()):
+        digest.update(f"input {path} {sha}\n".encode())
+    return digest.hexdigest()
+
+
+def is_up_to_date(stage, key, record, hashes):
+    if not record or record.get("key") != key:
+        return False
+    current = hashes.files(stage.outputs)
+    # Sabit isimli her çıktı var olmalı; glob çıktılar kayıttakiyle aynı olmalı
+    for pattern in stage.outputs:
+        if not glob.has_magic(pattern) and pattern not in current:
+            return False
+    return current == record.get("outputs", {})
+
+
+def run_stage(stage):
+    """Script'i ML-Service klasöründe çalıştır (script'ler göreli yollar kullanır)"""
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", MPLBACKEND="Agg")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, stage.script, *stage.args], cwd=BASE_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace",
+    )
+    return proc.returncode, proc.stdout, time.perf_counter() - started
+
+
+def load_cache():
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache):
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, CACHE_FILE)
+
+
+def print_output(name, output, seconds, full):
+    lines = output.rstrip().splitlines()
+    if not full:
+        lines = lines[-4:]
+    print(f"── [{name}] {seconds:.1f} sn")
+    for line in lines:
+        print(f"   {line}")
+
+
+def run_pipeline(targets=None, force=(), dry_run=False, jobs=None, verbose=False, publish=False):
+    """
+    Seçilen aşamaları (ve ihtiyaç duydukları aşamaları) güncelle; {aşama: (durum, süre)} döner.
+    Hedef verilmezse default aşamalar (publish=True ise hepsi) seçilir.
+    """
+    deps = dependencies(STAGES)
+    by_name = {s.name: s for s in STAGES}
+    unknown = [t for t in (targets or []) + list(force) if t not in by_name and t != "all"]
+    if unknown:
+        raise ValueError(f"Bilinmeyen aşama: {', '.join(unknown)} (python pipeline.py --list)")
+    if not targets:
+        targets = [s.name for s in STAGES if s.default or publish]
+    selected = ancestors(targets, deps)
+    force_all = "all" in force
+
+    cache = load_cache()
+    hashes = HashCache(cache.get("_files"))
+    stages = cache.setdefault("stages", {})
+    results = {}
+    pending = [s for s in STAGES if s.name in selected]
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 2) as pool:
+        while pending or running:
+            # Bağımlılıkları biten aşamaları değerlendir (hash'leme yalnızca bu thread'de)
+            progressed = True
+            while progressed:
+                progressed = False
+                for stage in list(pending):
+                    stage_deps = deps[stage.name] & selected
+                    if any(results[d][0] in (HATA, ENGELLENDI) for d in stage_deps if d in results):
+                        results[stage.name] = (ENGELLENDI, 0.0)
+                    elif not all(d in results for d in stage_deps):
+                        continue
+                    elif dry_run and any(results[d][0] == CALISACAK for d in stage_deps):
+                        results[stage.name] = (CALISACAK, 0.0)
+                    else:
+                        key = stage_key(stage, hashes)
+                        forced = force_all or stage.name in force
+                        if not forced and is_up_to_date(stage, key, stages.get(stage.name), hashes):
+                            results[stage.name] = (GUNCEL, 0.0)
+                        elif dry_run:
+                            results[stage.name] = (CALISACAK, 0.0)
+                        else:
+                            print(f"▶️ {stage.name}: {' '.join([stage.script, *stage.args])}")
+                            running[pool.submit(run_stage, stage)] = (stage, key)
+                    pending.remove(stage)
+                    progressed = True
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, key = running.pop(future)
+                returncode, output, seconds = future.result()
+                print_output(stage.name, output, seconds, verbose or returncode != 0)
+                if returncode != 0:
+                    results[stage.name] = (HATA, seconds)
+                    stages.pop(stage.name, None)
+                    print(f"❌ {stage.name} başarısız (çıkış kodu {returncode})")
+                    continue
+                results[stage.name] = (CALISTI, seconds)
+                stages[stage.name] = {
+                    "key": key,
+                    "outputs": hashes.files(stage.outputs),
+                    "seconds": round(seconds, 3),
+                    "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                # Yarıda kesilse bile tamamlanan aşamalar kaybolmasın
+                cache["_files"] = hashes.entries
+                save_cache(cache)
+
+    cache["_files"] = hashes.entries
+    if not dry_run:
+        save_cache(cache)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Veri hattını (01-12 + model) artımlı çalıştır")
+    parser.add_argument("targets", nargs="*", help="güncellenecek aşamalar (varsayılan: veri aşamaları)")
+    parser.add_argument("--force", nargs="*", metavar="AŞAMA",
+                        help="önbelleğe bakmadan çalıştır (isim verilmezse hepsi)")
+    parser.add_argument("--dry-run", action="store_true", help="çalıştırmadan neyin çalışacağını göster")
+    parser.add_argument("-j", "--jobs", type=int, help="aynı anda çalışacak aşama sayısı")
+    parser.add_argument("-v", "--verbose", action="store_true", help="aşama çıktılarının tamamını göster")
+    parser.add_argument("--list", action="store_true", help="aşamaları ve bağımlılıkları listele")
+    parser.add_argument("--yayin", action="store_true",
+                        help="katalog, model ve öneri deposu aşamalarını da çalıştır (model/ dosyalarını yeniler)")
+    parser.add_argument("--bicim", choices=sorted(veri_io.UZANTILAR),
+                        help="ara tablo biçimi (varsayılan: ML_ARA_BICIM, yoksa pyarrow varsa feather)")
+    parser.add_argument("--csv", action="store_true", help="ara tabloların CSV kopyasını da yaz")
+    parser.add_argument("--akis", action="store_true",
+                        help="alım aşamasını akış modunda çalıştır (bellek ham veri boyutundan bağımsız)")
+    args = parser.parse_args(argv)
+
+    if args.akis:
+        # Argümanlar önbellek anahtarında: mod değişince alım yeniden çalışır
+        alim = next(s for s in STAGES if s.name == "alim")
+        alim.args = ["--akis"]
+        alim.code += ["akis_alim.py", "asamalar.py"]
+
+    # Aşamalar alt süreçte çalışır; ayarlar ortam değişkeniyle geçer
+    if args.bicim:
+        os.environ["ML_ARA_BICIM"] = args.bicim
+    if args.csv:
+        os.environ["ML_CSV_DISA_AKTAR"] = "1"
+
+    if args.list:
+        deps = dependencies(STAGES)
+        for stage in STAGES:
+            after = ", ".join(sorted(deps[stage.name])) or "-"
+            opt = "" if stage.default else "  (--yayin)"
+            print(f"{stage.name:<14} {stage.script:<32} ← {after}{opt}")
+        return 0
+
+    # --force tek başına: hepsi; --force a b: yalnızca a ve b
+    force = [] if args.force is None else (args.force or ["all"])
+
+    print("=" * 70)
+    print("🔁 VERİ HATTI" + (" (deneme)" if args.dry_run else ""))
+    print("=" * 70)
+    started = time.perf_counter()
+    try:
+        results = run_pipeline(args.targets, force, args.dry_run, args.jobs, args.verbose, args.yayin)
+    except ValueError as e:
+        print(f"❌ HATA: {e}")
+        return 2
+
+    print("\n" + "=" * 70)
+    icons = {CALISTI: "✅", GUNCEL: "⏭️", HATA: "❌", ENGELLENDI: "⛔", CALISACAK: "🔜"}
+    for stage in STAGES:
+        if stage.name in results:
+            status, seconds = results[stage.name]
+            timing = f"{seconds:6.1f} sn" if seconds else ""
+            print(f"{icons[status]} {stage.name:<14} {status:<11} {timing}")
+    ran = sum(1 for s, _ in results.values() if s == CALISTI)
+    skipped = sum(1 for s, _ in results.values() if s == GUNCEL)
+    print(f"⏱️ Toplam {time.perf_counter() - started:.1f} sn | çalışan {ran}, güncel {skipped}")
+    return 1 if any(s in (HATA, ENGELLENDI) for s, _ in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Tam ızgara (full-grid) fiyat tablosu.
+
+Parse/encode sonrası modelin 7 girdisi neredeyse tamamen ayrıktır: birkaç RAM
+ve depolama boyutu, CPU tier (1-9), CPU nesli (0-15) ve üç küçük encoder
+sözlüğü. Bu değerlerin kartezyen çarpımı bir kez model ile hesaplanıp yoğun
+bir NumPy dizisi olarak saklanır; istekler indeks aritmetiği ile cevaplanır.
+Izgara dışındaki girdiler (ör. 20 GB RAM) canlı modele düşer.
+
+Dosya biçimi (<nesil> her kayıtta yeni, recommendation_store ile aynı yaklaşım):
+    <yol>.<nesil>.npy   float64 tablo, mmap ile açılır
+    <yol>.json          eksenler + meta + "generation", "shape", "table_sha256"
+
+<yol>.json işaretçidir ve en son değiştirilir: okuyan taraf eski json'u yeni
+tabloyla (ya da tersini) eşleyemez. load() tablonun boyutunu ve özetini
+json'dakiyle karşılaştırır.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Çok büyük ızgaraların yanlışlıkla üretilmesini engeller (~400 MB)
+MAX_CELLS = 50_000_000
+
+# feature_parser'ın üretebileceği tüm değerler
+CPU_TIER_AXIS = [1, 2, 3, 5, 7, 9]
+CPU_GEN_AXIS = list(range(16))
+
+# Eğitim verisi elde yokken (yükleme anında üretim) kullanılan yaygın boyutlar
+DEFAULT_RAM_AXIS = [4, 8, 12, 16, 24, 32, 48, 64, 96, 128]
+DEFAULT_STORAGE_AXIS = [128, 256, 512, 1024, 2048, 4096]
+
+KEEP_GENERATIONS = 2  # bir önceki nesil: işaretçiyi az önce okumuş worker'lar için
+GENERATION_GRACE_SECONDS = 60  # aynı anda kaydeden worker'ların nesilleri bu süre silinmez
+
+
+def file_sha256(path):
+    """Izgaranın hangi model dosyasıyla üretildiğini doğrulamak için"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def grid_axes(vocabularies, ram_values=DEFAULT_RAM_AXIS, storage_values=DEFAULT_STORAGE_AXIS):
+    """
+    Model feature sırasıyla (RAM, Depolama, CPU_Seviye, CPU_Nesil, 3 encoder) eksenler.
+    vocabularies: {kolon: sınıf listesi} (ör. FeatureSchema.vocabularies)
+    """
+    return [
+        sorted(set(float(v) for v in ram_values)),
+        sorted(set(float(v) for v in storage_values)),
+        CPU_TIER_AXIS,
+        CPU_GEN_AXIS,
+        list(range(len(vocabularies['CPU_Marka']))),
+        list(range(len(vocabularies['GPU_Tipi']))),
+        list(range(len(vocabularies['Laptop_Marka']))),
+    ]
+
+
+class PriceGrid:
+    """Kartezyen ızgara üzerinde önceden hesaplanmış tahmin tablosu"""
+
+    def __init__(self, feature_names, axes, table, meta=None):
+        self.feature_names = list(feature_names)
+        self.axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        self.shape = tuple(len(axis) for axis in self.axes)
+        self.strides = np.array(
+            [int(np.prod(self.shape[i + 1:], dtype=np.int64)) for i in range(len(self.shape))],
+            dtype=np.intp
+        )
+        self.table = table.reshape(-1)
+        self.meta = meta or {}
+        if len(self.table) != self.n_cells:
+            raise ValueError(f"Tablo boyutu {len(self.table)}, ızgara {self.n_cells} hücre bekliyor")
+
+    @property
+    def n_cells(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @classmethod
+    def build(cls, feature_names, axes, predict_fn, chunk_size=200_000, meta=None):
+        """predict_fn(X) ile tüm ızgarayı parça parça hesapla"""
+        axes = [np.asarray(axis, dtype=np.float64) for axis in axes]
+        shape = tuple(len(axis) for axis in axes)
+        n_cells = int(np.prod(shape, dtype=np.int64))
+        if n_cells > MAX_CELLS:
+            raise ValueError(f"Izgara çok büyük: {n_cells} hücre (sınır {MAX_CELLS})")
+
+        table = np.empty(n_cells, dtype=np.float64)
+        for start in range(0, n_cells, chunk_size):
+            stop = min(start + chunk_size, n_cells)
+            coords = np.unravel_index(np.arange(start, stop), shape)
+            X = np.column_stack([axis[c] for axis, c in zip(axes, coords)])
+            table[start:stop] = predict_fn(X)
+        return cls(feature_names, axes, table, meta)
+
+    def save(self, path):
+        """
+        Tablo yeni bir nesil adıyla yazılır, ardından <yol>.json tek os.replace
+        ile bu nesli gösterir. Geçici dosya adları tekildir: aynı anda kaydeden
+        worker'lar birbirinin dosyasını ezmez.
+        """
+        generation = f"{time.time_ns():x}-{os.getpid()}"
+        table_path = _table_path(path, generation)
+        _atomic_write(table_path, lambda f: np.save(f, self.table))
+        meta = {
+            "feature_names": self.feature_names,
+            "axes": [axis.tolist() for axis in self.axes],
+            **self.meta,
+            "generation": generation,
+            "shape": list(self.shape),
+            "table_sha256": _table_sha256(self.table),
+        }
+        _atomic_write(path + ".json", lambda f: f.write(
+            json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")))
+        _remove_old_generations(path, generation, keep=KEEP_GENERATIONS)
+
+    @classmethod
+    def load(cls, path, mmap=True, attempts=3):
+        for attempt in range(attempts):
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            table_path = _table_path(path, meta.pop("generation", None))
+            try:
+                table = np.load(table_path, mmap_mode="r" if mmap else None)
+            except FileNotFoundError:
+                # Okurken iki kayıt birden yapıldıysa nesil silinmiş olabilir: işaretçiyi yeniden oku
+                if attempt == attempts - 1:
+                    raise
+                continue
+            shape = meta.pop("shape", None)
+            if shape is not None and table.size != int(np.prod(shape, dtype=np.int64)):
+                raise ValueError(f"Fiyat tablosu {table.size} hücre, json {shape} bekliyor")
+            if "table_sha256" in meta and _table_sha256(table) != meta.pop("table_sha256"):
+                raise ValueError(f"Fiyat tablosu json ile eşleşmiyor: {table_path}")
+            return cls(meta.pop("feature_names"), meta.pop("axes"), table, meta)
+
+    def lookup(self, X):
+        """
+        (n, 7) matris için (değerler, ızgarada_mı) döner.
+        Izgara dışındaki satırların değeri NaN'dır.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        flat = np.zeros(len(X), dtype=np.intp)
+        on_grid = np.ones(len(X), dtype=bool)
+        for f, axis in enumerate(self.axes):
+            pos = np.minimum(np.searchsorted(axis, X[:, f]), len(axis) - 1)
+            on_grid &= axis[pos] == X[:, f]
+            flat += pos * self.strides[f]
+        values = np.full(len(X), np.nan)
+        values[on_grid] = self.table[flat[on_grid]]
+        return values, on_grid
+
+
+def _table_path(path, generation):
+    # generation yoksa nesilsiz eski biçim (<yol>.npy)
+    return f"{path}.{generation}.npy" if generation else path + ".npy"
+
+
+def _table_sha256(table):
+    return hashlib.sha256(np.ascontiguousarray(table, dtype=np.float64).data).hexdigest()
+
+
+def _atomic_write(target, write):
+    """Aynı klasörde tekil geçici dosyaya yaz, os.replace ile yerine koy"""
+    directory, name = os.path.split(target)
+    fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _remove_old_generations(path, published, keep):
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    generations = []
+    for file_name in os.listdir(directory):
+        if file_name.startswith(prefix) and file_name.endswith(".npy"):
+            generation = file_name[len(prefix):-len(".npy")]
+            stamp = generation.split("-")[0]
+            if "-" in generation and stamp and all(c in "0123456789abcdef" for c in stamp):
+                generations.append((int(stamp, 16), generation))
+    # Aynı anda kaydeden worker'ların nesilleri (yayımlanmamış ya da bizden sonra
+    # yayımlanacak olanlar) hemen silinmez
+    limit = min(int(published.split("-")[0], 16), time.time_ns() - GENERATION_GRACE_SECONDS * 10**9)
+    stale = [g for stamp, g in sorted(generations)[:-keep] if stamp < limit]
+    # Eski nesilsiz biçim (<yol>.npy) de artık kullanılmıyor
+    for table_path in [path + ".npy"] + [_table_path(path, g) for g in stale]:
+        try:
+            os.remove(table_path)
+        except OSError:
+            pass  # yok ya da Windows'ta hâlâ mmap'li; sonraki kayıtta denenir
@@ -0,0 +1,160 @@
+"""
+Önceden hesaplanmış kullanıcı başına top-K öneri deposu.
+
+train_recommendations.py (offline) yazar, API mmap ile açar. İstek yolunda
+model yoktur: kullanıcı satırı ikili arama ile bulunur, ilk `limit` kalem
+dilimlenir (O(log U + limit)). Kişisel öneri yetmezse popüler ürünlerle
+tamamlanır.
+
+Dosya biçimi (<yol> öneki, price_grid ile aynı yaklaşım; <nesil> her
+kayıtta yeni):
+    <yol>.<nesil>.users.npy    (U,)   int64   sıralı kullanıcı kimlikleri
+    <yol>.<nesil>.items.npy    (U, K) int32   ürün kimlikleri, boş yerler -1
+    <yol>.<nesil>.scores.npy   (U, K) float32 skorlar (azalan)
+    <yol>.<nesil>.popular.npy  (P,)   int32   popülerlik sırasıyla ürünler
+    <yol>.json                        metadata + "generation": <nesil>
+
+<yol>.json işaretçidir ve en son değiştirilir: okuyan taraf onu okuyup aynı
+nesildeki dizileri açar, böylece eski ve yeni dosyalar hiç karışmaz. Her
+kayıttan sonra son KEEP_GENERATIONS nesil dışındakiler ve nesilsiz eski
+biçimin dosyaları silinir; depo yeniden kurulumlarla büyümez.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+ARRAY_NAMES = ("users", "items", "scores", "popular")
+KEEP_GENERATIONS = 2  # bir önceki nesil: işaretçiyi az önce okumuş okuyucular için
+
+
+class TopKStore:
+    """Kullanıcı -> top-K ürün listesi"""
+
+    def __init__(self, users, items, scores, popular, meta=None):
+        self.users = users
+        self.items = items
+        self.scores = scores
+        self.popular = popular
+        self.meta = meta or {}
+        if items.shape != scores.shape or len(users) != len(items):
+            raise ValueError("users/items/scores boyutları uyuşmuyor")
+
+    @property
+    def k(self):
+        return self.items.shape[1] if self.items.ndim == 2 else 0
+
+    def save(self, path):
+        """
+        Diziler yeni bir nesil önekiyle yazılır, ardından <yol>.json tek
+        os.replace ile bu nesli gösterir: okuyucu ya tamamen eski ya tamamen
+        yeni kümeyi görür.
+        """
+        arrays = {
+            "users": np.ascontiguousarray(self.users, dtype=np.int64),
+            "items": np.ascontiguousarray(self.items, dtype=np.int32),
+            "scores": np.ascontiguousarray(self.scores, dtype=np.float32),
+            "popular": np.ascontiguousarray(self.popular, dtype=np.int32),
+        }
+        generation = f"{time.time_ns():x}"
+        for name, array in arrays.items():
+            tmp_path = f"{path}.{generation}.{name}.tmp.npy"
+            np.save(tmp_path, array)
+            os.replace(tmp_path, _array_path(path, generation, name))
+        # Tekil geçici ad: aynı anda iki kayıt birbirinin işaretçisini ezmez
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".json.", suffix=".tmp",
+                                        dir=os.path.dirname(path) or ".")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({**self.meta, "generation": generation}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path + ".json")
+        _remove_old_generations(path, keep=KEEP_GENERATIONS)
+
+    @classmethod
+    def load(cls, path, mmap=True, attempts=3):
+        for attempt in range(attempts):
+            with open(path + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            generation = meta.get("generation")
+            try:
+                arrays = {name: np.load(_array_path(path, generation, name), mmap_mode="r" if mmap else None)
+                          for name in ARRAY_NAMES}
+            except FileNotFoundError:
+                # Okurken iki kayıt birden yapıldıysa nesil silinmiş olabilir: işaretçiyi yeniden oku
+                if attempt == attempts - 1:
+                    raise
+                continue
+            return cls(meta=meta, **arrays)
+
+    @staticmethod
+    def pointer(path):
+        """Değişimi izlenecek tek dosya (yeni nesil yalnızca bu değişince görünür)"""
+        return path + ".json"
+
+    @staticmethod
+    def files(path):
+        """Güncel kümenin dosyaları"""
+        with open(path + ".json", encoding="utf-8") as f:
+            generation = json.load(f).get("generation")
+        return [_array_path(path, generation, name) for name in ARRAY_NAMES] + [path + ".json"]
+
+    def recommend(self, user_id, limit):
+        """
+        [(ürün, skor), ...], kişisel_mi döner.
+        Bilinmeyen kullanıcı veya yetersiz liste popüler ürünlerle tamamlanır (skor 0).
+        """
+        results = []
+        row = int(np.searchsorted(self.users, user_id))
+        personal = bool(row < len(self.users) and self.users[row] == user_id)
+        if personal:
+            items = self.items[row, :limit]
+            scores = self.scores[row, :limit]
+            valid = items >= 0
+            results = list(zip(items[valid].tolist(), np.round(scores[valid].astype(np.float64), 6).tolist()))
+
+        if len(results) < limit:
+            seen = {item for item, _ in results}
+            for item in self.popular[:limit + len(results)].tolist():
+                if item not in seen:
+                    results.append((item, 0.0))
+                    if len(results) == limit:
+                        break
+        return results, personal
+
+
+def _array_path(path, generation, name):
+    # generation yoksa nesilsiz eski biçim (<yol>.<ad>.npy)
+    return f"{path}.{generation}.{name}.npy" if generation else f"{path}.{name}.npy"
+
+
+def _remove_old_generations(path, keep):
+    """
+    İşaretçi değiştikten sonra: en yeni `keep` nesil dışındaki nesilleri, yarım
+    kalmış kayıtların geçici dosyalarını ve nesilsiz eski biçimi (<yol>.<ad>.npy) sil.
+    """
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    generations, legacy, temporary = set(), [], []
+    for file_name in os.listdir(directory):
+        parts = file_name[len(prefix):].split(".") if file_name.startswith(prefix) else []
+        if len(parts) == 2 and parts[0] in ARRAY_NAMES and parts[1] == "npy":
+            legacy.append(file_name)
+        elif len(parts) == 3 and parts[1] in ARRAY_NAMES and parts[2] == "npy":
+            generations.add(parts[0])
+        elif len(parts) == 4 and parts[1] in ARRAY_NAMES and parts[2:] == ["tmp", "npy"]:
+            temporary.append((parts[0], file_name))
+    # Nesil = onaltılık ns zaman damgası; eşit uzunlukta sıralama zamana göre
+    ordered = sorted(generations, key=lambda g: (len(g), g))
+    stale = ordered[:-keep]
+    newest = ordered[-keep:]
+    old = [os.path.basename(_array_path(path, generation, name)) for generation in stale for name in ARRAY_NAMES]
+    # Daha yeni bir neslin geçici dosyası o an yazılıyor olabilir: dokunma
+    old += [file_name for generation, file_name in temporary
+            if newest and (len(generation), generation) < (len(newest[0]), newest[0])]
+    for file_name in old + legacy:
+        try:
+            os.remove(os.path.join(directory, file_name))
+        except OSError:
+            pass  # Windows'ta hâlâ mmap'li dosya silinemez; sonraki kayıtta denenir
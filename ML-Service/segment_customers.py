@@ -0,0 +1,141 @@
+"""
+Toplu müşteri segmentasyonu (gece işi)
+
+Müşteri CSV'si parça parça (chunk) okunur, her parça tek matris işlemiyle
+segmentlenir ve satırlar segment, segment_id, confidence kolonları eklenerek
+çıktıya yazılır. Bellek kullanımı dosya boyutundan bağımsızdır. Aynı akış
+API'deki POST /api/ml/segment-customer/batch (text/csv) tarafından da
+kullanılır.
+
+Kullanım:
+    python segment_customers.py veriler/musteriler.csv veriler/musteri_segmentleri.csv
+    python segment_customers.py musteriler.csv segmentler.csv --chunk-size 100000
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+from segment_model import ALIASES, DEFAULTS, SEGMENT_MODEL_FILE, SegmentModel, raw_matrix, _number
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL = os.path.join(BASE_DIR, "model", SEGMENT_MODEL_FILE)
+DEFAULT_CHUNK_SIZE = 50000
+OUTPUT_COLUMNS = ["segment", "segment_id", "confidence"]
+
+
+def _column_index(header):
+    """Her feature alanı için CSV kolon indeksi (yoksa None)"""
+    lookup = {name.strip().lower(): i for i, name in enumerate(header)}
+    return {
+        name: next((lookup[a] for a in aliases if a in lookup), None)
+        for name, aliases in ALIASES.items()
+    }
+
+
+def _column(rows, index, default):
+    """CSV kolonunu float dizisine çevir; boş/hatalı değer -> varsayılan"""
+    if index is None:
+        return np.full(len(rows), float(default))
+    values = [row[index] if index < len(row) else "" for row in rows]
+    try:
+        array = np.array([v if v != "" else "nan" for v in values], dtype=np.float64)
+    except ValueError:  # hatalı hücre: yalnızca bu parçada satır satır
+        array = np.array([_number(v, default) for v in values])
+    array[~np.isfinite(array)] = default
+    return array
+
+
+def read_chunks(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """CSV satırları -> (başlık, ham satırlar, model matrisi) parçaları"""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    index = _column_index(header)
+    while True:
+        rows = [row for _, row in zip(range(chunk_size), reader) if row]
+        if not rows:
+            return
+        columns = [_column(rows, index[name], DEFAULTS[name]) for name in ALIASES]
+        yield header, rows, raw_matrix(*columns)
+
+
+def segment_stream(model, lines, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """
+    CSV satırları -> segment kolonları eklenmiş CSV metni (parça parça).
+    stats sözlüğü verilirse satır sayısı ve aşama süreleri biriktirilir.
+    """
+    stats = stats if stats is not None else {}
+    for key in ("rows", "read_seconds", "assign_seconds", "write_seconds"):
+        stats.setdefault(key, 0)
+    segments = np.array(model.segments, dtype=object)
+
+    chunks = read_chunks(lines, chunk_size)
+    header_written = False
+    while True:
+        t = time.perf_counter()
+        chunk = next(chunks, None)
+        stats["read_seconds"] += time.perf_counter() - t
+        if chunk is None:
+            break
+        header, rows, X = chunk
+
+        t = time.perf_counter()
+        labels, confidence = model.assign(X)
+        stats["assign_seconds"] += time.perf_counter() - t
+
+        t = time.perf_counter()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if not header_written:
+            writer.writerow(header + OUTPUT_COLUMNS)
+            header_written = True
+        writer.writerows(
+            row + [name, label, f"{conf:.4f}"]
+            for row, name, label, conf in zip(rows, segments[labels], labels.tolist(), confidence.tolist())
+        )
+        stats["rows"] += len(rows)
+        stats["write_seconds"] += time.perf_counter() - t
+        yield buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müşteri CSV'sini toplu segmentle")
+    parser.add_argument("input", help="müşteri CSV'si")
+    parser.add_argument("output", help="segment kolonları eklenmiş çıktı CSV'si")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.model):
+        print(f"❌ HATA: {args.model} bulunamadı! Önce: python train_segment_model.py")
+        return 1
+    model = SegmentModel.load(args.model)
+    print(f"👥 Segmentler: {', '.join(model.segments)}")
+
+    stats = {}
+    started = time.perf_counter()
+    tmp_path = args.output + ".tmp"
+    with open(args.input, encoding="utf-8", newline="") as src, \
+            open(tmp_path, "w", encoding="utf-8", newline="") as dst:
+        for text in segment_stream(model, src, args.chunk_size, stats):
+            dst.write(text)
+    os.replace(tmp_path, args.output)
+    elapsed = time.perf_counter() - started
+
+    rows = stats["rows"]
+    print(f"✅ {rows:,} müşteri segmentlendi -> {args.output}")
+    print(f"⏱️ Toplam {elapsed:.2f} sn | {rows / max(elapsed, 1e-9):,.0f} müşteri/sn")
+    print(f"   okuma {stats['read_seconds']:.2f} sn | atama {stats['assign_seconds']:.3f} sn "
+          f"({rows / max(stats['assign_seconds'], 1e-9):,.0f}/sn) | yazma {stats['write_seconds']:.2f} sn")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Müşteri segmentasyonu: RFM tarzı feature'lar + eğitimde hesaplanmış KMeans merkezleri.
+
+Eğitim (train_segment_model.py), API (api/app.py) ve toplu CLI
+(segment_customers.py) aynı modülü kullanır. Atama tek vektörel mesafe
+hesabıdır: ||x||² - 2·x·Cᵀ + ||c||² -> en yakın merkez. sklearn gerekmez;
+model küçük bir JSON dosyasıdır.
+
+Güven: en yakın iki merkeze uzaklıktan, d2 / (d1 + d2) ∈ [0.5, 1].
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+SEGMENT_MODEL_FILE = "segment_model.json"
+
+# Model kolonları (sıra önemli)
+FEATURE_NAMES = ["log_total_spent", "log_order_count", "log_avg_order_value", "log_recency_days", "log_tenure_days"]
+
+# Eksik alanların varsayılanları
+DEFAULTS = {
+    "total_spent": 0.0,
+    "order_count": 0,
+    "days_since_last_order": 365,
+    "account_age_days": 365,
+}
+# Aynı alanın .NET / CSV tarafındaki diğer adları
+ALIASES = {
+    "total_spent": ("total_spent", "monetary", "total_amount"),
+    "order_count": ("order_count", "frequency", "orders"),
+    "days_since_last_order": ("days_since_last_order", "recency_days", "recency"),
+    "account_age_days": ("account_age_days", "tenure_days"),
+}
+
+
+def _number(value, default):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return float(default)
+    return number if math.isfinite(number) else float(default)
+
+
+def _field(customer, name):
+    for key in ALIASES[name]:
+        if customer.get(key) not in (None, ""):
+            return max(_number(customer[key], DEFAULTS[name]), 0.0)
+    return float(DEFAULTS[name])
+
+
+def customer_matrix(customers):
+    """customer_data sözlükleri -> (n, n_features) float64 matris"""
+    raw = np.array([[_field(c, name) for name in ALIASES] for c in customers], dtype=np.float64).reshape(-1, 4)
+    return raw_matrix(raw[:, 0], raw[:, 1], raw[:, 2], raw[:, 3])
+
+
+def raw_matrix(total_spent, order_count, recency_days, tenure_days):
+    """Ham kolonlar (dizi) -> model matrisi; CSV/chunk yolu sözlük kurmadan bunu kullanır"""
+    total_spent = np.maximum(np.asarray(total_spent, dtype=np.float64), 0.0)
+    order_count = np.maximum(np.asarray(order_count, dtype=np.float64), 0.0)
+    avg_order = np.divide(total_spent, order_count, out=np.zeros_like(total_spent), where=order_count > 0)
+    return np.column_stack([
+        np.log1p(total_spent),
+        np.log1p(order_count),
+        np.log1p(avg_order),
+        np.log1p(np.maximum(np.asarray(recency_days, dtype=np.float64), 0.0)),
+        np.log1p(np.maximum(np.asarray(tenure_days, dtype=np.float64), 0.0)),
+    ])
+
+
+class SegmentModel:
+    """Ölçekleme + merkezler + segment isimleri"""
+
+    def __init__(self, mean, scale, centroids, segments, metadata=None):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.segments = list(segments)
+        self.metadata = metadata or {}
+        if self.centroids.shape != (len(self.segments), len(FEATURE_NAMES)):
+            raise ValueError("Merkez sayısı / feature sayısı uyuşmuyor")
+        if len(self.mean) != len(FEATURE_NAMES) or len(self.scale) != len(FEATURE_NAMES):
+            raise ValueError("Ölçekleme boyutları uyuşmuyor")
+        self._centroid_norms = (self.centroids ** 2).sum(axis=1)
+
+    def assign(self, X):
+        """(n, n_features) -> (segment indeksleri, güven)"""
+        Z = (X - self.mean) / self.scale
+        d2 = (Z ** 2).sum(axis=1)[:, None] - 2.0 * Z @ self.centroids.T + self._centroid_norms
+        np.maximum(d2, 0.0, out=d2)  # yuvarlama hatası negatif verebilir
+        if d2.shape[1] == 1:
+            return np.zeros(len(X), dtype=np.int64), np.ones(len(X))
+        nearest = np.argpartition(d2, 1, axis=1)[:, :2]
+        first = np.take_along_axis(d2, nearest, axis=1)
+        order = np.argsort(first, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        d = np.sqrt(np.take_along_axis(first, order, axis=1))
+        total = d[:, 0] + d[:, 1]
+        confidence = np.divide(d[:, 1], total, out=np.full(len(X), 0.5), where=total > 0)
+        return nearest[:, 0], confidence
+
+    def to_dict(self):
+        return {
+            "feature_names": FEATURE_NAMES,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "centroids": self.centroids.tolist(),
+            "segments": self.segments,
+            "metadata": self.metadata,
+        }
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("feature_names") != FEATURE_NAMES:
+            raise ValueError(f"{os.path.basename(path)} bu koddaki feature listesiyle uyuşmuyor; modeli yeniden eğitin")
+        return cls(data["mean"], data["scale"], data["centroids"], data["segments"], data.get("metadata"))
@@ -0,0 +1,355 @@
+"""
+Laptop Fiyat Tahmin API - gecikme ve throughput benchmark'ı
+
+Varsayılan olarak Flask uygulaması test client ile aynı süreçte çalıştırılır;
+--url / ML_BENCH_URL verilirse yerelde başlatılmış bir sunucu ölçülür
+(ör. `python api/serve.py`). Her senaryo için p50/p95/p99 gecikme ve
+istek/sn hesaplanır, sonuçlar JSON'a yazılır ve bir önceki çalıştırmanın
+JSON'u ile karşılaştırılabilir.
+
+Senaryolar:
+    cold            : yeni bir süreçte, ısınma kapalıyken (ML_WARM_UP=0) ilk /predict;
+                      import süresi ayrıca raporlanır (tek örnek, regresyon kontrolüne
+                      girmez). --url modunda sunucu zaten ısınmış olduğu için ölçülmez.
+    warm_repeat     : aynı girdi tekrar tekrar (cache / fiyat tablosu dostu)
+    warm_unique     : her istek farklı girdi (cache'e hiç isabet etmez)
+    batch_<N>       : /predict/batch, N kalemlik istekler
+
+Kullanım:
+    python -m pytest test_ml_api.py -q
+    python test_ml_api.py --output bench.json
+    python test_ml_api.py --url http://127.0.0.1:5000 --baseline bench.json --threshold 0.25
+
+Ortam değişkenleri (pytest için): ML_BENCH_URL, ML_BENCH_REQUESTS,
+ML_BENCH_OUTPUT, ML_BENCH_BASELINE, ML_BENCH_THRESHOLD
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.environ.get("ML_MODEL_DIR", os.path.join(BASE_DIR, "model"))
+
+BATCH_SIZES = [1, 10, 100, 1000]
+DEFAULT_REQUESTS = 200
+DEFAULT_THRESHOLD = 0.25
+
+# Regresyon kontrolünde karşılaştırılan metrikler (daha büyük = daha kötü)
+CHECKED_PERCENTILES = ("p50_ms", "p95_ms")
+
+BASE_PAYLOAD = {
+    "ram_gb": 16,
+    "ssd_gb": 512,
+    "islemci": "Intel Core i7-12700H",
+    "ekran_karti": "NVIDIA RTX 3060",
+    "marka": "Asus"
+}
+
+CPUS = ["Intel Core i5-1235U", "Intel Core i7-13620H", "AMD Ryzen 7 7735HS", "Apple M2", "i3-1115G4", "Ryzen 5 5500U"]
+GPUS = ["NVIDIA RTX 4060", "NVIDIA GTX 1650", "Intel Iris Xe", "AMD Radeon", "integrated", "RTX 3050"]
+BRANDS = ["Asus", "Lenovo", "HP", "Dell", "MSI", "Acer", "Apple", "Casper"]
+
+
+def unique_payloads(n, seed=42):
+    """Her biri farklı feature vektörüne düşen girdiler (RAM kesirli: cache/ızgara dışı)"""
+    rng = np.random.default_rng(seed)
+    return [{
+        "ram_gb": float(rng.choice([8, 16, 32])) + (i + 1) / (n + 1),
+        "ssd_gb": int(rng.choice([256, 512, 1024])),
+        "islemci": str(rng.choice(CPUS)),
+        "ekran_karti": str(rng.choice(GPUS)),
+        "marka": str(rng.choice(BRANDS))
+    } for i in range(n)]
+
+
+def model_available():
+    return os.path.exists(os.path.join(MODEL_DIR, "laptop_fiyat_model.lfm")) or (
+        os.path.exists(os.path.join(MODEL_DIR, "laptop_fiyat_model.pkl"))
+        and os.path.exists(os.path.join(MODEL_DIR, "label_encoders.pkl"))
+    )
+
+
+# -----------------------
+# İstemciler
+# -----------------------
+class InProcessClient:
+    """Flask test client: ağ yok, yalnızca uygulama + model maliyeti"""
+
+    mode = "in-process"
+
+    def __init__(self):
+        sys.path.insert(0, os.path.join(BASE_DIR, "api"))
+        import app as app_module
+        self.startup = getattr(app_module, "STARTUP", {})
+        self.client = app_module.app.test_client()
+
+    def post(self, path, payload):
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.get_json()
+
+
+class HttpClient:
+    """Çalışan bir sunucuya keep-alive bağlantı ile istek atar"""
+
+    mode = "http"
+
+    def __init__(self, url):
+        import requests
+
+        self.url = url.rstrip("/")
+        self.session = requests.Session()
+        self.startup = {}
+        try:
+            self.startup = self.session.get(self.url + "/health", timeout=10).json().get("startup", {})
+        except (requests.RequestException, ValueError):
+            pass
+
+    def post(self, path, payload):
+        response = self.session.post(self.url + path, json=payload, timeout=60)
+        return response.status_code, response.json()
+
+
+# -----------------------
+# Ölçüm
+# -----------------------
+def summarize(latencies, elapsed, items_per_request=1, errors=0):
+    """Gecikme listesinden (saniye) yüzdelik ve throughput özeti"""
+    ms = np.asarray(latencies) * 1000.0
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "mean_ms": round(float(ms.mean()), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "requests_per_sec": round(len(ms) / elapsed, 2) if elapsed > 0 else None,
+        "items_per_sec": round(len(ms) * items_per_request / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+# Soğuk ölçüm ayrı süreçte: bu süreçteki uygulama import sırasında warm_up() yapmış olur
+COLD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, "api")
+import app
+import_seconds = time.perf_counter() - started
+client = app.app.test_client()
+t = time.perf_counter()
+response = client.post("/predict", json=json.loads(sys.argv[1]))
+print(json.dumps({"status": response.status_code, "first_request_ms": (time.perf_counter() - t) * 1000.0,
+                  "import_seconds": import_seconds, "startup": app.STARTUP}))
+"""
+
+
+def measure_cold(payload):
+    """Yeni süreçte, warm_up() olmadan ilk /predict: (durum kodu, ms, import sn, STARTUP)"""
+    env = dict(os.environ, ML_WARM_UP="0", PYTHONIOENCODING="utf-8")
+    proc = subprocess.run(
+        [sys.executable, "-c", COLD_SCRIPT, json.dumps(payload)], cwd=BASE_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace",
+    )
+    lines = proc.stdout.strip().splitlines()
+    try:
+        result = json.loads(lines[-1])
+    except (IndexError, ValueError):
+        print(proc.stdout)
+        return 0, None, None, {}
+    return result["status"], result["first_request_ms"], result["import_seconds"], result["startup"]
+
+
+def run_scenario(client, path, payloads, items_per_request=1):
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for payload in payloads:
+        t = time.perf_counter()
+        status, _ = client.post(path, payload)
+        latencies.append(time.perf_counter() - t)
+        if status != 200:
+            errors += 1
+    return summarize(latencies, time.perf_counter() - started, items_per_request, errors)
+
+
+def run_benchmark(url=None, n_requests=DEFAULT_REQUESTS, batch_sizes=BATCH_SIZES):
+    """Tüm senaryoları çalıştır, JSON'a yazılabilir sonuç sözlüğü döner"""
+    # Soğuk: yeni süreçte ilk istek (cache boş, model ısıtılmamış, lazy import'lar yapılmamış)
+    if url:
+        status, cold_ms, import_seconds, startup = 200, None, None, {}
+    else:
+        status, cold_ms, import_seconds, startup = measure_cold(unique_payloads(1, seed=7)[0])
+
+    client = HttpClient(url) if url else InProcessClient()
+    scenarios = {
+        "cold": {
+            "requests": 0 if url else 1,
+            "errors": int(status != 200),
+            "first_request_ms": round(cold_ms, 4) if cold_ms is not None else None,
+            "import_seconds": round(import_seconds, 4) if import_seconds is not None else None,
+            "startup": startup or client.startup,
+        }
+    }
+
+    # Isınma: ilk toplu istek pandas'ı lazy import eder; ölçüme girmesin
+    client.post("/predict", BASE_PAYLOAD)
+    client.post("/predict/batch", [BASE_PAYLOAD])
+
+    scenarios["warm_repeat"] = run_scenario(client, "/predict", [BASE_PAYLOAD] * n_requests)
+    scenarios["warm_unique"] = run_scenario(client, "/predict", unique_payloads(n_requests))
+
+    for size in batch_sizes:
+        # Büyük batch'lerde istek sayısını azalt, toplam kalem sayısı makul kalsın
+        n_batches = max(5, min(n_requests, (n_requests * 10) // size))
+        items = unique_payloads(size * n_batches, seed=size)
+        payloads = [items[i * size:(i + 1) * size] for i in range(n_batches)]
+        scenarios[f"batch_{size}"] = run_scenario(client, "/predict/batch", payloads, items_per_request=size)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "mode": client.mode,
+            "url": url,
+            "requests_per_scenario": n_requests,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Önceki sonuçlara göre regresyonları listeler.
+    Gecikme yüzdelikleri baseline * (1 + threshold) üstüne, throughput
+    baseline / (1 + threshold) altına düşerse regresyon sayılır. cold atlanır.
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if name == "cold" or not old:
+            continue
+        for key in CHECKED_PERCENTILES:
+            if old.get(key) and result[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name}.{key}: {old[key]:.3f} -> {result[key]:.3f} ms")
+        if old.get("requests_per_sec") and result["requests_per_sec"] < old["requests_per_sec"] / (1 + threshold):
+            regressions.append(
+                f"{name}.requests_per_sec: {old['requests_per_sec']:.1f} -> {result['requests_per_sec']:.1f}"
+            )
+    return regressions
+
+
+def print_report(results):
+    print("\n" + "=" * 78)
+    print(f"⏱️ ML API BENCHMARK ({results['meta']['mode']})")
+    print("=" * 78)
+    cold = results["scenarios"]["cold"]
+    if cold["first_request_ms"] is None:
+        print("🧊 Soğuk ilk istek: ölçülmedi (--url: sunucu zaten ısınmış)")
+    else:
+        print(f"🧊 Soğuk ilk istek (yeni süreç, ısınma yok): {cold['first_request_ms']:.2f} ms"
+              + (f" | import: {cold['import_seconds'] * 1000:.0f} ms" if cold.get("import_seconds") else ""))
+    print(f"\n{'Senaryo':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'istek/sn':>12}{'kalem/sn':>12}{'hata':>6}")
+    for name, r in results["scenarios"].items():
+        if name == "cold":
+            continue
+        print(f"{name:<14}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+              f"{r['requests_per_sec']:>12.1f}{r['items_per_sec']:>12.1f}{r['errors']:>6}")
+    print("=" * 78)
+
+
+@lru_cache(maxsize=None)
+def _cached_results():
+    """pytest'te benchmark bir kez çalışır; testler aynı sonucu paylaşır"""
+    results = run_benchmark(
+        url=os.environ.get("ML_BENCH_URL"),
+        n_requests=int(os.environ.get("ML_BENCH_REQUESTS", DEFAULT_REQUESTS))
+    )
+    output = os.environ.get("ML_BENCH_OUTPUT")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    print_report(results)
+    return results
+
+
+def _require_target():
+    import pytest
+
+    if not os.environ.get("ML_BENCH_URL") and not model_available():
+        pytest.skip("Model dosyaları yok (önce `python train_model.py`)")
+
+
+# -----------------------
+# pytest
+# -----------------------
+def test_all_requests_succeed():
+    _require_target()
+    results = _cached_results()
+    failed = {name: r["errors"] for name, r in results["scenarios"].items() if r["errors"]}
+    assert not failed, f"Hatalı istekler: {failed}"
+
+
+def test_no_latency_regression():
+    _require_target()
+    baseline_path = os.environ.get("ML_BENCH_BASELINE")
+    if not baseline_path:
+        import pytest
+        pytest.skip("ML_BENCH_BASELINE verilmedi, karşılaştırma yapılmadı")
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    threshold = float(os.environ.get("ML_BENCH_THRESHOLD", DEFAULT_THRESHOLD))
+    regressions = compare(_cached_results(), baseline, threshold)
+    assert not regressions, "Performans regresyonu:\n  " + "\n  ".join(regressions)
+
+
+# -----------------------
+# Komut satırı
+# -----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ML API gecikme/throughput benchmark'ı")
+    parser.add_argument("--url", default=os.environ.get("ML_BENCH_URL"),
+                        help="çalışan sunucu (ör. http://127.0.0.1:5000); yoksa in-process")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="senaryo başına istek")
+    parser.add_argument("--output", help="sonuç JSON dosyası")
+    parser.add_argument("--baseline", help="karşılaştırılacak önceki sonuç JSON'u")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="izin verilen kötüleşme oranı (0.25 = %%25)")
+    args = parser.parse_args(argv)
+
+    if not args.url and not model_available():
+        print("⚠️ Model dosyaları bulunamadı, benchmark atlandı (önce `python train_model.py`)")
+        return 0
+
+    results = run_benchmark(url=args.url, n_requests=args.requests)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Sonuçlar kaydedildi: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ Performans regresyonu (eşik %{args.threshold * 100:.0f}):")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"✅ Regresyon yok (eşik %{args.threshold * 100:.0f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
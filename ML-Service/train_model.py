@@ -9,9 +9,17 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+import sklearn
 import joblib
 import os
-import re
+import sys
+import time
+from datetime import datetime
+
+from feature_parser import parse_cpu_series, parse_gpu_series
+from price_grid import PriceGrid, grid_axes, file_sha256
+from tree_ensemble import CompiledTreeEnsemble, verify_against
+from model_artifact import write_artifact
 
 print("=" * 70)
 print("🤖 LAPTOP FİYAT TAHMİN MODELİ - EĞİTİM (GERÇEK VERİ)")
@@ -64,125 +72,14 @@ data = data.dropna(subset=['Fiyat_Clean', 'RAM_Clean', 'Depolama_Clean', 'İşle
 print(f"   {initial_count - len(data)} satır silindi")
 print(f"   Kalan veri: {len(data)} satır")
 
-# CPU Tier çıkarma fonksiyonu
-def get_cpu_tier(cpu_str):
-    """CPU string'inden tier çıkar"""
-    if pd.isna(cpu_str):
-        return 5  # Default
-    
-    cpu_lower = str(cpu_str).lower()
-    
-    if 'i9' in cpu_lower or 'ryzen 9' in cpu_lower or 'ultra 9' in cpu_lower:
-        return 9
-    elif 'i7' in cpu_lower or 'ryzen 7' in cpu_lower or 'ultra 7' in cpu_lower:
-        return 7
-    elif 'i5' in cpu_lower or 'ryzen 5' in cpu_lower or 'ultra 5' in cpu_lower or 'm2' in cpu_lower or 'm3' in cpu_lower or 'm4' in cpu_lower:
-        return 5
-    elif 'i3' in cpu_lower or 'ryzen 3' in cpu_lower or 'm1' in cpu_lower:
-        return 3
-    elif 'celeron' in cpu_lower or 'pentium' in cpu_lower or 'n4020' in cpu_lower or 'n4120' in cpu_lower or 'n100' in cpu_lower or 'n150' in cpu_lower:
-        return 1
-    return 2  # Default
-
-# CPU Nesil çıkarma fonksiyonu
-def get_cpu_generation(cpu_str):
-    """CPU nesli çıkar (Intel için 10, 11, 12, 13, 14, 15 gibi)"""
-    if pd.isna(cpu_str):
-        return 10  # Default
-    
-    cpu_str = str(cpu_str)
-    
-    # Intel nesilleri (i7-12700H, i5-1335U gibi)
-    import re
-    
-    # Ultra serisi (155H, 258V gibi)
-    if 'ultra' in cpu_str.lower():
-        # Ultra 5, 7, 9 -> 15. nesil sayılır
-        return 15
-    
-    # Intel Core i3/i5/i7/i9 nesilleri
-    intel_match = re.search(r'[i]\d-(\d{1,2})\d{2,3}', cpu_str.lower())
-    if intel_match:
-        gen = int(intel_match.group(1))
-        return min(gen, 15)  # Max 15. nesil
-    
-    # AMD Ryzen nesilleri (Ryzen 5 5600H -> 5, Ryzen 7 7730U -> 7)
-    ryzen_match = re.search(r'ryzen\s+\d\s+(\d)', cpu_str.lower())
-    if ryzen_match:
-        gen = int(ryzen_match.group(1))
-        return gen
-    
-    # Apple M serisi (M1, M2, M3, M4)
-    if 'm1' in cpu_str.lower():
-        return 11
-    elif 'm2' in cpu_str.lower():
-        return 12
-    elif 'm3' in cpu_str.lower():
-        return 13
-    elif 'm4' in cpu_str.lower():
-        return 14
-    
-    # Celeron, Pentium -> eski nesil
-    if 'celeron' in cpu_str.lower() or 'pentium' in cpu_str.lower():
-        return 8
-    
-    return 10  # Default orta nesil
-
-# CPU Brand çıkarma fonksiyonu
-def get_cpu_brand(cpu_str):
-    """CPU markasını belirle"""
-    if pd.isna(cpu_str):
-        return 'Intel'
-    
-    cpu_lower = str(cpu_str).lower()
-    
-    if 'intel' in cpu_lower or 'core i' in cpu_lower or 'celeron' in cpu_lower or 'pentium' in cpu_lower or 'ultra' in cpu_lower:
-        return 'Intel'
-    elif 'amd' in cpu_lower or 'ryzen' in cpu_lower:
-        return 'AMD'
-    elif 'apple' in cpu_lower or 'm1' in cpu_lower or 'm2' in cpu_lower or 'm3' in cpu_lower or 'm4' in cpu_lower:
-        return 'Apple'
-    return 'Intel'  # Default
-
-# GPU Type çıkarma fonksiyonu
-def get_gpu_type(gpu_str):
-    """GPU tipini belirle"""
-    if pd.isna(gpu_str):
-        return 'Entegre'
-    
-    gpu_lower = str(gpu_str).lower()
-    
-    if 'rtx 50' in gpu_lower or 'rtx50' in gpu_lower or 'rtx 40' in gpu_lower or 'rtx40' in gpu_lower:
-        return 'RTX_Yeni'
-    elif 'rtx 30' in gpu_lower or 'rtx30' in gpu_lower:
-        return 'RTX_30'
-    elif 'rtx' in gpu_lower:
-        return 'RTX'
-    elif 'gtx' in gpu_lower:
-        return 'GTX'
-    elif 'nvidia' in gpu_lower or 'geforce' in gpu_lower:
-        return 'NVIDIA_Diger'
-    elif 'radeon rx' in gpu_lower:
-        return 'Radeon_RX'
-    elif 'radeon' in gpu_lower or 'amd radeon' in gpu_lower:
-        return 'Radeon'
-    elif 'apple' in gpu_lower:
-        return 'Apple_GPU'
-    elif 'iris' in gpu_lower or 'arc' in gpu_lower:
-        return 'Intel_Iris'
-    elif 'intel uhd' in gpu_lower or 'uhd' in gpu_lower:
-        return 'Intel_UHD'
-    elif 'entegre' in gpu_lower or 'integrated' in gpu_lower:
-        return 'Entegre'
-    
-    return 'Entegre'  # Default
-
 # Feature'ları çıkar
 print(f"\n🔧 Feature'lar çıkarılıyor...")
-data['CPU_Seviye'] = data['İşlemci'].apply(get_cpu_tier)
-data['CPU_Nesil'] = data['İşlemci'].apply(get_cpu_generation)
-data['CPU_Marka'] = data['İşlemci'].apply(get_cpu_brand)
-data['GPU_Tipi'] = data['Ekran Kartı'].apply(get_gpu_type)
+# CPU/GPU kuralları api/app.py ile ortak: feature_parser.py
+cpu_features = parse_cpu_series(data['İşlemci'])
+data['CPU_Seviye'] = cpu_features['CPU_Seviye']
+data['CPU_Nesil'] = cpu_features['CPU_Nesil']
+data['CPU_Marka'] = cpu_features['CPU_Marka']
+data['GPU_Tipi'] = parse_gpu_series(data['Ekran Kartı'])
 data['Laptop_Marka'] = data['Marka'].fillna('Diğer')  # Marka bilgisi
 
 print(f"\n📊 CPU Tier dağılımı:")
@@ -304,12 +201,61 @@ os.makedirs(model_dir, exist_ok=True)
 model_path = os.path.join(model_dir, "laptop_fiyat_model.pkl")
 encoders_path = os.path.join(model_dir, "label_encoders.pkl")
 
-joblib.dump(model, model_path)
-joblib.dump(label_encoders, encoders_path)
+# Geçici dosyaya yaz + os.replace: çalışan API (dosya izleme/yenileme) yarım
+# yazılmış bir dosyayı asla görmez
+for obj, path in ((label_encoders, encoders_path), (model, model_path)):
+    joblib.dump(obj, path + ".tmp")
+    os.replace(path + ".tmp", path)
 
 print(f"✅ Model kaydedildi: {model_path}")
 print(f"✅ Encoders kaydedildi: {encoders_path}")
 
+# Tek dosyalık artefakt: API bunu pandas/sklearn/joblib olmadan mmap ile açar
+artifact_path = os.path.join(model_dir, "laptop_fiyat_model.lfm")
+engine = CompiledTreeEnsemble.from_sklearn(model)
+if verify_against(model, engine):
+    checksum = write_artifact(
+        artifact_path,
+        engine,
+        feature_columns,
+        {col: encoder.classes_ for col, encoder in label_encoders.items()},
+        metadata={
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+            "model_sha256": file_sha256(model_path),
+            "sklearn_version": sklearn.__version__,
+            "n_estimators": model.n_estimators,
+            "learning_rate": model.learning_rate,
+            "train_samples": int(X_train.shape[0]),
+            "test_samples": int(X_test.shape[0]),
+            "test_mae": float(test_mae),
+            "test_rmse": float(test_rmse),
+            "test_r2": float(test_r2),
+        }
+    )
+    print(f"✅ Artefakt kaydedildi: {artifact_path} (sha256 {checksum[:12]}, "
+          f"{os.path.getsize(artifact_path) / 1e3:.1f} KB)")
+else:
+    print("⚠️ Derlenmiş model model.predict ile eşleşmedi, artefakt yazılmadı")
+    # Eski artefakt kalırsa API yeni pickle yerine onu yüklerdi
+    if os.path.exists(artifact_path):
+        os.remove(artifact_path)
+
+# Tam ızgara fiyat tablosu (opsiyonel): python train_model.py --price-grid
+# api/app.py ML_PRICE_GRID=1 ile bu tabloyu mmap ile açıp O(1) cevap verir
+if "--price-grid" in sys.argv or os.environ.get("ML_PRICE_GRID") == "1":
+    print("\n🧮 Tam ızgara fiyat tablosu hesaplanıyor...")
+    start = time.perf_counter()
+    grid = PriceGrid.build(
+        feature_columns,
+        grid_axes({col: enc.classes_ for col, enc in label_encoders.items()}, df['RAM'].unique(), df['Depolama'].unique()),
+        lambda X_grid: model.predict(pd.DataFrame(X_grid, columns=feature_columns)),
+        meta={"model_sha256": file_sha256(model_path)}
+    )
+    grid_path = os.path.join(model_dir, "price_grid")
+    grid.save(grid_path)
+    print(f"✅ Fiyat tablosu kaydedildi: {grid_path}.json "
+          f"({grid.n_cells:,} hücre, {grid.table.nbytes / 1e6:.1f} MB, {time.perf_counter() - start:.1f} sn)")
+
 # Test tahminleri
 print("\n" + "="*70)
 print("🧪 ÖRNEK TAHMİNLER")
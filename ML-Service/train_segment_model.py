@@ -0,0 +1,153 @@
+"""
+Müşteri segment modeli eğitimi (KMeans, RFM tarzı feature'lar)
+
+Gerçek müşteri verisi yoksa sentetik bir müşteri tabanı üretilir. Merkezler
+eğitimde bir kez hesaplanır ve isimlendirilir; servis ve toplu CLI yalnızca
+en yakın merkezi bulur.
+
+Kullanım:
+    python train_segment_model.py
+    python train_segment_model.py --csv veriler/musteriler.csv --clusters 5
+    python train_segment_model.py --write-customers veriler/musteriler.csv   (sentetik veriyi de kaydet)
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+from sklearn.cluster import KMeans
+
+from segment_model import FEATURE_NAMES, SEGMENT_MODEL_FILE, SegmentModel, raw_matrix
+from segment_customers import read_chunks
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "model", SEGMENT_MODEL_FILE)
+
+# Sentetik müşteri tipleri: (oran, ortalama harcama, sipariş, son siparişten gün, hesap yaşı)
+ARCHETYPES = [
+    (0.08, 60000, 25, 10, 1500),   # yüksek harcama, sık
+    (0.22, 15000, 10, 30, 900),    # düzenli
+    (0.20, 4000, 1.5, 15, 30),     # yeni
+    (0.20, 12000, 6, 150, 800),    # uzun süredir gelmeyen
+    (0.30, 2500, 1.5, 500, 1000),  # kaybedilmiş
+]
+
+# İsimlendirme sırası: her adımda kalan merkezlerden ölçüte en uyan seçilir
+SEGMENT_RULES = [
+    ("VIP", "log_total_spent", max),
+    ("Kayıp", "log_recency_days", max),
+    ("Yeni", "log_tenure_days", min),
+    ("Risk Altında", "log_recency_days", max),
+    ("Sadık", "log_order_count", max),
+]
+
+
+def synthetic_customers(n=100000, seed=42):
+    """(customer_id, total_spent, order_count, days_since_last_order, account_age_days) dizileri"""
+    rng = np.random.default_rng(seed)
+    shares = np.array([a[0] for a in ARCHETYPES])
+    kind = rng.choice(len(ARCHETYPES), size=n, p=shares / shares.sum())
+    params = np.array([a[1:] for a in ARCHETYPES])[kind]
+    orders = np.maximum(1, rng.poisson(params[:, 1]))
+    spent = np.round(params[:, 0] * rng.lognormal(0, 0.4, n) * orders / params[:, 1], 2)
+    recency = np.round(params[:, 2] * rng.lognormal(0, 0.5, n))
+    tenure = np.maximum(recency, np.round(params[:, 3] * rng.lognormal(0, 0.3, n)))
+    return np.arange(1, n + 1), spent, orders, recency, tenure
+
+
+def write_customers(path, columns):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["customer_id", "total_spent", "order_count", "days_since_last_order", "account_age_days"])
+        writer.writerows(zip(*(c.tolist() for c in columns)))
+
+
+def name_segments(centroids_raw):
+    """Merkezleri (log ölçeğinde) SEGMENT_RULES'a göre isimlendir"""
+    names = [None] * len(centroids_raw)
+    remaining = list(range(len(centroids_raw)))
+    for name, feature, pick in SEGMENT_RULES:
+        if not remaining:
+            break
+        j = FEATURE_NAMES.index(feature)
+        chosen = pick(remaining, key=lambda i: centroids_raw[i][j])
+        names[chosen] = name
+        remaining.remove(chosen)
+    for n, i in enumerate(remaining, start=1):
+        names[i] = f"Segment {n}"
+    return names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Müşteri segment modeli eğitimi")
+    parser.add_argument("--csv", help="müşteri CSV'si (total_spent, order_count, days_since_last_order, account_age_days)")
+    parser.add_argument("--samples", type=int, default=100000, help="sentetik müşteri sayısı")
+    parser.add_argument("--clusters", type=int, default=len(SEGMENT_RULES))
+    parser.add_argument("--write-customers", help="sentetik müşterileri bu CSV'ye de yaz")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("👥 MÜŞTERİ SEGMENT MODELİ - EĞİTİM (KMEANS)")
+    print("=" * 70)
+
+    if args.csv:
+        with open(args.csv, encoding="utf-8", newline="") as f:
+            X = np.vstack([X for _, _, X in read_chunks(f)])
+        source = f"csv:{os.path.basename(args.csv)}"
+    else:
+        print("ℹ️ Müşteri verisi verilmedi, sentetik müşteriler üretiliyor...")
+        columns = synthetic_customers(args.samples)
+        X = raw_matrix(*columns[1:])
+        source = "synthetic"
+        if args.write_customers:
+            write_customers(args.write_customers, columns)
+            print(f"💾 Sentetik müşteriler: {args.write_customers}")
+    print(f"✅ {len(X):,} müşteri")
+
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = (X - mean) / scale
+
+    print(f"\n🎯 KMeans eğitiliyor (k={args.clusters})...")
+    start = time.perf_counter()
+    kmeans = KMeans(n_clusters=args.clusters, n_init=10, random_state=42).fit(Z)
+    print(f"✅ Eğitim tamamlandı: {time.perf_counter() - start:.2f} sn")
+
+    centroids_raw = kmeans.cluster_centers_ * scale + mean
+    segments = name_segments(centroids_raw)
+    model = SegmentModel(mean, scale, kmeans.cluster_centers_, segments, metadata={
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "samples": int(len(X)),
+        "inertia": round(float(kmeans.inertia_), 2),
+    })
+
+    # Vektörel atama sklearn ile aynı olmalı
+    labels, confidence = model.assign(X)
+    agreement = float((labels == kmeans.labels_).mean())
+    if agreement < 0.999:
+        print(f"❌ HATA: Atama sklearn ile uyuşmuyor (%{agreement * 100:.2f}), kaydedilmedi")
+        return 1
+
+    print("\n📊 Segmentler (merkez değerleri):")
+    print(f"   {'Segment':<14}{'Oran':>7}{'Harcama':>10}{'Sipariş':>9}{'Son sip.':>10}{'Hesap':>8}")
+    for i, name in enumerate(segments):
+        spent, orders, _, recency, tenure = np.expm1(centroids_raw[i])
+        share = (labels == i).mean() * 100
+        print(f"   {name:<14}{share:>6.1f}%{spent:>10.0f}{orders:>9.1f}{recency:>9.0f}g{tenure:>7.0f}g")
+    print(f"   Ortalama güven: {confidence.mean():.3f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    model.save(args.output)
+    print(f"\n💾 Model kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Derlenmiş ağaç topluluğu (tree ensemble) değerlendiricisi.
+
+GradientBoostingRegressor'ın tüm ağaçları yükleme anında düz NumPy
+dizilerine (feature, threshold, left, right, value) çevrilir. Tahmin
+sırasında pandas / sklearn doğrulaması yoktur; tüm ağaçlar aynı anda,
+derinlik sayısı kadar vektörel adımda gezilir.
+
+Sonuçlar sklearn ile bit düzeyinde aynıdır:
+  - X, sklearn'deki gibi float32'ye çevrilip float64 eşiklerle karşılaştırılır
+  - yaprak değeri learning_rate * value olarak hesaplanır
+  - ağaç katkıları init değerine ağaç sırasıyla tek tek eklenir (cumsum)
+"""
+
+import numpy as np
+
+# Büyük batch'lerde (satır x ağaç) ara dizilerin boyutunu sınırlar
+CHUNK_SIZE = 2048
+
+
+class CompiledTreeEnsemble:
+    """Düz dizilerle temsil edilen regresyon ağaçları topluluğu"""
+
+    ARRAY_NAMES = ("feature", "threshold", "left", "right", "value", "roots")
+
+    def __init__(self, feature, threshold, left, right, value, roots, base_value, max_depth, n_features):
+        self.feature = np.ascontiguousarray(feature, dtype=np.intp)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.intp)
+        self.right = np.ascontiguousarray(right, dtype=np.intp)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.roots = np.ascontiguousarray(roots, dtype=np.intp)
+        self.base_value = float(base_value)
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Eğitilmiş GradientBoostingRegressor'dan düz diziler üret"""
+        estimators = getattr(model, "estimators_", None)
+        if estimators is None or estimators.ndim != 2 or estimators.shape[1] != 1:
+            raise ValueError("Yalnızca tek çıktılı GradientBoostingRegressor desteklenir")
+
+        init = model.init_
+        if isinstance(init, str) and init == "zero":
+            base_value = 0.0
+        elif hasattr(init, "constant_"):
+            base_value = float(np.asarray(init.constant_, dtype=np.float64).ravel()[0])
+        else:
+            raise ValueError(f"Desteklenmeyen init estimator: {type(init).__name__}")
+
+        scale = float(model.learning_rate)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators[:, 0]:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Yapraklar kendilerine döner; böylece tüm ağaçlar aynı sayıda adımda gezilir
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(scale * tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots),
+            base_value=base_value,
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays, base_value, max_depth, n_features):
+        """to_arrays() çıktısından (ör. kaydedilmiş buffer'lardan) geri yükle"""
+        return cls(base_value=base_value, max_depth=max_depth, n_features=n_features,
+                   **{name: arrays[name] for name in cls.ARRAY_NAMES})
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def predict(self, X):
+        """(n_samples, n_features) matris için tahmin"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"X {X.shape[1]} feature içeriyor, model {self.n_features} bekliyor")
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity")
+
+        if len(X) <= CHUNK_SIZE:
+            return self._predict_chunk(X)
+        return np.concatenate([
+            self._predict_chunk(X[start:start + CHUNK_SIZE])
+            for start in range(0, len(X), CHUNK_SIZE)
+        ])
+
+    def predict_one(self, row):
+        """Tek satır tahmin (float döner)"""
+        return float(self.predict(row)[0])
+
+    def _predict_chunk(self, X):
+        n_samples = len(X)
+        rows = np.arange(n_samples)[:, None]
+        node = np.broadcast_to(self.roots, (n_samples, self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        # sklearn'deki sırayla: init + ağaç_1 + ağaç_2 + ... (soldan sağa toplama)
+        contributions = np.empty((n_samples, self.n_trees + 1), dtype=np.float64)
+        contributions[:, 0] = self.base_value
+        contributions[:, 1:] = self.value[node]
+        return np.cumsum(contributions, axis=1)[:, -1]
+
+
+def verify_against(model, engine, n_samples=2000, seed=42):
+    """
+    Derlenmiş modeli sklearn model.predict ile karşılaştır.
+    Test satırları ağaç eşiklerinin hemen altı / üstü ve aralarından seçilir;
+    sonuçlar bit düzeyinde aynı değilse False döner.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.empty((n_samples, engine.n_features), dtype=np.float64)
+    split_nodes = np.isfinite(engine.threshold)
+    for f in range(engine.n_features):
+        cuts = np.unique(engine.threshold[split_nodes & (engine.feature == f)])
+        if len(cuts) == 0:
+            X[:, f] = rng.normal(size=n_samples)
+            continue
+        candidates = np.concatenate([
+            np.nextafter(cuts, -np.inf), cuts, np.nextafter(cuts, np.inf),
+            np.floor(cuts), np.ceil(cuts), [cuts[0] - 1, cuts[-1] + 1],
+        ])
+        X[:, f] = rng.choice(candidates, size=n_samples)
+
+    if hasattr(model, "feature_names_in_"):
+        import pandas as pd
+        expected = model.predict(pd.DataFrame(X, columns=model.feature_names_in_))
+    else:
+        expected = model.predict(X)
+
+    return bool(np.array_equal(engine.predict(X), expected))
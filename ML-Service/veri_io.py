@@ -0,0 +1,180 @@
+"""
+Aşamalar arası ara dosyalar (veriler/birlesik/*) için tek okuma/yazma noktası.
+
+Her aşama CSV yazıp bir sonraki aşama yeniden parse ettiğinde tipler her
+adımda yeniden tahmin ediliyor. Burada ara dosyalar tipli, kolon bazlı bir
+biçimde tutulur:
+
+    feather  Arrow IPC, sıkıştırmasız → bellek eşlemeli (mmap) okunur
+    parquet  sıkıştırılmış, daha küçük; mmap ile okunur
+    csv      eski davranış (pyarrow yoksa otomatik seçilir)
+
+Ayarlar ortam değişkeniyle:
+    ML_ARA_BICIM=feather|parquet|csv   (varsayılan: pyarrow varsa feather)
+    ML_CSV_DISA_AKTAR=1                kolon bazlı dosyanın yanına insanlar
+                                       için eski biçimde .csv de yaz
+
+Okurken önce seçili biçimdeki dosya, yoksa diğer kolon bazlı dosyaların en
+yenisi okunur. CSV kolon bazlı biçimlerde yalnızca dışa aktarımdır; yalnızca
+kolon bazlı dosya yoksa (ya da biçim csv ise) okunur.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+    import pyarrow.parquet as parquet
+except ImportError:  # pragma: no cover - pyarrow opsiyonel
+    pyarrow = None
+
+ARA_KLASOR = Path("veriler/birlesik")
+
+UZANTILAR = {"feather": ".feather", "parquet": ".parquet", "csv": ".csv"}
+
+# Eski CSV biçimleri (dışa aktarım ve CSV okuma aynı ayarları kullanır)
+CSV_VARSAYILAN = {"sep": ",", "encoding": "utf-8-sig"}
+CSV_AYARLARI = {
+    "laptops_sayisal_donusum": {"sep": ";", "encoding": "utf-8"},
+}
+
+
+def bicim():
+    secim = os.environ.get("ML_ARA_BICIM", "").strip().lower()
+    if not secim:
+        return "feather" if pyarrow is not None else "csv"
+    if secim not in UZANTILAR:
+        raise ValueError(f"❌ Geçersiz ML_ARA_BICIM: {secim} (feather, parquet, csv)")
+    if secim != "csv" and pyarrow is None:
+        print(f"⚠️ {secim} için pyarrow gerekli, CSV kullanılıyor (pip install pyarrow)")
+        return "csv"
+    return secim
+
+
+def csv_disa_aktar():
+    return os.environ.get("ML_CSV_DISA_AKTAR", "").strip().lower() in ("1", "true", "evet")
+
+
+def ayar_ozeti():
+    """Çıktıyı etkileyen ayarlar (pipeline.py önbellek anahtarına ekler)"""
+    return f"bicim={bicim()} csv={int(csv_disa_aktar())}"
+
+
+def ara_yol(ad, bicim_adi=None, klasor=ARA_KLASOR):
+    return Path(klasor) / f"{ad}{UZANTILAR[bicim_adi or bicim()]}"
+
+
+def _csv_yaz(df, yol, ad):
+    ayar = CSV_AYARLARI.get(ad, CSV_VARSAYILAN)
+    df.to_csv(yol, index=False, sep=ayar["sep"], encoding=ayar["encoding"])
+
+
+def yaz(df, ad, klasor=ARA_KLASOR):
+    """Ara tabloyu seçili biçimde yaz; yazılan yolu döndür"""
+    Path(klasor).mkdir(parents=True, exist_ok=True)
+    secim = bicim()
+    yol = ara_yol(ad, secim, klasor)
+
+    if secim != "csv":
+        # Arrow varsayılan (0..n-1) index ister; CSV de index'i yazmıyordu
+        tablo = df.reset_index(drop=True)
+        try:
+            if secim == "feather":
+                tablo.to_feather(yol, compression="uncompressed")
+            else:
+                tablo.to_parquet(yol, index=False)
+        except (pyarrow.ArrowException, TypeError, ValueError) as e:
+            # Karışık tipli object kolonlar Arrow'a çevrilemeyebilir
+            print(f"⚠️ {ad} {secim} olarak yazılamadı ({e}), CSV'ye düşülüyor")
+            secim, yol = "csv", ara_yol(ad, "csv", klasor)
+
+    if secim == "csv" or csv_disa_aktar():
+        _csv_yaz(df, ara_yol(ad, "csv", klasor), ad)
+
+    return yol
+
+
+def _arrow_semasi(df):
+    sema = pyarrow.Schema.from_pandas(df, preserve_index=False)
+    # Tamamı boş object kolon "null" tipine düşer; sonraki parçalarda metin gelebilir
+    alanlar = [pyarrow.field(a.name, pyarrow.string()) if pyarrow.types.is_null(a.type) else a for a in sema]
+    return pyarrow.schema(alanlar, metadata=sema.metadata)
+
+
+def parca_parca_yaz(parcalar, ad, klasor=ARA_KLASOR):
+    """
+    Aynı kolonlu DataFrame parçalarını sırayla tek ara tabloya yaz (akış modu).
+    Bellekte aynı anda yalnızca bir parça bulunur; sayısal kolonların tipi
+    parçalar arasında aynı olmalı (ör. hepsi float64). Yarım kalan yazım
+    eski dosyanın yerine geçmez.
+    """
+    Path(klasor).mkdir(parents=True, exist_ok=True)
+    secim = bicim()
+    hedefler = [] if secim == "csv" else [ara_yol(ad, secim, klasor)]
+    if secim == "csv" or csv_disa_aktar():
+        hedefler.append(ara_yol(ad, "csv", klasor))
+    gecici = {y: y.with_name(y.name + ".yaziliyor") for y in hedefler}
+    ayar = CSV_AYARLARI.get(ad, CSV_VARSAYILAN)
+
+    yazici = sema = None
+    try:
+        for i, parca in enumerate(parcalar):
+            parca = parca.reset_index(drop=True)
+            if secim != "csv":
+                if yazici is None:
+                    sema = _arrow_semasi(parca)
+                    # Feather V2 = Arrow IPC dosyası (sıkıştırmasız, yaz() ile aynı)
+                    yol = str(gecici[hedefler[0]])
+                    yazici = pyarrow.ipc.new_file(yol, sema) if secim == "feather" else parquet.ParquetWriter(yol, sema)
+                yazici.write_table(pyarrow.Table.from_pandas(parca, schema=sema, preserve_index=False))
+            if hedefler[-1].suffix == ".csv":
+                # BOM yalnızca dosya başında
+                parca.to_csv(gecici[hedefler[-1]], index=False, sep=ayar["sep"], header=i == 0,
+                             mode="w" if i == 0 else "a", encoding=ayar["encoding"] if i == 0 else "utf-8")
+        if yazici is not None:
+            yazici.close()
+            yazici = None
+        for yol in hedefler:
+            gecici[yol].replace(yol)
+    finally:
+        if yazici is not None:
+            yazici.close()
+        for yol in gecici.values():
+            yol.unlink(missing_ok=True)
+
+    return hedefler[0]
+
+
+def bul(ad, klasor=ARA_KLASOR):
+    """Okunacak ara dosya: seçili biçim > diğer kolon bazlı (en yenisi) > CSV (yoksa None)"""
+    secili = ara_yol(ad, bicim(), klasor)
+    if secili.exists():
+        return secili
+    if pyarrow is not None:
+        # --csv dışa aktarımı aynı anda yazılır; kolon bazlı dosya varken CSV okunmaz
+        kolon_bazli = [ara_yol(ad, b, klasor) for b in UZANTILAR if b != "csv"]
+        mevcut = [y for y in kolon_bazli if y.exists()]
+        if mevcut:
+            return max(mevcut, key=lambda y: y.stat().st_mtime_ns)
+    csv_yolu = ara_yol(ad, "csv", klasor)
+    return csv_yolu if csv_yolu.exists() else None
+
+
+def oku(ad, klasor=ARA_KLASOR):
+    """Ara tabloyu oku; feather/parquet bellek eşlemeli açılır"""
+    yol = bul(ad, klasor)
+    if yol is None:
+        raise FileNotFoundError(f"❌ Ara dosya bulunamadı: {ara_yol(ad, 'csv', klasor).with_suffix('.*')}")
+
+    if yol.suffix == ".feather":
+        # Sıkıştırmasız IPC: sayısal kolonlar mmap'ten kopyasız gelir
+        return feather.read_table(yol, memory_map=True).to_pandas(split_blocks=True)
+    if yol.suffix == ".parquet":
+        return parquet.read_table(yol, memory_map=True).to_pandas(split_blocks=True)
+
+    ayar = CSV_AYARLARI.get(ad, CSV_VARSAYILAN)
+    return pd.read_csv(yol, sep=ayar["sep"])
@@ -0,0 +1,210 @@
+"""
+Yakın kopya (near-duplicate) başlık tespiti: belirteç kümeleri + MinHash/LSH.
+
+03_duplicate_temizleme yalnızca normalize edilmiş adı birebir aynı olan
+satırları birleştiriyordu; renk eki, pazar yeri gürültüsü ("...En Ucuz
+27.062,07 TL+5 FİYATÜrüne Git 50+ alarm") veya kelime sırası farklı olan
+başlıklar kalıyordu. Burada:
+
+1. Her başlık gürültüden arındırılıp kelime (belirteç) kümesine çevrilir.
+   Küme olduğu için kelime sırası önemsizdir.
+2. Her küme için k izinli MinHash imzası hesaplanır (numpy, blok blok).
+3. İmza b banda × r satıra bölünür; herhangi bir bandı aynı olan başlıklar
+   aday çift olur (LSH). Bu adım O(n) kovalama yapar, O(n²) karşılaştırma yok.
+4. Aday çiftler gerçek Jaccard benzerliğiyle doğrulanır (>= eşik). Ayrıca
+   rakam içeren belirteçler ("16gb", "i5-13420h", "83k1003mtr") birebir aynı
+   olmalıdır; böylece farklı RAM/SSD/işlemci/SKU'lar birleşmez.
+5. Doğrulanan çiftlerin bağlı bileşenleri kümeleri verir.
+"""
+
+import re
+import zlib
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+VARSAYILAN_ESIK = 0.8
+IZIN_SAYISI = 128
+TOHUM = 42
+KOVA_SINIRI = 50  # bundan büyük LSH kovalarında tüm çiftler yerine yıldız + zincir karşılaştırılır
+BLOK_BELIRTEC = 200_000  # imza hesabında bir seferde işlenen (başlık, belirteç) çifti
+
+_ASAL = np.uint64((1 << 31) - 1)
+
+# Pazar yeri eki: "NotebookEn Ucuz27.062,07 TL+5 FİYATÜrüne Git (+5)50+ alarm"
+GURULTU = re.compile(r"En Ucuz.*$", re.S)
+NOKTALAMA = re.compile(r"[^\w\s\-\.]")
+BIRIM = re.compile(r"(\d+)\s*(gb|tb)\b")
+RAKAM = re.compile(r"\d")
+
+
+def belirtecler(baslik):
+    """Başlığın gürültüsüz, küçük harfli kelime kümesi ("16 GB" -> "16gb")"""
+    s = GURULTU.sub("", str(baslik)).lower()
+    s = NOKTALAMA.sub(" ", s)
+    s = BIRIM.sub(r"\1\2", s)
+    return frozenset(t.strip(".-") for t in s.split() if t.strip(".-"))
+
+
+def sayisal_belirtecler(kume):
+    return frozenset(t for t in kume if RAKAM.search(t))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def bant_sec(esik, izin_sayisi=IZIN_SAYISI, yanlis_negatif_agirligi=0.8):
+    """
+    Eşiğe göre (bant, satır) seç: aday olma olasılığı 1-(1-s^r)^b eğrisinin
+    eşik altındaki alanı (yanlış pozitif) ve üstündeki eksiği (yanlış negatif)
+    ağırlıklı en aza indirilir. Adaylar zaten doğrulandığı için yanlış
+    negatif daha pahalıdır.
+    """
+    s, ds = np.linspace(0.0, 1.0, 201, retstep=True)
+    alt = s < esik
+    en_iyi, en_iyi_maliyet = (1, izin_sayisi), np.inf
+    for bant in range(1, izin_sayisi + 1):
+        for satir in range(1, izin_sayisi // bant + 1):
+            olasilik = 1.0 - (1.0 - s ** satir) ** bant
+            yp = olasilik[alt].sum() * ds
+            yn = (1.0 - olasilik[~alt]).sum() * ds
+            maliyet = (1 - yanlis_negatif_agirligi) * yp + yanlis_negatif_agirligi * yn
+            if maliyet < en_iyi_maliyet:
+                en_iyi, en_iyi_maliyet = (bant, satir), maliyet
+    return en_iyi
+
+
+def minhash_imzalari(kumeler, izin_sayisi=IZIN_SAYISI, tohum=TOHUM):
+    """(n, izin_sayisi) uint32 imza matrisi; boş kümeler için tüm değerler en büyük değer"""
+    rng = np.random.default_rng(tohum)
+    a = rng.integers(1, int(_ASAL), izin_sayisi, dtype=np.uint64)
+    b = rng.integers(0, int(_ASAL), izin_sayisi, dtype=np.uint64)
+
+    # Belirteç -> kararlı 32 bit hash (Python hash() süreçten sürece değişir)
+    sozluk = {}
+    belge, belirtec = [], []
+    for i, kume in enumerate(kumeler):
+        for t in kume:
+            if t not in sozluk:
+                sozluk[t] = zlib.crc32(t.encode("utf-8"))
+            belge.append(i)
+            belirtec.append(sozluk[t])
+    belge = np.asarray(belge, dtype=np.int64)
+    degerler = np.asarray(belirtec, dtype=np.uint64) % _ASAL
+
+    imzalar = np.full((len(kumeler), izin_sayisi), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if len(belge) == 0:
+        return imzalar
+
+    # belge dizisi artan sırada; blokları belge sınırında kes
+    baslangic = 0
+    while baslangic < len(belge):
+        bitis = min(baslangic + BLOK_BELIRTEC, len(belge))
+        if bitis < len(belge):
+            bitis = int(np.searchsorted(belge, belge[bitis], side="left"))
+            if bitis <= baslangic:  # tek başlık bloktan uzunsa
+                bitis = int(np.searchsorted(belge, belge[baslangic], side="right"))
+        blok_belge = belge[baslangic:bitis]
+        hashler = (degerler[baslangic:bitis, None] * a + b) % _ASAL
+        sinirlar = np.flatnonzero(np.r_[True, blok_belge[1:] != blok_belge[:-1]])
+        imzalar[blok_belge[sinirlar]] = np.minimum.reduceat(hashler, sinirlar, axis=0).astype(np.uint32)
+        baslangic = bitis
+    return imzalar
+
+
+def aday_ciftler(imzalar, bant, satir, gecerli=None):
+    """LSH: en az bir bandı aynı olan (i, j), i < j çiftleri (tekrarsız)"""
+    n = len(imzalar)
+    indeksler = np.arange(n) if gecerli is None else np.flatnonzero(gecerli)
+    kodlar = []
+    for k in range(bant):
+        parcalar = []
+        blok = np.ascontiguousarray(imzalar[indeksler, k * satir:(k + 1) * satir])
+        anahtar = blok.view(np.dtype((np.void, blok.dtype.itemsize * satir))).ravel()
+        _, kova, sayilar = np.unique(anahtar, return_inverse=True, return_counts=True)
+        coklu = sayilar[kova] > 1
+        if not coklu.any():
+            continue
+        uyeler = indeksler[coklu]
+        kova = kova[coklu]
+        sira = np.argsort(kova, kind="stable")
+        uyeler, kova = uyeler[sira], kova[sira]
+        sinirlar = np.flatnonzero(np.r_[True, kova[1:] != kova[:-1], True])
+        for bas, son in zip(sinirlar[:-1], sinirlar[1:]):
+            grup = uyeler[bas:son]
+            if len(grup) > KOVA_SINIRI:
+                # Yoğun kova: ilk üyeyle herkes + ardışık üyeler (O(m), çiftler O(m²) değil)
+                parcalar.append(np.column_stack([np.repeat(grup[0], len(grup) - 1), grup[1:]]))
+                parcalar.append(np.column_stack([grup[1:-1], grup[2:]]))
+            else:
+                i, j = np.triu_indices(len(grup), k=1)
+                parcalar.append(np.column_stack([grup[i], grup[j]]))
+        ciftler = np.sort(np.concatenate(parcalar), axis=1).astype(np.int64)
+        # Bant bant tekrarsızlaştır: bellek aday sayısıyla sınırlı kalsın
+        kodlar.append(_tekil(ciftler[:, 0] * n + ciftler[:, 1]))
+    if not kodlar:
+        return np.empty((0, 2), dtype=np.int64)
+    kodlar = _tekil(np.concatenate(kodlar))
+    return np.column_stack([kodlar // n, kodlar % n])
+
+
+def _tekil(kodlar):
+    # np.unique'in hash tabanlı yolu büyük int64 dizilerinde sıralamadan yavaş
+    kodlar = np.sort(kodlar)
+    return kodlar[np.r_[True, kodlar[1:] != kodlar[:-1]]]
+
+
+def kumele(basliklar, esik=VARSAYILAN_ESIK, izin_sayisi=IZIN_SAYISI, tohum=TOHUM):
+    """
+    Başlıkları yakın kopya kümelerine ayır.
+
+    (etiketler, ciftler) döner: etiketler[i] başlığın küme numarası; ciftler
+    doğrulanan (i, j, benzerlik) üçlüleri (belirteç kümesi aynı olanlar hariç).
+    """
+    n = len(basliklar)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), []
+
+    # Belirteç kümesi aynı olan başlıklar (ör. yalnızca fiyat gürültüsü farklı) zaten aynı kümede:
+    # LSH yalnızca farklı kümeler üzerinde çalışır, temsilci = ilk görülen başlık
+    sira, kumeler, temsilci = {}, [], []
+    ilk = np.empty(n, dtype=np.int64)
+    for k, baslik in enumerate(basliklar):
+        kume = belirtecler(baslik)
+        if kume not in sira:
+            sira[kume] = len(kumeler)
+            kumeler.append(kume)
+            temsilci.append(k)
+        ilk[k] = sira[kume]
+    m = len(kumeler)
+
+    bant, satir = bant_sec(esik, izin_sayisi)
+    imzalar = minhash_imzalari(kumeler, bant * satir, tohum)
+    adaylar = aday_ciftler(imzalar, bant, satir, gecerli=np.array([bool(k) for k in kumeler]))
+
+    sayisal = {}
+    ciftler = []
+    for i, j in adaylar:
+        a, b = kumeler[i], kumeler[j]
+        if i not in sayisal:
+            sayisal[i] = sayisal_belirtecler(a)
+        if j not in sayisal:
+            sayisal[j] = sayisal_belirtecler(b)
+        if sayisal[i] != sayisal[j]:
+            continue
+        benzerlik = jaccard(a, b)
+        if benzerlik >= esik:
+            ciftler.append((int(i), int(j), benzerlik))
+
+    if ciftler:
+        i, j, _ = zip(*ciftler)
+        graf = coo_matrix((np.ones(len(i)), (i, j)), shape=(m, m))
+        _, etiketler = connected_components(graf, directed=False)
+    else:
+        etiketler = np.arange(m)
+    ciftler = [(temsilci[i], temsilci[j], benzerlik) for i, j, benzerlik in ciftler]
+    return etiketler[ilk].astype(np.int64), ciftler
@@ -121,7 +121,7 @@ echo.
 
 REM ML Service - Port 5000
 echo Installing Python dependencies...
-start "ML-Service-Python" cmd /k "cd /d %PROJECT_ROOT%ML-Service && pip install -r requirements.txt && python app.py"
+start "ML-Service-Python" cmd /k "cd /d %PROJECT_ROOT%ML-Service && pip install -r requirements.txt && python api\serve.py"
 timeout /t 5 /nobreak >nul
 
 echo ✅ ML Service starting...
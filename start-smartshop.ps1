@@ -139,7 +139,7 @@ Write-Host ""
 
 # ML Service - Port 5000
 Write-Host "Installing Python dependencies and starting ML Service..." -ForegroundColor Cyan
-Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd '$ProjectRoot\ML-Service'; Write-Host '🤖 ML Service (Python/Flask) - Port 5000' -ForegroundColor Cyan; pip install -r requirements.txt; python app.py"
+Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd '$ProjectRoot\ML-Service'; Write-Host '🤖 ML Service (Python/Flask) - Port 5000' -ForegroundColor Cyan; pip install -r requirements.txt; python api\serve.py"
 Start-Sleep -Seconds 5
 
 Write-Host "✅ ML Service starting..." -ForegroundColor Green